@@ -0,0 +1,77 @@
+"""Process-wide API clients.
+
+Each SDK client owns an HTTP connection pool. Creating a new client for every
+call (or every analyzer instance) throws those keep-alive connections away, so
+each request pays a fresh TCP + TLS handshake to the provider. These factories
+return a single client per API key for the whole process; the SDK clients are
+thread-safe, so they can be shared by the ParallelExecutor workers.
+"""
+from functools import lru_cache
+
+# Keep-alive pool shared by the LangChain chat models (step 2 fans out up to
+# config.parallel.openai.max_concurrent requests to the same host)
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+HTTP_KEEPALIVE_EXPIRY_SECONDS = 30.0
+# Web-search calls can run for minutes; matches the OpenAI SDK default
+HTTP_TIMEOUT_SECONDS = 600.0
+
+
+@lru_cache(maxsize=None)
+def get_genai_client(api_key: str):
+    """Get the shared google-genai client for an API key."""
+    from google import genai
+    return genai.Client(api_key=api_key)
+
+
+@lru_cache(maxsize=None)
+def get_openai_client(api_key: str):
+    """Get the shared OpenAI client for an API key."""
+    from openai import OpenAI
+    return OpenAI(api_key=api_key)
+
+
+@lru_cache(maxsize=None)
+def get_anthropic_client(api_key: str):
+    """Get the shared Anthropic client for an API key."""
+    from anthropic import Anthropic
+    return Anthropic(api_key=api_key)
+
+
+@lru_cache(maxsize=None)
+def get_http_client():
+    """Get the shared httpx client for LangChain chat models.
+    
+    LangChain wrappers (ChatOpenAI) otherwise build their own client, so the
+    pool is passed in explicitly with limits sized for the step 2 fan-out.
+    httpx.Client is thread-safe; an AsyncClient is deliberately not shared
+    (see new_async_http_client).
+    """
+    import httpx
+    return httpx.Client(limits=_http_limits(), timeout=_http_timeout())
+
+
+def new_async_http_client():
+    """Create an httpx.AsyncClient with the shared pool settings.
+    
+    Async connections are bound to the event loop that opened them, so an
+    AsyncClient can't be shared process-wide the way get_http_client is.
+    Create one per batch, inside the loop that runs it, and close it with
+    ``async with``.
+    """
+    import httpx
+    return httpx.AsyncClient(limits=_http_limits(), timeout=_http_timeout())
+
+
+def _http_limits():
+    import httpx
+    return httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    )
+
+
+def _http_timeout():
+    import httpx
+    return httpx.Timeout(HTTP_TIMEOUT_SECONDS, connect=10.0)
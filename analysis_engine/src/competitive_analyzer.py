@@ -574,14 +574,14 @@ class CompetitiveAnalyzer:
             limits = ProviderLimits(
                 max_concurrent=self.config.parallel.gemini.max_concurrent,
                 rate_limit_rpm=self.config.parallel.gemini.rate_limit_rpm,
-                min_delay_seconds=self.config.parallel.gemini.min_delay_seconds
+                min_delay_seconds=self.config.parallel.gemini.min_delay_seconds,
+                rate_limiter=self.config.parallel.gemini.rate_limiter
             )
             executor = ParallelExecutor(provider=Provider.GEMINI, limits=limits)
             
             # Async wrapper for scoring
             async def score_product_async(item: Dict[str, Any]) -> Dict[str, Any]:
                 import asyncio
-                loop = asyncio.get_event_loop()
                 
                 def do_scoring():
                     profile = self._phase2_score_product(
@@ -596,7 +596,7 @@ class CompetitiveAnalyzer:
                         'profile': profile,
                     }
                 
-                return await loop.run_in_executor(None, do_scoring)
+                return await asyncio.to_thread(do_scoring)
             
             def on_progress(completed: int, total: int, status: str, item_id: Optional[str]):
                 print(f"    [{completed:2}/{total}] {item_id or 'Scoring'}... {status}", flush=True)
@@ -684,7 +684,7 @@ class CompetitiveAnalyzer:
             # Use empty insights if Phase 3 fails (non-critical)
             print("    [!] Using empty insights (Phase 3 failed)")
             insights_result = StrategicInsightsResult(
-                strategic_insights=[],
+                strategic_insights=(),
                 category_summary=f"Analyse concurrentielle de {len(scored_products)} produits dans la catégorie {category}."
             )
         
@@ -705,12 +705,16 @@ class CompetitiveAnalyzer:
     
     def run(
         self,
-        run_id: str
+        run_id: str,
+        products_analysis: Optional[List[Dict[str, Any]]] = None
     ) -> Optional[Path]:
         """Run competitive analysis and save results.
         
         Args:
             run_id: Run identifier (timestamp)
+            products_analysis: Visual analysis results already in memory
+                (e.g. from step 5 in the same process); loaded from the
+                run's visual analysis file if None
             
         Returns:
             Path to the output JSON file or None if failed
@@ -718,7 +722,8 @@ class CompetitiveAnalyzer:
         output_dir = Path(self.config.output_dir)
         
         # Load visual analysis data
-        products_analysis = load_visual_analysis(output_dir, run_id)
+        if products_analysis is None:
+            products_analysis = load_visual_analysis(output_dir, run_id)
         
         if not products_analysis:
             print(f"[!] No visual analysis found for run_id: {run_id}")
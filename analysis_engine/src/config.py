@@ -35,6 +35,10 @@ class ParallelConfig:
     max_concurrent: int
     rate_limit_rpm: int
     min_delay_seconds: float = 0.0
+    # Rate limiting algorithm: "token_bucket", "leaky_bucket" or "sliding_window"
+    # (PIPELINE_RATE_LIMITER). Sliding window lets a batch's first requests go
+    # out in one burst (up to 90% of the RPM) and ignores min_delay_seconds
+    rate_limiter: str = field(default_factory=lambda: os.getenv('PIPELINE_RATE_LIMITER', 'token_bucket'))
 
 
 @dataclass
@@ -172,6 +176,7 @@ class AnthropicConfig:
     model: str = "claude-opus-4-5"  # Latest Opus 4.5 model
     temperature: float = 0.7  # Some creativity for prompt generation
     max_tokens: int = 8192  # Allow long detailed prompts
+    repair_model: str = "claude-haiku-4-5"  # Cheap model to fix malformed mapping JSON
     
     @property
     def api_key(self) -> str:
@@ -229,6 +234,32 @@ class DiscoveryConfig:
     images_subdir: str = "images"
     analysis_subdir: str = "analysis"
     verbose: bool = True
+    # JSON outputs are compact by default; set PRETTY_JSON=1 to indent them
+    # (2-3x larger files, slower to write and to reload in the next step)
+    pretty_json: bool = field(default_factory=lambda: os.getenv('PRETTY_JSON', '0') == '1')
+    # Reuse step 2 product details from previous runs for this many seconds
+    # (PIPELINE_CACHE_TTL=0 disables the cache)
+    details_cache_ttl: int = field(default_factory=lambda: int(os.getenv('PIPELINE_CACHE_TTL', str(7 * 24 * 3600))))
+    # Brands per step 2 OpenAI request (PIPELINE_DETAILS_BATCH_SIZE). 1 keeps one
+    # focused web search per brand; higher values cut the request count
+    details_batch_size: int = field(default_factory=lambda: max(1, int(os.getenv('PIPELINE_DETAILS_BATCH_SIZE', '1'))))
+    # Reuse rebrand steps 1/2 extractions of an identical image (and brand
+    # identity) for this many seconds (REBRAND_CACHE_TTL=0 disables the cache).
+    # Unlike the step 2 details cache, this one does not require temperature 0:
+    # Gemini vision runs at 1.0, and an extraction describes what is in the
+    # image, so reusing it keeps a re-run's crops consistent rather than
+    # hiding an answer the user expects to change
+    rebrand_cache_ttl: int = field(default_factory=lambda: int(os.getenv('REBRAND_CACHE_TTL', str(7 * 24 * 3600))))
+    # Include the full element and mapping lists in rebrand step details
+    # (REBRAND_VERBOSE_STEPS=0 keeps only counts and LLM debug, for callers
+    # that don't display them: smaller progress payloads and result.json)
+    verbose_step_details: bool = field(default_factory=lambda: os.getenv('REBRAND_VERBOSE_STEPS', '1') == '1')
+    # Rebrand step 3 attempts on transient API errors or malformed JSON, with
+    # exponential backoff between them (REBRAND_MAPPING_RETRIES)
+    max_mapping_retries: int = field(default_factory=lambda: max(1, int(os.getenv('REBRAND_MAPPING_RETRIES', '3'))))
+    # Concurrent step 1 Gemini calls, each over part of the alphabet
+    # (PIPELINE_DISCOVERY_SHARDS). 1 keeps a single globally ranked call
+    discovery_shards: int = field(default_factory=lambda: max(1, int(os.getenv('PIPELINE_DISCOVERY_SHARDS', '1'))))
 
 
 # =============================================================================
@@ -28,6 +28,7 @@ from .models import (
     CompositionDescription,
     ColorInfo,
 )
+from .clients import get_genai_client
 from .utils import invoke_with_retry
 
 
@@ -38,6 +39,12 @@ from .utils import invoke_with_retry
 SUPPORTED_FORMATS = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
 MIN_CROP_SIZE = 10  # Minimum crop dimension in pixels
 
+# Crop sub-directory and file prefix for each extraction kind
+CROP_LAYOUT = {
+    "inspiration": ("inspiration_crops", "insp"),
+    "source": ("source_crops", "src"),
+}
+
 
 # =============================================================================
 # Unified Extraction Prompt (identification + location in ONE call)
@@ -443,6 +450,27 @@ def crop_all_elements(
     return cropped_paths
 
 
+def recrop_elements(
+    image_path: Path,
+    elements: List[ExtractedElement],
+    output_dir: Path,
+    kind: str
+) -> Dict[str, Path]:
+    """Cut the crops of an already known extraction (no API call).
+    
+    Used when the extraction of this exact image comes from a cache.
+    
+    Args:
+        image_path: Image the elements were extracted from
+        elements: Extracted elements with their bounding boxes
+        output_dir: Job output directory
+        kind: "inspiration" or "source" (see CROP_LAYOUT)
+    """
+    crops_subdir, prefix = CROP_LAYOUT[kind]
+    with Image.open(image_path) as image:
+        return crop_all_elements(image, elements, output_dir / crops_subdir, prefix)
+
+
 # =============================================================================
 # Public API: Step 1 - Inspiration Extraction
 # =============================================================================
@@ -478,8 +506,8 @@ def extract_inspiration_elements(
         print(f"[!] Failed to open image: {e}")
         return None, {}
     
-    # Initialize Gemini client
-    client = genai.Client(api_key=config.gemini_vision.api_key)
+    # Shared Gemini client (keeps connections alive across calls)
+    client = get_genai_client(config.gemini_vision.api_key)
     model = config.gemini_vision.model
     
     try:
@@ -537,8 +565,8 @@ def extract_inspiration_elements(
         
         # Crop elements
         print("\nCropping elements...")
-        crops_dir = output_dir / "inspiration_crops"
-        cropped_paths = crop_all_elements(image, elements, crops_dir, "insp")
+        crops_subdir, prefix = CROP_LAYOUT["inspiration"]
+        cropped_paths = crop_all_elements(image, elements, output_dir / crops_subdir, prefix)
         print(f"[✓] Cropped {len(cropped_paths)}/{len(elements)} elements")
         
         return extraction, cropped_paths
@@ -586,8 +614,8 @@ def extract_source_elements(
         print(f"[!] Failed to open image: {e}")
         return None, {}
     
-    # Initialize Gemini client
-    client = genai.Client(api_key=config.gemini_vision.api_key)
+    # Shared Gemini client (keeps connections alive across calls)
+    client = get_genai_client(config.gemini_vision.api_key)
     model = config.gemini_vision.model
     
     # Format prompt with brand identity
@@ -648,8 +676,8 @@ def extract_source_elements(
         
         # Crop elements
         print("\nCropping elements...")
-        crops_dir = output_dir / "source_crops"
-        cropped_paths = crop_all_elements(image, elements, crops_dir, "src")
+        crops_subdir, prefix = CROP_LAYOUT["source"]
+        cropped_paths = crop_all_elements(image, elements, output_dir / crops_subdir, prefix)
         print(f"[✓] Cropped {len(cropped_paths)}/{len(elements)} elements")
         
         return extraction, cropped_paths
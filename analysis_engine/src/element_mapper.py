@@ -11,10 +11,9 @@ For each element in the inspiration, decides whether to:
 Uses Anthropic Claude Opus 4.5 - pure text, no images.
 """
 import json
+import time
 from typing import Optional
 
-from anthropic import Anthropic
-
 from .config import get_config, DiscoveryConfig
 from .models import (
     InspirationExtraction,
@@ -23,6 +22,7 @@ from .models import (
     ElementMappingEntry,
     RebrandColorScheme,
 )
+from .clients import get_anthropic_client
 from .utils import load_prompt
 
 
@@ -81,6 +81,119 @@ def format_composition_for_prompt(composition) -> str:
     return "\n".join(lines)
 
 
+def parse_mapping_response(
+    response_text: str,
+    inspiration: InspirationExtraction,
+    source: SourceExtraction
+) -> RebrandMapping:
+    """Build the RebrandMapping from the model's JSON answer.
+    
+    Raises:
+        json.JSONDecodeError: If the answer does not contain valid JSON
+    """
+    # Parse JSON from response
+    # Handle potential markdown code blocks
+    if "```json" in response_text:
+        json_start = response_text.find("```json") + 7
+        json_end = response_text.find("```", json_start)
+        response_text = response_text[json_start:json_end].strip()
+    elif "```" in response_text:
+        json_start = response_text.find("```") + 3
+        json_end = response_text.find("```", json_start)
+        response_text = response_text[json_start:json_end].strip()
+    
+    result_data = json.loads(response_text)
+    
+    # Build mappings list
+    mappings = []
+    for mapping_data in result_data.get('mappings', []):
+        # Normalize action: 'keep' should be 'adapt' (never directly copy)
+        action = mapping_data.get('action', 'adapt')
+        if action == 'keep':
+            action = 'adapt'  # Convert legacy 'keep' to 'adapt'
+        
+        mapping = ElementMappingEntry(
+            inspiration_element_id=mapping_data.get('inspiration_element_id', ''),
+            action=action,
+            replacement_source=mapping_data.get('replacement_source'),
+            replacement_content=mapping_data.get('replacement_content', ''),
+            styling_notes=mapping_data.get('styling_notes', ''),
+            reasoning=mapping_data.get('reasoning'),
+            adaptation_concept=mapping_data.get('adaptation_concept')  # New field for adapt actions
+        )
+        mappings.append(mapping)
+    
+    # Build color scheme
+    color_data = result_data.get('color_scheme', {})
+    color_scheme = RebrandColorScheme(
+        primary=color_data.get('primary', '#000000'),
+        secondary=color_data.get('secondary', '#FFFFFF'),
+        background=color_data.get('background', '#FFFFFF'),
+        text_primary=color_data.get('text_primary', '#000000'),
+        text_secondary=color_data.get('text_secondary'),
+        accent=color_data.get('accent')
+    )
+
+    # LLM decides packaging format choice (defaults to inspiration)
+    packaging_format_choice = result_data.get('packaging_format_choice', 'inspiration')
+    if packaging_format_choice not in ('source', 'inspiration'):
+        packaging_format_choice = 'inspiration'
+    
+    # Get the actual description based on the choice
+    if packaging_format_choice == 'source':
+        packaging_format_description = source.packaging_format_description or "Source packaging format (no description available)"
+    else:
+        packaging_format_description = inspiration.packaging_format_description or "Inspiration packaging format (no description available)"
+    
+    print(f"  [✓] Packaging format: {packaging_format_choice.upper()}")
+    print(f"      Description: {packaging_format_description[:100]}...")
+    
+    # Build final mapping result
+    mapping_result = RebrandMapping(
+        mappings=mappings,
+        packaging_format_choice=packaging_format_choice,
+        packaging_format_description=packaging_format_description,
+        composition_description=result_data.get('composition_description', ''),
+        color_scheme=color_scheme,
+        assembly_notes=result_data.get('assembly_notes', '')
+    )
+    
+    # Log summary
+    actions = {'adapt': 0, 'replace': 0, 'omit': 0, 'keep': 0}
+    for m in mappings:
+        actions[m.action] = actions.get(m.action, 0) + 1
+    
+    print(f"  [✓] Created {len(mappings)} mappings")
+    print(f"    Adapt: {actions['adapt']}, Replace: {actions['replace']}, Omit: {actions['omit']}")
+    if actions['keep'] > 0:
+        print(f"    [!] Warning: {actions['keep']} 'keep' actions detected - should be 'adapt' instead")
+    
+    return mapping_result
+
+
+def _is_transient(error: Exception) -> bool:
+    """Rate limits, overloads, 5xx and network errors are worth retrying."""
+    import anthropic
+    if isinstance(error, anthropic.APIConnectionError):
+        return True
+    if isinstance(error, anthropic.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+def repair_mapping_json(client, raw_response: str, config: DiscoveryConfig) -> str:
+    """Ask the cheaper repair model to return a corrected copy of malformed JSON."""
+    response = client.messages.create(
+        model=config.anthropic.repair_model,
+        max_tokens=config.anthropic.max_tokens,
+        system=load_prompt("element_mapping_repair_system.txt"),
+        messages=[
+            {"role": "user", "content": raw_response}
+        ]
+    )
+    return response.content[0].text
+
+
 def create_element_mapping(
     inspiration: InspirationExtraction,
     source: SourceExtraction,
@@ -117,8 +230,8 @@ def create_element_mapping(
     print(f"  Inspiration elements: {len(inspiration.elements)}")
     print(f"  Source elements: {len(source.elements)}")
     
-    # Initialize Anthropic client
-    client = Anthropic(api_key=config.anthropic.api_key)
+    # Shared Anthropic client (keeps connections alive across calls)
+    client = get_anthropic_client(config.anthropic.api_key)
     
     # Load prompts
     system_prompt = load_prompt("element_mapping_system.txt")
@@ -152,107 +265,54 @@ def create_element_mapping(
     debug_info["user_prompt"] = user_prompt
     debug_info["model"] = config.anthropic.model
     
-    try:
-        # Call Opus 4.5
-        response = client.messages.create(
-            model=config.anthropic.model,
-            max_tokens=config.anthropic.max_tokens,
-            system=system_prompt,
-            messages=[
-                {"role": "user", "content": user_prompt}
-            ]
-        )
-        
-        # Extract response text
-        response_text = response.content[0].text
-        debug_info["raw_response"] = response_text
-        
-        # Parse JSON from response
-        # Handle potential markdown code blocks
-        if "```json" in response_text:
-            json_start = response_text.find("```json") + 7
-            json_end = response_text.find("```", json_start)
-            response_text = response_text[json_start:json_end].strip()
-        elif "```" in response_text:
-            json_start = response_text.find("```") + 3
-            json_end = response_text.find("```", json_start)
-            response_text = response_text[json_start:json_end].strip()
-        
-        result_data = json.loads(response_text)
-        
-        # Build mappings list
-        mappings = []
-        for mapping_data in result_data.get('mappings', []):
-            # Normalize action: 'keep' should be 'adapt' (never directly copy)
-            action = mapping_data.get('action', 'adapt')
-            if action == 'keep':
-                action = 'adapt'  # Convert legacy 'keep' to 'adapt'
-            
-            mapping = ElementMappingEntry(
-                inspiration_element_id=mapping_data.get('inspiration_element_id', ''),
-                action=action,
-                replacement_source=mapping_data.get('replacement_source'),
-                replacement_content=mapping_data.get('replacement_content', ''),
-                styling_notes=mapping_data.get('styling_notes', ''),
-                reasoning=mapping_data.get('reasoning'),
-                adaptation_concept=mapping_data.get('adaptation_concept')  # New field for adapt actions
+    # Transient API errors and malformed JSON are retried with backoff, so
+    # that the Step 1+2 work is not lost to a single bad answer
+    max_attempts = max(1, config.max_mapping_retries)
+    for attempt in range(max_attempts):
+        debug_info["attempt"] = attempt + 1
+        try:
+            # Call Opus 4.5
+            response = client.messages.create(
+                model=config.anthropic.model,
+                max_tokens=config.anthropic.max_tokens,
+                system=system_prompt,
+                messages=[
+                    {"role": "user", "content": user_prompt}
+                ]
             )
-            mappings.append(mapping)
-        
-        # Build color scheme
-        color_data = result_data.get('color_scheme', {})
-        color_scheme = RebrandColorScheme(
-            primary=color_data.get('primary', '#000000'),
-            secondary=color_data.get('secondary', '#FFFFFF'),
-            background=color_data.get('background', '#FFFFFF'),
-            text_primary=color_data.get('text_primary', '#000000'),
-            text_secondary=color_data.get('text_secondary'),
-            accent=color_data.get('accent')
-        )
-
-        # LLM decides packaging format choice (defaults to inspiration)
-        packaging_format_choice = result_data.get('packaging_format_choice', 'inspiration')
-        if packaging_format_choice not in ('source', 'inspiration'):
-            packaging_format_choice = 'inspiration'
-        
-        # Get the actual description based on the choice
-        if packaging_format_choice == 'source':
-            packaging_format_description = source.packaging_format_description or "Source packaging format (no description available)"
-        else:
-            packaging_format_description = inspiration.packaging_format_description or "Inspiration packaging format (no description available)"
-        
-        print(f"  [✓] Packaging format: {packaging_format_choice.upper()}")
-        print(f"      Description: {packaging_format_description[:100]}...")
-        
-        # Build final mapping result
-        mapping_result = RebrandMapping(
-            mappings=mappings,
-            packaging_format_choice=packaging_format_choice,
-            packaging_format_description=packaging_format_description,
-            composition_description=result_data.get('composition_description', ''),
-            color_scheme=color_scheme,
-            assembly_notes=result_data.get('assembly_notes', '')
-        )
-        
-        # Log summary
-        actions = {'adapt': 0, 'replace': 0, 'omit': 0, 'keep': 0}
-        for m in mappings:
-            actions[m.action] = actions.get(m.action, 0) + 1
-        
-        print(f"  [✓] Created {len(mappings)} mappings")
-        print(f"    Adapt: {actions['adapt']}, Replace: {actions['replace']}, Omit: {actions['omit']}")
-        if actions['keep'] > 0:
-            print(f"    [!] Warning: {actions['keep']} 'keep' actions detected - should be 'adapt' instead")
-        
-        return mapping_result, debug_info
-        
-    except json.JSONDecodeError as e:
-        print(f"  [!] JSON parsing error: {e}")
-        print(f"  Response text: {response_text[:500]}...")
-        return None, debug_info
-    except Exception as e:
-        print(f"  [!] Mapping error: {e}")
-        return None, debug_info
+            
+            # Extract response text
+            response_text = response.content[0].text
+            debug_info["raw_response"] = response_text
+            
+            try:
+                return parse_mapping_response(response_text, inspiration, source), debug_info
+            except json.JSONDecodeError as e:
+                print(f"  [!] JSON parsing error: {e}")
+                print(f"  Response text: {response_text[:500]}...")
+                print(f"  Repairing JSON with {config.anthropic.repair_model} "
+                      f"(attempt {attempt + 1}/{max_attempts})...")
+                try:
+                    repaired_text = repair_mapping_json(client, response_text, config)
+                    debug_info["repaired_response"] = repaired_text
+                    debug_info["repair_attempt"] = attempt + 1
+                    return parse_mapping_response(repaired_text, inspiration, source), debug_info
+                except Exception as repair_error:
+                    # Whatever went wrong with the repair (bad answer, or the
+                    # repair model itself failing), Opus is asked again
+                    print(f"  [!] JSON repair failed (attempt {attempt + 1}/{max_attempts}): "
+                          f"{str(repair_error)[:80]}")
+                    raise e
+            
+        except Exception as e:
+            if not isinstance(e, json.JSONDecodeError) and not _is_transient(e):
+                print(f"  [!] Mapping error: {e}")
+                return None, debug_info
+            print(f"  [!] Mapping attempt {attempt + 1}/{max_attempts} failed: {str(e)[:80]}")
+            if attempt < max_attempts - 1:
+                time.sleep(min(2 ** attempt, 8))
+    
+    return None, debug_info
 
 
 def validate_mapping(
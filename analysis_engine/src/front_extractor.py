@@ -17,12 +17,12 @@ import shutil
 from pathlib import Path
 from typing import Optional, Tuple, Dict, Any
 
-from google import genai
 from google.genai import types
 from PIL import Image
 
 from .config import get_config, DiscoveryConfig
 from .models import FrontExtractionResult, FrontExtractionBoundingBox
+from .clients import get_genai_client
 from .utils import load_prompt, invoke_with_retry
 
 
@@ -64,7 +64,7 @@ class FrontExtractor:
         self.model = self.config.front_extraction.model
         
         # Initialize Google GenAI client
-        self.client = genai.Client(api_key=self.config.front_extraction.api_key)
+        self.client = get_genai_client(self.config.front_extraction.api_key)
         
         # Load prompts
         self.system_prompt = load_prompt("front_extraction_system.txt")
@@ -9,10 +9,10 @@ NOT: Full source or inspiration images
 Uses Gemini 3 Pro Image for final image generation.
 """
 import base64
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional
 
-from google import genai
 from google.genai import types
 from PIL import Image
 
@@ -23,6 +23,7 @@ from .models import (
     SourceExtraction,
     ElementMappingEntry,
 )
+from .clients import get_genai_client
 from .utils import load_prompt
 
 
@@ -288,6 +289,8 @@ def load_images_for_generation(crop_paths: List[Path]) -> List:
         if path.exists():
             try:
                 img = Image.open(path)
+                # Decode now rather than lazily during the API call
+                img.load()
                 images.append(img)
             except Exception as e:
                 print(f"    [!] Failed to load crop {path}: {e}")
@@ -296,25 +299,36 @@ def load_images_for_generation(crop_paths: List[Path]) -> List:
 
 
 # =============================================================================
-# Step 4: Image Generation
+# Step 4: Generation Inputs
 # =============================================================================
 
-def generate_rebranded_image(
+@dataclass
+class GenerationInputs:
+    """Prompt and crop images for Step 4, derived from the mapping only.
+    
+    Built once per mapping and reused across generation attempts.
+    """
+    composition_text: str
+    crop_paths: List[Path]
+    crop_images: List
+    system_prompt: str
+    user_prompt: str
+    full_prompt: str
+    width: int
+    height: int
+
+
+def prepare_generation_inputs(
     mapping: RebrandMapping,
     inspiration: InspirationExtraction,
     source: SourceExtraction,
     inspiration_crops: Dict[str, Path],
-    source_crops: Dict[str, Path],
-    output_path: Path,
-    config: Optional[DiscoveryConfig] = None
-) -> tuple[Optional[Path], dict]:
-    """Step 4: Generate the final rebranded image using Gemini.
+    source_crops: Dict[str, Path]
+) -> GenerationInputs:
+    """Build the Step 4 prompt and load the crops it references.
     
-    Takes only cropped elements and composition description - NOT full images.
-    The model assembles the final packaging using:
-    - Cropped elements (logos, icons, product images)
-    - Textual composition instructions
-    - Color scheme and styling notes
+    Makes no API call, so it can start as soon as the mapping exists
+    (the pipeline runs it in a thread while Step 3's result is built).
     
     Args:
         mapping: Element mapping from Step 3
@@ -322,32 +336,10 @@ def generate_rebranded_image(
         source: Extraction from source (for element content)
         inspiration_crops: Dict mapping element_id to cropped paths
         source_crops: Dict mapping element_id to cropped paths
-        output_path: Where to save the generated image
-        config: Optional configuration
         
     Returns:
-        Tuple of (Path to generated image or None, debug_info dict)
+        GenerationInputs with crop images already decoded
     """
-    debug_info = {
-        "model": "",
-        "system_prompt": "",
-        "user_prompt": "",
-        "full_prompt": "",
-        "composition_text": "",
-        "input_images": [],
-        "input_image_count": 0,
-        "target_dimensions": {},
-        "error": None,
-    }
-    if config is None:
-        config = get_config()
-    
-    print("[Step 4] Generating rebranded image...")
-    
-    # Initialize Gemini client for image generation
-    client = genai.Client(api_key=config.gemini_image_gen.api_key)
-    debug_info["model"] = config.gemini_image_gen.model
-    
     # Format composition instructions
     composition_text = format_mapping_for_generation(
         mapping=mapping,
@@ -356,7 +348,6 @@ def generate_rebranded_image(
         inspiration_crops=inspiration_crops,
         source_crops=source_crops
     )
-    debug_info["composition_text"] = composition_text
     
     print(f"  Composition instruction length: {len(composition_text)} chars")
     
@@ -367,10 +358,6 @@ def generate_rebranded_image(
         source_crops=source_crops
     )
     
-    # Store image paths for debug
-    debug_info["input_images"] = [str(p) for p in crop_paths]
-    debug_info["input_image_count"] = len(crop_paths)
-    
     print(f"  Input crops: {len(crop_paths)}")
     
     # Load crop images
@@ -384,7 +371,6 @@ def generate_rebranded_image(
     # Get dimensions from inspiration if available
     width = inspiration.image_dimensions.get('width', 800) if inspiration.image_dimensions else 800
     height = inspiration.image_dimensions.get('height', 1000) if inspiration.image_dimensions else 1000
-    debug_info["target_dimensions"] = {"width": width, "height": height}
     
     # Format user prompt
     user_prompt = user_prompt_template.format(
@@ -394,12 +380,92 @@ def generate_rebranded_image(
         num_crops=len(crop_images)
     )
     
-    # Combine prompts
-    full_prompt = f"{system_prompt}\n\n---\n\n{user_prompt}"
+    return GenerationInputs(
+        composition_text=composition_text,
+        crop_paths=crop_paths,
+        crop_images=crop_images,
+        system_prompt=system_prompt,
+        user_prompt=user_prompt,
+        # Combine prompts
+        full_prompt=f"{system_prompt}\n\n---\n\n{user_prompt}",
+        width=width,
+        height=height,
+    )
+
+
+# =============================================================================
+# Step 4: Image Generation
+# =============================================================================
+
+def generate_rebranded_image(
+    mapping: RebrandMapping,
+    inspiration: InspirationExtraction,
+    source: SourceExtraction,
+    inspiration_crops: Dict[str, Path],
+    source_crops: Dict[str, Path],
+    output_path: Path,
+    config: Optional[DiscoveryConfig] = None,
+    inputs: Optional[GenerationInputs] = None
+) -> tuple[Optional[Path], dict]:
+    """Step 4: Generate the final rebranded image using Gemini.
     
-    # Store prompts for debug
-    debug_info["system_prompt"] = system_prompt
-    debug_info["user_prompt"] = user_prompt
+    Takes only cropped elements and composition description - NOT full images.
+    The model assembles the final packaging using:
+    - Cropped elements (logos, icons, product images)
+    - Textual composition instructions
+    - Color scheme and styling notes
+    
+    Args:
+        mapping: Element mapping from Step 3
+        inspiration: Extraction from inspiration (for position reference)
+        source: Extraction from source (for element content)
+        inspiration_crops: Dict mapping element_id to cropped paths
+        source_crops: Dict mapping element_id to cropped paths
+        output_path: Where to save the generated image
+        config: Optional configuration
+        inputs: Prepared prompt and crops (built here if None)
+        
+    Returns:
+        Tuple of (Path to generated image or None, debug_info dict)
+    """
+    debug_info = {
+        "model": "",
+        "system_prompt": "",
+        "user_prompt": "",
+        "full_prompt": "",
+        "composition_text": "",
+        "input_images": [],
+        "input_image_count": 0,
+        "target_dimensions": {},
+        "error": None,
+    }
+    if config is None:
+        config = get_config()
+    
+    print("[Step 4] Generating rebranded image...")
+    
+    # Shared Gemini client for image generation
+    client = get_genai_client(config.gemini_image_gen.api_key)
+    debug_info["model"] = config.gemini_image_gen.model
+    
+    if inputs is None:
+        inputs = prepare_generation_inputs(
+            mapping=mapping,
+            inspiration=inspiration,
+            source=source,
+            inspiration_crops=inspiration_crops,
+            source_crops=source_crops
+        )
+    crop_images = inputs.crop_images
+    full_prompt = inputs.full_prompt
+    
+    # Store prompts, image paths and dimensions for debug
+    debug_info["composition_text"] = inputs.composition_text
+    debug_info["input_images"] = [str(p) for p in inputs.crop_paths]
+    debug_info["input_image_count"] = len(inputs.crop_paths)
+    debug_info["target_dimensions"] = {"width": inputs.width, "height": inputs.height}
+    debug_info["system_prompt"] = inputs.system_prompt
+    debug_info["user_prompt"] = inputs.user_prompt
     debug_info["full_prompt"] = full_prompt
     
     try:
@@ -480,10 +546,14 @@ def generate_with_fallback(
     source_crops: Dict[str, Path],
     output_path: Path,
     config: Optional[DiscoveryConfig] = None,
-    max_retries: int = 3
+    max_retries: int = 3,
+    inputs: Optional[GenerationInputs] = None
 ) -> tuple[Optional[Path], dict]:
     """Generate image with retry logic and fallback options.
     
+    The prompt and crops depend only on the mapping, so they are prepared
+    once (or taken from ``inputs``) and reused by every attempt.
+    
     Args:
         mapping: Element mapping from Step 3
         inspiration: Extraction from inspiration
@@ -493,12 +563,22 @@ def generate_with_fallback(
         output_path: Where to save the generated image
         config: Optional configuration
         max_retries: Maximum retry attempts
+        inputs: Prepared prompt and crops (see prepare_generation_inputs)
         
     Returns:
         Tuple of (Path to generated image or None, debug_info dict)
     """
     last_debug_info = {}
     
+    if inputs is None:
+        inputs = prepare_generation_inputs(
+            mapping=mapping,
+            inspiration=inspiration,
+            source=source,
+            inspiration_crops=inspiration_crops,
+            source_crops=source_crops
+        )
+    
     for attempt in range(max_retries):
         print(f"  Generation attempt {attempt + 1}/{max_retries}...")
         
@@ -509,7 +589,8 @@ def generate_with_fallback(
             inspiration_crops=inspiration_crops,
             source_crops=source_crops,
             output_path=output_path,
-            config=config
+            config=config,
+            inputs=inputs
         )
         
         last_debug_info = debug_info
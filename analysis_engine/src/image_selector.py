@@ -19,11 +19,11 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 
-from openai import OpenAI
 from pydantic import BaseModel
 
 from .config import get_config, DiscoveryConfig
 from .models import ImageSelection, ImageSelectionResult
+from .clients import get_openai_client
 from .utils import load_prompt
 from .parallel_executor import (
     ParallelExecutor,
@@ -294,7 +294,7 @@ class ImageSelector:
         self.config = config or get_config()
         
         # Initialize OpenAI client
-        self.client = OpenAI(api_key=self.config.openai_mini.api_key)
+        self.client = get_openai_client(self.config.openai_mini.api_key)
         self.model = self.config.openai_mini.model
         
         # Load prompts
@@ -585,7 +585,8 @@ class ImageSelector:
             limits = ProviderLimits(
                 max_concurrent=self.config.parallel.openai_mini.max_concurrent,
                 rate_limit_rpm=self.config.parallel.openai_mini.rate_limit_rpm,
-                min_delay_seconds=self.config.parallel.openai_mini.min_delay_seconds
+                min_delay_seconds=self.config.parallel.openai_mini.min_delay_seconds,
+                rate_limiter=self.config.parallel.openai_mini.rate_limiter
             )
             executor = ParallelExecutor(provider=Provider.OPENAI_MINI, limits=limits)
             
@@ -595,11 +596,7 @@ class ImageSelector:
             async def select_image_async(item: Tuple[int, Dict[str, Any]]) -> Tuple[int, Dict[str, Any], Optional[ImageSelection]]:
                 import asyncio
                 idx, prod = item
-                loop = asyncio.get_event_loop()
-                return await loop.run_in_executor(
-                    None,
-                    lambda: self._select_image_only(prod, idx)
-                )
+                return await asyncio.to_thread(self._select_image_only, prod, idx)
             
             def on_progress(completed: int, total: int, status: str, item_id: Optional[str]):
                 print(f"    [{completed:2}/{total}] Selection {status}", flush=True)
@@ -625,7 +622,7 @@ class ImageSelector:
             extraction_count = 0
             
             # Sort results by index to maintain order
-            for exec_result in sorted(batch_result.results, key=lambda r: r.index):
+            for exec_result in batch_result.results:
                 if not exec_result.success or not exec_result.result:
                     # Failed selection - use original product
                     idx, product, _ = indexed_products[exec_result.index]
@@ -1,6 +1,6 @@
 """Data models for the product scraper."""
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any, Literal
+from typing import Optional, List, Dict, Any, Literal, Tuple
 from pydantic import BaseModel, Field
 
 
@@ -521,17 +521,19 @@ class CompetitiveAnalysisResult(BaseModel):
 # =============================================================================
 # Intermediate Models for Multi-Phase Competitive Analysis (Step 7)
 # =============================================================================
+# Write-once LLM outputs: sequences are tuples since they are only read
+# before being copied into CompetitiveAnalysisResult.
 
 class CategoryAxesResult(BaseModel):
     """Phase 1 output: PODs and POPs identified for the category."""
     
     # PODs for Radar Chart
-    points_of_difference: List[PointOfDifference] = Field(
+    points_of_difference: Tuple[PointOfDifference, ...] = Field(
         description="5 axes of differentiation for radar chart"
     )
     
     # POPs for Matrix
-    points_of_parity: List[PointOfParity] = Field(
+    points_of_parity: Tuple[PointOfParity, ...] = Field(
         description="5 common attributes for parity matrix"
     )
     
@@ -548,12 +550,12 @@ class SingleProductProfile(BaseModel):
     product_name: str = Field(description="Full product name")
     
     # Radar chart data
-    pod_scores: List[ProductPODScore] = Field(
+    pod_scores: Tuple[ProductPODScore, ...] = Field(
         description="Scores for each Point-of-Difference axis"
     )
     
     # Matrix data
-    pop_status: List[ProductPOPStatus] = Field(
+    pop_status: Tuple[ProductPOPStatus, ...] = Field(
         description="Status for each Point-of-Parity attribute"
     )
     
@@ -569,7 +571,7 @@ class SingleProductProfile(BaseModel):
 class StrategicInsightsResult(BaseModel):
     """Phase 3 output: Strategic insights from the complete analysis."""
     
-    strategic_insights: List[StrategicInsight] = Field(
+    strategic_insights: Tuple[StrategicInsight, ...] = Field(
         description="3-5 key strategic observations"
     )
     
@@ -1075,8 +1077,23 @@ class Product:
             }
         )
 
+    @classmethod
+    def from_details_many(
+        cls, details_list: List[Optional[ProductDetails]], category: str
+    ) -> List["Product"]:
+        """Create Products for every non-None ProductDetails, in order.
+        
+        Failed lookups (None) are dropped in the same pass that builds the
+        products, instead of a filter + append loop at each call site.
+        """
+        return [cls.from_product_details(d, category) for d in details_list if d is not None]
+
     def to_dict(self) -> Dict[str, Any]:
-        """Convertit le produit en dictionnaire."""
+        """Convertit le produit en dictionnaire.
+        
+        Les clés suivent l'ordre des champs : les étapes 2 et 3 laissent
+        orjson sérialiser le dataclass directement et obtiennent le même JSON.
+        """
         return {
             'brand': self.brand,
             'full_name': self.full_name,
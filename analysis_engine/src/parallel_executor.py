@@ -26,16 +26,25 @@ Usage:
     )
 """
 import asyncio
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
 from typing import (
     Any, 
+    AsyncIterator,
     Callable, 
     Coroutine, 
     Dict, 
     Generic, 
     List, 
+    Literal,
     Optional, 
+    Tuple,
     TypeVar,
     Union
 )
@@ -63,21 +72,34 @@ class Provider(Enum):
     FIRECRAWL = "firecrawl"
 
 
-@dataclass
+# Rate limiting algorithm used by a provider's executors (see create_rate_limiter)
+RateLimitAlgorithm = Literal["token_bucket", "leaky_bucket", "sliding_window"]
+
+
+@dataclass(frozen=True, slots=True)
 class ProviderLimits:
-    """Rate limit configuration for a provider."""
+    """Rate limit configuration for a provider.
+    
+    ``max_concurrent`` caps requests in flight; ``rate_limit_rpm`` (and
+    ``min_delay_seconds``) cap how fast new requests are sent. The two are
+    enforced independently. Instances are immutable, so the derived
+    ``delay_between_requests`` is computed once at construction.
+    """
     max_concurrent: int  # Maximum concurrent requests
     rate_limit_rpm: int  # Requests per minute limit
     min_delay_seconds: float = 0.0  # Minimum delay between requests
+    rate_limiter: RateLimitAlgorithm = "token_bucket"
+    # Delay between requests to stay within RPM limit (derived)
+    delay_between_requests: float = field(init=False, repr=False, compare=False)
     
-    @property
-    def delay_between_requests(self) -> float:
-        """Calculate delay between requests to stay within RPM limit."""
+    def __post_init__(self) -> None:
         if self.rate_limit_rpm <= 0:
-            return self.min_delay_seconds
-        # Add 10% buffer to RPM calculation
-        rpm_delay = 60.0 / (self.rate_limit_rpm * 0.9)
-        return max(rpm_delay, self.min_delay_seconds)
+            delay = self.min_delay_seconds
+        else:
+            # Add 10% buffer to RPM calculation
+            rpm_delay = 60.0 / (self.rate_limit_rpm * 0.9)
+            delay = max(rpm_delay, self.min_delay_seconds)
+        object.__setattr__(self, 'delay_between_requests', delay)
 
 
 # Default limits per provider
@@ -114,11 +136,355 @@ DEFAULT_PROVIDER_LIMITS: Dict[Provider, ProviderLimits] = {
 }
 
 
+# =============================================================================
+# Error Classification
+# =============================================================================
+
+# Client errors that are still worth retrying: timeout, conflict, rate limit
+RETRYABLE_CLIENT_STATUSES = frozenset({408, 409, 429})
+
+# Programming errors that will fail identically on every attempt
+UNRECOVERABLE_EXCEPTIONS = (TypeError, AttributeError, NameError, NotImplementedError)
+
+
+def _http_status(value: Any) -> Optional[int]:
+    """value if it is a plausible HTTP status code (100-599), else None."""
+    if isinstance(value, int) and not isinstance(value, bool) and 100 <= value <= 599:
+        return value
+    return None
+
+
+@lru_cache(maxsize=None)
+def _genai_error_types() -> Tuple[type, ...]:
+    """google-genai's APIError, if the SDK is installed (looked up once)."""
+    try:
+        from google.genai.errors import APIError
+    except ImportError:
+        return ()
+    return (APIError,)
+
+
+def get_status_code(error: BaseException) -> Optional[int]:
+    """Extract an HTTP status code from an SDK exception, if it carries one.
+    
+    Covers the OpenAI/Anthropic (``status_code``), httpx/requests
+    (``response.status_code``) and google-genai (``APIError.code``)
+    conventions. Other ``code`` attributes (errno, gRPC codes...) are not
+    HTTP statuses and are ignored.
+    """
+    status = _http_status(getattr(error, "status_code", None))
+    if status is None:
+        status = _http_status(getattr(getattr(error, "response", None), "status_code", None))
+    if status is None and isinstance(error, _genai_error_types()):
+        status = _http_status(getattr(error, "code", None))
+    return status
+
+
+class RateLimitError(Exception):
+    """Raised by a process function when the provider asks it to back off.
+    
+    The executor waits ``retry_after`` seconds (plus a little jitter) before
+    retrying, and pauses the shared rate limiter so other workers back off too.
+    """
+    
+    def __init__(self, retry_after: float, message: str = ""):
+        super().__init__(message or f"Rate limited, retry after {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+def get_retry_after(error: BaseException) -> Optional[float]:
+    """Return the server-requested back-off for a rate-limit error, if any.
+    
+    Handles RateLimitError as well as SDK exceptions for HTTP 429 that expose
+    the response's ``Retry-After`` header (seconds or HTTP-date).
+    """
+    if isinstance(error, RateLimitError):
+        return max(error.retry_after, 0.0)
+    if get_status_code(error) != 429:
+        return None
+    
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    value = headers.get("retry-after") if headers is not None else None
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Default retry policy: retry transient failures, fail fast on the rest.
+    
+    HTTP 4xx responses (other than 408/409/429) and programming errors are
+    unrecoverable. Everything else - 5xx, timeouts, connection errors and
+    ValueErrors from malformed LLM output - is retried.
+    """
+    if isinstance(error, UNRECOVERABLE_EXCEPTIONS):
+        return False
+    status = get_status_code(error)
+    if status is not None and 400 <= status < 500:
+        return status in RETRYABLE_CLIENT_STATUSES
+    return True
+
+
+# =============================================================================
+# Rate Limiter
+# =============================================================================
+
+class TokenBucket:
+    """Token bucket rate limiter shared by all workers of an executor.
+    
+    Tokens refill continuously at ``rate_per_second`` up to ``capacity``.
+    Each request reserves one token under a short lock and is told how long
+    to wait for it; the wait itself happens outside the lock, so concurrent
+    workers never queue behind each other's sleeps.
+    
+    The bucket is tracked as the monotonic time (in integer nanoseconds) at
+    which it will next be full again, so a reservation is a couple of integer
+    operations and is unaffected by wall-clock adjustments.
+    """
+    
+    def __init__(self, rate_per_second: float, capacity: float):
+        """Initialize the bucket (starts full).
+        
+        Args:
+            rate_per_second: Refill rate; 0 or less disables limiting
+            capacity: Maximum burst size in tokens
+        """
+        self.rate_per_second = rate_per_second
+        self.capacity = max(capacity, 1.0)
+        # Nanoseconds to refill one token, and to refill the whole bucket
+        self._interval_ns = int(1e9 / rate_per_second) if rate_per_second > 0 else 0
+        self._burst_ns = int(self.capacity * self._interval_ns)
+        # Monotonic time at which the bucket is full again (starts full)
+        self._full_at_ns = time.monotonic_ns()
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """Take one token and return the seconds to wait before using it."""
+        if self._interval_ns <= 0:
+            return 0.0
+        
+        with self._lock:
+            now = time.monotonic_ns()
+            self._full_at_ns = max(self._full_at_ns, now) + self._interval_ns
+            # Past one bucket's worth of deficit, this token becomes
+            # available once the excess has been refilled
+            wait_ns = self._full_at_ns - now - self._burst_ns
+        return wait_ns / 1e9 if wait_ns > 0 else 0.0
+    
+    def pause(self, seconds: float) -> None:
+        """Hold back every pending request for at least ``seconds``.
+        
+        Used when the provider returns a rate-limit response: the bucket is
+        driven into deficit so all workers, not just the one that got the
+        429, wait before sending again.
+        """
+        if self._interval_ns <= 0:
+            return
+        
+        with self._lock:
+            paused_full_at = time.monotonic_ns() + int(seconds * 1e9) + self._burst_ns
+            self._full_at_ns = max(self._full_at_ns, paused_full_at)
+    
+    async def acquire(self) -> None:
+        """Wait until a token is available."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def create_token_bucket(limits: ProviderLimits) -> TokenBucket:
+    """Create a token bucket matching a provider's limits.
+    
+    The refill interval is ``delay_between_requests`` (RPM with a 10% buffer,
+    floored at ``min_delay_seconds``) and the burst size is ``max_concurrent``.
+    """
+    delay = limits.delay_between_requests
+    rate = 1.0 / delay if delay > 0 else 0.0
+    return TokenBucket(rate_per_second=rate, capacity=limits.max_concurrent)
+
+
+class LeakyBucket:
+    """Leaky bucket rate limiter (as a meter) shared by all workers.
+    
+    Requests are let out one every ``1 / rate_per_second`` seconds with no
+    initial burst. Where the token bucket sends up to ``capacity`` requests
+    at once and then settles to the refill rate, this keeps the outbound rate
+    flat, which suits providers that enforce their quota over short windows.
+    Backlogged requests simply queue for later slots, at the cost of a
+    slightly longer tail latency.
+    """
+    
+    def __init__(self, rate_per_second: float):
+        """Initialize the bucket.
+        
+        Args:
+            rate_per_second: Drip rate; 0 or less disables limiting
+        """
+        self.rate_per_second = rate_per_second
+        self._interval_ns = int(1e9 / rate_per_second) if rate_per_second > 0 else 0
+        # Monotonic time of the next free send slot
+        self._next_slot_ns = time.monotonic_ns()
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """Claim the next send slot and return the seconds to wait for it."""
+        if self._interval_ns <= 0:
+            return 0.0
+        
+        with self._lock:
+            now = time.monotonic_ns()
+            slot = max(self._next_slot_ns, now)
+            self._next_slot_ns = slot + self._interval_ns
+        return (slot - now) / 1e9
+    
+    def pause(self, seconds: float) -> None:
+        """Hold back every pending request for at least ``seconds``."""
+        if self._interval_ns <= 0:
+            return
+        
+        with self._lock:
+            resume_at = time.monotonic_ns() + int(seconds * 1e9)
+            self._next_slot_ns = max(self._next_slot_ns, resume_at)
+    
+    async def acquire(self) -> None:
+        """Wait for this request's send slot."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class SlidingWindowLimiter:
+    """Sliding-window-counter rate limiter.
+    
+    Keeps request counts for the current and previous window and weights the
+    previous one by how much of it still overlaps the sliding window. Unlike a
+    fixed window this prevents two full bursts landing back-to-back across a
+    window boundary, which matters for tight quotas such as Gemini's 60 RPM.
+    """
+    
+    def __init__(self, limit: float, window_seconds: float = 60.0):
+        """Initialize the limiter.
+        
+        Args:
+            limit: Maximum requests per window; 0 or less disables limiting
+            window_seconds: Window length in seconds
+        """
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self._window_start = time.monotonic()
+        self._prev_count = 0
+        self._curr_count = 0
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+    
+    def _rotate(self, now: float) -> None:
+        """Advance the windows so that ``now`` falls in the current one."""
+        elapsed = now - self._window_start
+        if elapsed < self.window_seconds:
+            return
+        windows_passed = int(elapsed // self.window_seconds)
+        self._prev_count = self._curr_count if windows_passed == 1 else 0
+        self._curr_count = 0
+        self._window_start += windows_passed * self.window_seconds
+    
+    def reserve(self) -> float:
+        """Count a request if allowed now, else return seconds to wait first."""
+        if self.limit <= 0:
+            return 0.0
+        
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            
+            self._rotate(now)
+            elapsed = now - self._window_start
+            overlap = 1.0 - elapsed / self.window_seconds
+            if self._prev_count * overlap + self._curr_count + 1 <= self.limit:
+                self._curr_count += 1
+                return 0.0
+            
+            # Time until the previous window's weight has decayed enough,
+            # or until the current window rolls over if that isn't possible
+            until_rollover = self.window_seconds - elapsed
+            if self._prev_count == 0 or self._curr_count + 1 > self.limit:
+                return until_rollover
+            needed_overlap = (self.limit - self._curr_count - 1) / self._prev_count
+            return min(max((overlap - needed_overlap) * self.window_seconds, 0.001), until_rollover)
+    
+    def pause(self, seconds: float) -> None:
+        """Hold back every pending request for at least ``seconds``."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+    
+    async def acquire(self) -> None:
+        """Wait until the request fits in the sliding window."""
+        while True:
+            wait = self.reserve()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+
+RateLimiter = Union[TokenBucket, LeakyBucket, SlidingWindowLimiter]
+
+
+def create_rate_limiter(limits: ProviderLimits) -> RateLimiter:
+    """Create the rate limiter selected by ``limits.rate_limiter``."""
+    if limits.rate_limiter == "sliding_window":
+        # Same 10% safety buffer as delay_between_requests
+        limit = limits.rate_limit_rpm * 0.9 if limits.rate_limit_rpm > 0 else 0
+        return SlidingWindowLimiter(limit=limit)
+    if limits.rate_limiter == "leaky_bucket":
+        delay = limits.delay_between_requests
+        return LeakyBucket(rate_per_second=1.0 / delay if delay > 0 else 0.0)
+    if limits.rate_limiter != "token_bucket":
+        raise ValueError(f"Unknown rate limiter: {limits.rate_limiter}")
+    return create_token_bucket(limits)
+
+
+# Rate limiters shared by every executor in the process, keyed by
+# (provider, limits). Two pipeline stages hitting the same provider at the
+# same time then draw from one quota instead of each assuming the full RPM.
+_SHARED_RATE_LIMITERS: Dict[Tuple[Provider, ProviderLimits], RateLimiter] = {}
+_SHARED_RATE_LIMITERS_LOCK = threading.Lock()
+
+
+def get_shared_rate_limiter(
+    provider: Provider,
+    limits: ProviderLimits
+) -> RateLimiter:
+    """Get the process-wide rate limiter for a provider and its limits.
+    
+    Executors created with the default limits for a provider all share one
+    limiter; custom limits get their own shared limiter per distinct value.
+    The limiters only use a threading.Lock, so they are safe to share across
+    the event loops that execute_sync creates in different threads.
+    """
+    key = (provider, limits)
+    with _SHARED_RATE_LIMITERS_LOCK:
+        limiter = _SHARED_RATE_LIMITERS.get(key)
+        if limiter is None:
+            limiter = _SHARED_RATE_LIMITERS[key] = create_rate_limiter(limits)
+        return limiter
+
+
 # =============================================================================
 # Result Types
 # =============================================================================
 
-@dataclass
+# Error recorded for items left unprocessed when fail-fast aborts a batch
+BATCH_ABORTED_ERROR = "batch_aborted"
+
+@dataclass(slots=True)
 class ExecutionResult(Generic[R]):
     """Result of executing a single item."""
     index: int
@@ -128,9 +494,12 @@ class ExecutionResult(Generic[R]):
     duration_seconds: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class BatchResult(Generic[R]):
-    """Result of executing a batch of items."""
+    """Result of executing a batch of items.
+    
+    ``results`` is ordered by item index (``results[i].index == i``).
+    """
     results: List[ExecutionResult[R]] = field(default_factory=list)
     total_items: int = 0
     successful_count: int = 0
@@ -146,13 +515,11 @@ class BatchResult(Generic[R]):
     
     def get_successful_results(self) -> List[R]:
         """Get only successful results in order."""
-        return [r.result for r in sorted(self.results, key=lambda x: x.index) 
-                if r.success and r.result is not None]
+        return [r.result for r in self.results if r.success and r.result is not None]
     
     def get_all_results_ordered(self) -> List[Optional[R]]:
         """Get all results in original order (None for failures)."""
-        sorted_results = sorted(self.results, key=lambda x: x.index)
-        return [r.result if r.success else None for r in sorted_results]
+        return [r.result if r.success else None for r in self.results]
 
 
 # =============================================================================
@@ -162,6 +529,40 @@ class BatchResult(Generic[R]):
 ProgressCallback = Callable[[int, int, str, Optional[str]], None]
 # Args: (completed, total, status_message, item_identifier)
 
+# Progress is reported at most every PROGRESS_MIN_INTERVAL_NS or every
+# total // PROGRESS_MAX_UPDATES items, whichever comes first. Failures and
+# the final item are always reported. Batches of up to PROGRESS_MAX_UPDATES
+# items therefore still report every completion.
+PROGRESS_MIN_INTERVAL_NS = 100_000_000  # 100ms
+PROGRESS_MAX_UPDATES = 200
+
+
+def _throttle_progress(callback: ProgressCallback, total: int) -> ProgressCallback:
+    """Wrap a progress callback so it fires in batches, not per item.
+    
+    Each report is a synchronous print in the callers, i.e. a write to the
+    terminal from inside the event loop; on large batches reporting every
+    completion costs more than the work being reported.
+    """
+    step = max(1, total // PROGRESS_MAX_UPDATES)
+    last_completed = 0
+    last_report_ns = time.monotonic_ns()
+    
+    def throttled(completed: int, total: int, status: str, item_id: Optional[str]) -> None:
+        nonlocal last_completed, last_report_ns
+        now = time.monotonic_ns()
+        if (
+            completed == total
+            or status == "✗"
+            or completed - last_completed >= step
+            or now - last_report_ns >= PROGRESS_MIN_INTERVAL_NS
+        ):
+            last_completed = completed
+            last_report_ns = now
+            callback(completed, total, status, item_id)
+    
+    return throttled
+
 
 # =============================================================================
 # Main ParallelExecutor Class
@@ -197,7 +598,12 @@ class ParallelExecutor(Generic[T, R]):
         provider: Provider,
         limits: Optional[ProviderLimits] = None,
         max_retries: int = 2,
-        retry_delay_seconds: float = 1.0
+        retry_delay_seconds: float = 1.0,
+        retry_max_delay_seconds: float = 30.0,
+        is_retryable: Optional[Callable[[Exception], bool]] = None,
+        max_rate_limit_retries: int = 5,
+        fail_fast_threshold: Optional[float] = None,
+        fail_fast_min_sample: int = 20
     ):
         """Initialize the executor.
         
@@ -205,7 +611,16 @@ class ParallelExecutor(Generic[T, R]):
             provider: API provider to use (determines default limits)
             limits: Optional custom limits (overrides defaults)
             max_retries: Maximum retries per item on failure
-            retry_delay_seconds: Delay between retries
+            retry_delay_seconds: Base delay for exponential retry backoff
+            retry_max_delay_seconds: Upper bound on a single retry delay
+            is_retryable: Predicate deciding whether a failure is retried
+                (defaults to is_retryable_error)
+            max_rate_limit_retries: Retries allowed for rate-limit errors that
+                carry a Retry-After; these don't count against max_retries
+            fail_fast_threshold: Abort a batch once this fraction of completed
+                items has failed (e.g. 0.5); None never aborts
+            fail_fast_min_sample: Completed items required before the
+                failure rate is trusted enough to abort
         """
         self.provider = provider
         self.limits = limits or DEFAULT_PROVIDER_LIMITS.get(
@@ -214,26 +629,41 @@ class ParallelExecutor(Generic[T, R]):
         )
         self.max_retries = max_retries
         self.retry_delay_seconds = retry_delay_seconds
+        self.retry_max_delay_seconds = retry_max_delay_seconds
+        self.is_retryable = is_retryable or is_retryable_error
+        self.max_rate_limit_retries = max_rate_limit_retries
+        self.fail_fast_threshold = fail_fast_threshold
+        self.fail_fast_min_sample = fail_fast_min_sample
         
         # Execution state
-        self._semaphore: Optional[asyncio.Semaphore] = None
-        self._last_request_time: float = 0
-        self._request_lock: Optional[asyncio.Lock] = None
+        # No limiter at all when the limits allow back-to-back requests, so
+        # unthrottled providers skip the per-request reservation entirely
+        self._rate_limiter: Optional[RateLimiter] = (
+            get_shared_rate_limiter(provider, self.limits)
+            if self.limits.delay_between_requests > 0 else None
+        )
     
     async def _wait_for_rate_limit(self) -> None:
         """Wait if needed to respect rate limits."""
-        if self._request_lock is None:
-            self._request_lock = asyncio.Lock()
+        await self._rate_limiter.acquire()
+    
+    def _retry_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter for the given attempt.
         
-        async with self._request_lock:
-            now = time.time()
-            elapsed = now - self._last_request_time
-            delay_needed = self.limits.delay_between_requests - elapsed
-            
-            if delay_needed > 0:
-                await asyncio.sleep(delay_needed)
-            
-            self._last_request_time = time.time()
+        Randomizing over the whole [0, cap] range de-correlates workers that
+        failed together (e.g. on a burst of 429s) so they don't retry in
+        lockstep.
+        """
+        cap = min(self.retry_max_delay_seconds, self.retry_delay_seconds * (2 ** attempt))
+        return random.uniform(0, cap)
+    
+    def _should_abort(self, completed: int, failed: int) -> bool:
+        """Whether the failure rate so far trips the fail-fast threshold."""
+        return (
+            self.fail_fast_threshold is not None
+            and completed >= self.fail_fast_min_sample
+            and failed / completed > self.fail_fast_threshold
+        )
     
     async def _execute_single(
         self,
@@ -248,42 +678,59 @@ class ParallelExecutor(Generic[T, R]):
             index: Item index for ordering
             item: Item to process
             process_func: Async function to process the item
-            get_item_id: Optional function to get item identifier for logging
+            get_item_id: Unused; kept for backward compatibility
             
         Returns:
             ExecutionResult with success/failure and result
         """
-        item_id = get_item_id(item) if get_item_id else f"item_{index}"
-        start_time = time.time()
+        start_ns = time.monotonic_ns()
         last_error: Optional[str] = None
+        attempt = 0
+        rate_limit_waits = 0
         
-        for attempt in range(self.max_retries + 1):
+        while True:
             try:
-                # Wait for rate limit
-                await self._wait_for_rate_limit()
+                # In-flight requests are capped by the worker pool in
+                # execute() (max_concurrent); the token is taken right before
+                # sending, so the limiter only paces the send rate
+                if self._rate_limiter is not None:
+                    await self._wait_for_rate_limit()
+                result = await process_func(item)
+                
+                duration = (time.monotonic_ns() - start_ns) / 1e9
+                return ExecutionResult(
+                    index=index,
+                    success=True,
+                    result=result,
+                    duration_seconds=duration
+                )
                 
-                # Acquire semaphore for concurrency control
-                async with self._semaphore:
-                    result = await process_func(item)
-                    
-                    duration = time.time() - start_time
-                    return ExecutionResult(
-                        index=index,
-                        success=True,
-                        result=result,
-                        duration_seconds=duration
-                    )
-                    
             except Exception as e:
                 last_error = str(e)
                 
-                if attempt < self.max_retries:
-                    # Retry after delay
-                    await asyncio.sleep(self.retry_delay_seconds * (attempt + 1))
+                # Provider told us exactly how long to back off: honor it and
+                # make every other worker wait too
+                retry_after = get_retry_after(e)
+                if retry_after is not None and rate_limit_waits < self.max_rate_limit_retries:
+                    rate_limit_waits += 1
+                    if self._rate_limiter is not None:
+                        self._rate_limiter.pause(retry_after)
+                    await asyncio.sleep(retry_after + random.uniform(0, 0.5))
                     continue
+                
+                if not self.is_retryable(e):
+                    # Deterministic failure - retrying would only waste time
+                    break
+                
+                if attempt >= self.max_retries:
+                    break
+                
+                # Retry after a jittered exponential delay
+                await asyncio.sleep(self._retry_delay(attempt))
+                attempt += 1
         
-        # All retries failed
-        duration = time.time() - start_time
+        # All retries failed (or the error was unrecoverable)
+        duration = (time.monotonic_ns() - start_ns) / 1e9
         return ExecutionResult(
             index=index,
             success=False,
@@ -300,6 +747,10 @@ class ParallelExecutor(Generic[T, R]):
     ) -> BatchResult[R]:
         """Execute processing for all items in parallel.
         
+        If ``fail_fast_threshold`` is set and the failure rate crosses it
+        (e.g. every call failing on a bad API key), the remaining work is
+        cancelled and unfinished items fail with ``BATCH_ABORTED_ERROR``.
+        
         Args:
             items: List of items to process
             process_func: Async function to process each item
@@ -312,42 +763,91 @@ class ParallelExecutor(Generic[T, R]):
         if not items:
             return BatchResult(total_items=0)
         
-        # Initialize semaphore for this batch
-        self._semaphore = asyncio.Semaphore(self.limits.max_concurrent)
-        self._request_lock = asyncio.Lock()
-        self._last_request_time = 0
-        
         total = len(items)
-        start_time = time.time()
-        results: List[ExecutionResult[R]] = []
+        start_ns = time.monotonic_ns()
+        # Preallocated by index: each result lands in its slot as it
+        # completes, so the final list is already in input order
+        results: List[Optional[ExecutionResult[R]]] = [None] * total
         completed = 0
+        successful = 0
+        failed = 0
         
         # Report start
         if progress_callback:
             progress_callback(0, total, "Starting...", None)
+            progress_callback = _throttle_progress(progress_callback, total)
+        
+        # Resolve display identifiers once rather than on every completion
+        item_ids = [get_item_id(it) for it in items] if get_item_id and progress_callback else None
         
-        # Create tasks for all items
-        tasks = [
-            self._execute_single(i, item, process_func, get_item_id)
-            for i, item in enumerate(items)
+        # A fixed pool of max_concurrent workers pulls items from a shared
+        # iterator, so only O(max_concurrent) coroutines exist at any time
+        # regardless of batch size
+        pending = iter(enumerate(items))
+        finished: asyncio.Queue = asyncio.Queue()
+        
+        async def worker() -> None:
+            for index, item in pending:
+                try:
+                    result = await self._execute_single(index, item, process_func)
+                except Exception as e:
+                    # Never lose an item, or the collector below would wait forever
+                    result = ExecutionResult(index=index, success=False, error=str(e))
+                finished.put_nowait(result)
+        
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(self.limits.max_concurrent, total))
         ]
         
-        # Execute with progress tracking
-        for coro in asyncio.as_completed(tasks):
-            result = await coro
-            results.append(result)
-            completed += 1
-            
-            # Report progress
-            if progress_callback:
-                item_id = get_item_id(items[result.index]) if get_item_id else None
-                status = "✓" if result.success else "✗"
-                progress_callback(completed, total, status, item_id)
+        # Collect results with progress tracking
+        try:
+            while completed < total:
+                result = await finished.get()
+                results[result.index] = result
+                completed += 1
+                if result.success:
+                    successful += 1
+                else:
+                    failed += 1
+                
+                # Report progress
+                if progress_callback:
+                    item_id = item_ids[result.index] if item_ids is not None else None
+                    status = "✓" if result.success else "✗"
+                    progress_callback(completed, total, status, item_id)
+                
+                if self._should_abort(completed, failed) and completed < total:
+                    print(
+                        f"[!] {self.provider.value}: {failed}/{completed} items failed, "
+                        f"aborting the remaining {total - completed}"
+                    )
+                    break
+        finally:
+            for task in workers:
+                task.cancel()
+            # Let the cancellations settle so no worker outlives this batch
+            await asyncio.gather(*workers, return_exceptions=True)
+        
+        if completed < total:
+            # Aborted: keep results that finished while workers were
+            # cancelled, fail everything else
+            while not finished.empty():
+                result = finished.get_nowait()
+                results[result.index] = result
+                if result.success:
+                    successful += 1
+                else:
+                    failed += 1
+            for index, result in enumerate(results):
+                if result is None:
+                    results[index] = ExecutionResult(
+                        index=index, success=False, error=BATCH_ABORTED_ERROR
+                    )
+                    failed += 1
         
         # Calculate summary
-        total_duration = time.time() - start_time
-        successful = sum(1 for r in results if r.success)
-        failed = sum(1 for r in results if not r.success)
+        total_duration = (time.monotonic_ns() - start_ns) / 1e9
         
         return BatchResult(
             results=results,
@@ -357,6 +857,94 @@ class ParallelExecutor(Generic[T, R]):
             total_duration_seconds=total_duration
         )
     
+    async def execute_stream(
+        self,
+        items: AsyncIterator[T],
+        process_func: Callable[[T], Coroutine[Any, Any, R]],
+        get_item_id: Optional[Callable[[T], str]] = None,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> BatchResult[R]:
+        """Execute processing for items as a producer yields them.
+        
+        Same retries, rate limiting and fail-fast as execute(), for items
+        that are not all known up front (e.g. step 2 details for brands
+        still being discovered). Items are indexed in arrival order, and
+        ``total`` in progress reports is the number received so far. Once
+        fail-fast trips, no further items are taken from ``items``; the
+        ones already in flight finish.
+        
+        Args:
+            items: Async iterator of items to process
+            process_func: Async function to process each item
+            get_item_id: Optional function to get item identifier
+            progress_callback: Optional callback for progress updates
+            
+        Returns:
+            BatchResult for the items received, in arrival order
+        """
+        start_ns = time.monotonic_ns()
+        results: List[Optional[ExecutionResult[R]]] = []
+        completed = 0
+        successful = 0
+        failed = 0
+        aborted = False
+        # Workers take items one at a time: an async iterator can't be
+        # advanced by several tasks at once
+        pull_lock = asyncio.Lock()
+        
+        async def next_item() -> Optional[Tuple[int, T]]:
+            async with pull_lock:
+                if aborted:
+                    return None
+                try:
+                    item = await anext(items)
+                except StopAsyncIteration:
+                    return None
+                results.append(None)
+                return len(results) - 1, item
+        
+        async def worker() -> None:
+            nonlocal completed, successful, failed, aborted
+            while (pulled := await next_item()) is not None:
+                index, item = pulled
+                try:
+                    result = await self._execute_single(index, item, process_func)
+                except Exception as e:
+                    result = ExecutionResult(index=index, success=False, error=str(e))
+                results[index] = result
+                completed += 1
+                if result.success:
+                    successful += 1
+                else:
+                    failed += 1
+                
+                if progress_callback:
+                    item_id = get_item_id(item) if get_item_id else None
+                    progress_callback(completed, len(results), "✓" if result.success else "✗", item_id)
+                
+                if not aborted and self._should_abort(completed, failed):
+                    aborted = True
+                    print(
+                        f"[!] {self.provider.value}: {failed}/{completed} items failed, "
+                        f"not taking any more items"
+                    )
+        
+        workers = [asyncio.create_task(worker()) for _ in range(self.limits.max_concurrent)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        
+        return BatchResult(
+            results=results,
+            total_items=len(results),
+            successful_count=successful,
+            failed_count=failed,
+            total_duration_seconds=(time.monotonic_ns() - start_ns) / 1e9
+        )
+    
     def execute_sync(
         self,
         items: List[T],
@@ -366,14 +954,172 @@ class ParallelExecutor(Generic[T, R]):
     ) -> BatchResult[R]:
         """Synchronous wrapper for execute().
         
-        Use this when calling from synchronous code.
+        Use this when calling from synchronous code. The event loop gets a
+        default thread pool sized to max_concurrent, so process functions that
+        offload blocking SDK calls with asyncio.to_thread get exactly one
+        worker per concurrency slot.
         """
-        return asyncio.run(self.execute(
+        return self._run_sync(lambda: self.execute(
             items=items,
             process_func=process_func,
             get_item_id=get_item_id,
             progress_callback=progress_callback
         ))
+    
+    async def execute_batched(
+        self,
+        items: List[T],
+        batch_process_func: Callable[[List[T]], Coroutine[Any, Any, List[R]]],
+        batch_size: int,
+        get_item_id: Optional[Callable[[T], str]] = None,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> BatchResult[R]:
+        """Execute items in chunks, one provider request per chunk.
+        
+        For APIs that accept several inputs per call: each chunk of up to
+        ``batch_size`` items goes through the usual concurrency, rate-limit
+        and retry handling as a single request, so it consumes one RPM token.
+        ``batch_process_func`` must return one result per input, in order.
+        
+        If a chunk still fails after its retries, it is split in half and the
+        halves are re-run, isolating the failing items instead of failing the
+        whole chunk.
+        
+        Args:
+            items: List of items to process
+            batch_process_func: Async function processing a list of items
+            batch_size: Maximum items per request
+            get_item_id: Optional function to get item identifier
+            progress_callback: Optional callback for progress updates
+            
+        Returns:
+            BatchResult with one ExecutionResult per item, in input order
+        """
+        if not items:
+            return BatchResult(total_items=0)
+        
+        total = len(items)
+        start_ns = time.monotonic_ns()
+        results: List[Optional[ExecutionResult[R]]] = [None] * total
+        completed = 0
+        successful = 0
+        
+        item_ids = [get_item_id(it) for it in items] if get_item_id and progress_callback else None
+        
+        def report(index: int, success: bool) -> None:
+            nonlocal completed
+            completed += 1
+            if progress_callback:
+                item_id = item_ids[index] if item_ids is not None else None
+                progress_callback(completed, total, "✓" if success else "✗", item_id)
+        
+        async def process_chunk(indices: List[int]) -> List[R]:
+            outputs = await batch_process_func([items[i] for i in indices])
+            if len(outputs) != len(indices):
+                raise ValueError(
+                    f"batch_process_func returned {len(outputs)} results for {len(indices)} items"
+                )
+            return outputs
+        
+        if progress_callback:
+            progress_callback(0, total, "Starting...", None)
+            progress_callback = _throttle_progress(progress_callback, total)
+        
+        size = max(batch_size, 1)
+        chunks = [list(range(i, min(i + size, total))) for i in range(0, total, size)]
+        
+        while chunks:
+            round_result = await self.execute(items=chunks, process_func=process_chunk)
+            
+            retry_chunks: List[List[int]] = []
+            for chunk, chunk_result in zip(chunks, round_result.results):
+                if chunk_result.success:
+                    for index, output in zip(chunk, chunk_result.result):
+                        results[index] = ExecutionResult(
+                            index=index,
+                            success=True,
+                            result=output,
+                            duration_seconds=chunk_result.duration_seconds
+                        )
+                        successful += 1
+                        report(index, True)
+                elif chunk_result.error == BATCH_ABORTED_ERROR:
+                    # Fail-fast tripped: don't bisect work that never ran
+                    for index in chunk:
+                        results[index] = ExecutionResult(
+                            index=index, success=False, error=BATCH_ABORTED_ERROR
+                        )
+                        report(index, False)
+                elif len(chunk) > 1:
+                    # Bisect to isolate the item(s) breaking the request
+                    mid = len(chunk) // 2
+                    retry_chunks.extend((chunk[:mid], chunk[mid:]))
+                else:
+                    index = chunk[0]
+                    results[index] = ExecutionResult(
+                        index=index,
+                        success=False,
+                        error=chunk_result.error,
+                        duration_seconds=chunk_result.duration_seconds
+                    )
+                    report(index, False)
+            
+            if retry_chunks and self._should_abort(len(chunks), round_result.failed_count):
+                # Most requests are failing outright: bisecting would only
+                # multiply them
+                for chunk in retry_chunks:
+                    for index in chunk:
+                        results[index] = ExecutionResult(
+                            index=index, success=False, error=BATCH_ABORTED_ERROR
+                        )
+                        report(index, False)
+                break
+            chunks = retry_chunks
+        
+        return BatchResult(
+            results=results,
+            total_items=total,
+            successful_count=successful,
+            failed_count=total - successful,
+            total_duration_seconds=(time.monotonic_ns() - start_ns) / 1e9
+        )
+    
+    def execute_batched_sync(
+        self,
+        items: List[T],
+        batch_process_func: Callable[[List[T]], Coroutine[Any, Any, List[R]]],
+        batch_size: int,
+        get_item_id: Optional[Callable[[T], str]] = None,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> BatchResult[R]:
+        """Synchronous wrapper for execute_batched()."""
+        return self._run_sync(lambda: self.execute_batched(
+            items=items,
+            batch_process_func=batch_process_func,
+            batch_size=batch_size,
+            get_item_id=get_item_id,
+            progress_callback=progress_callback
+        ))
+    
+    def _run_sync(
+        self,
+        make_coro: Callable[[], Coroutine[Any, Any, BatchResult[R]]]
+    ) -> BatchResult[R]:
+        """Run an execute coroutine on a fresh loop with a sized thread pool.
+        
+        asyncio.run scopes the loop to this call: async generators and the
+        default executor are shut down and the loop is closed before it
+        returns, so nothing outlives the batch.
+        """
+        async def run_with_pool() -> BatchResult[R]:
+            asyncio.get_running_loop().set_default_executor(pool)
+            return await make_coro()
+        
+        with ThreadPoolExecutor(
+            max_workers=self.limits.max_concurrent,
+            thread_name_prefix=f"{self.provider.value}-worker"
+        ) as pool:
+            return asyncio.run(run_with_pool())
 
 
 # =============================================================================
@@ -467,9 +1213,8 @@ def wrap_sync_func(
         Async wrapper function
     """
     async def async_wrapper(item: T) -> R:
-        # Run sync function in thread pool to not block event loop
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, sync_func, item)
+        # Run sync function in the loop's thread pool to not block it
+        return await asyncio.to_thread(sync_func, item)
     
     return async_wrapper
 
@@ -14,7 +14,7 @@ Example usage:
     uv run python main.py --run-id 20260120_184854 --steps 3-4
 """
 from .base import Step, Pipeline, PipelineContext, parse_steps_arg
-from .steps import STEPS, get_step, list_steps
+from .steps import STEPS, STEPS_BY_NUM, get_step, list_steps, list_steps_dag
 
 __all__ = [
     'Step',
@@ -22,6 +22,8 @@ __all__ = [
     'PipelineContext',
     'parse_steps_arg',
     'STEPS',
+    'STEPS_BY_NUM',
     'get_step',
     'list_steps',
+    'list_steps_dag',
 ]
@@ -4,9 +4,12 @@ Provides Step definitions and Pipeline orchestration with:
 - Dependency validation
 - File-based checkpointing
 - Flexible step execution (ranges, single steps, resume)
+- Concurrent execution of independent steps
 """
+from concurrent.futures import ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 import re
@@ -33,6 +36,21 @@ class PipelineContext:
     output_dir: Path
     data: Dict[str, Any] = field(default_factory=dict)
     
+    @cached_property
+    def discovered_path(self) -> Path:
+        """Output of steps 1 and 2 (discovered brands, enriched by step 2)."""
+        return self.output_dir / f"{self.category_slug}_discovered_{self.run_id}.json"
+    
+    @cached_property
+    def scraped_path(self) -> Path:
+        """Output of step 3 (scraped products)."""
+        return self.output_dir / f"{self.category_slug}_scraped_{self.run_id}.json"
+    
+    @cached_property
+    def results_csv_path(self) -> Path:
+        """Convenience CSV written alongside step 3's output."""
+        return self.output_dir / f"{self.category_slug}_results_{self.run_id}.csv"
+    
     @classmethod
     def create_new(
         cls,
@@ -108,6 +126,9 @@ class Step:
         output_pattern: Pattern for output file (uses {category} and {run_id})
         requires: List of step numbers that must be completed first
         executor: Function that executes this step
+        snapshot: Optional function called before the step is launched
+            alongside other steps, to capture inputs into ctx.data that a
+            concurrent step may rewrite on disk
     """
     number: int
     name: str
@@ -115,6 +136,7 @@ class Step:
     output_pattern: str
     requires: List[int] = field(default_factory=list)
     executor: Optional[Callable[[PipelineContext, Any], Any]] = None
+    snapshot: Optional[Callable[[PipelineContext, Any], None]] = None
     
     def get_output_file(self, ctx: PipelineContext) -> Path:
         """Get the output file path for this step."""
@@ -188,10 +210,12 @@ def parse_steps_arg(steps_arg: str, max_step: int) -> List[int]:
             if start > end:
                 raise ValueError(f"Invalid range: {start} > {end}")
             
-            for i in range(start, end + 1):
-                if i < 1 or i > max_step:
-                    raise ValueError(f"Step {i} is out of range (1-{max_step})")
-                steps.add(i)
+            # Bounds-check the endpoints once, then union the whole range
+            if start < 1 or start > max_step:
+                raise ValueError(f"Step {start} is out of range (1-{max_step})")
+            if end > max_step:
+                raise ValueError(f"Step {end} is out of range (1-{max_step})")
+            steps.update(range(start, end + 1))
         else:
             # Single number: "4"
             if not part.isdigit():
@@ -211,7 +235,7 @@ class Pipeline:
     Handles:
     - Step registration
     - Dependency validation
-    - Sequential execution
+    - Wave execution (independent steps run concurrently)
     - Progress tracking
     """
     
@@ -275,6 +299,103 @@ class Pipeline:
         
         return len(errors) == 0, errors
     
+    def plan_waves(self, step_numbers: List[int]) -> List[List[int]]:
+        """Group the requested steps into waves of independent steps.
+        
+        Steps are taken in order; a step joins the current wave unless it
+        requires a step of that wave or writes the same output file as one
+        of them. E.g. steps 1-7 give [[1], [2], [3], [4], [5], [6, 7]].
+        
+        Args:
+            step_numbers: List of steps to execute (in order)
+            
+        Returns:
+            List of waves, each a list of step numbers
+        """
+        waves: List[List[int]] = []
+        wave: List[int] = []
+        wave_outputs: Set[str] = set()
+        
+        for step_num in step_numbers:
+            step = self.steps[step_num]
+            if wave and (
+                any(req in wave for req in step.requires)
+                or step.output_pattern in wave_outputs
+            ):
+                waves.append(wave)
+                wave, wave_outputs = [], set()
+            wave.append(step_num)
+            wave_outputs.add(step.output_pattern)
+        
+        if wave:
+            waves.append(wave)
+        return waves
+    
+    def execute_wave(
+        self,
+        wave: List[int],
+        ctx: PipelineContext
+    ) -> Dict[int, Optional[BaseException]]:
+        """Execute the steps of one wave, concurrently if there are several.
+        
+        Each step's result is stored in ctx.data as step_<n>_result. Steps
+        of a multi-step wave first run their snapshot hook (sequentially),
+        then their executors run in worker threads. A failing step, or a
+        failing snapshot hook (the step is then not run), doesn't cancel the
+        others in its wave.
+        
+        No event loop is involved, so this works from inside a running one
+        (async route, notebook).
+        
+        Args:
+            wave: Step numbers from plan_waves, all with an executor
+            ctx: Pipeline context
+            
+        Returns:
+            Dictionary mapping step number (in wave order) to the exception
+            it raised, or None if it succeeded
+        """
+        if len(wave) == 1:
+            step = self.steps[wave[0]]
+            try:
+                ctx.data[f"step_{step.number}_result"] = step.executor(ctx, self.config)
+            except Exception as e:
+                return {step.number: e}
+            return {step.number: None}
+        
+        outcomes: Dict[int, Optional[BaseException]] = {}
+        runnable: List[int] = []
+        for step_num in wave:
+            step = self.steps[step_num]
+            if step.snapshot:
+                try:
+                    step.snapshot(ctx, self.config)
+                except Exception as e:
+                    outcomes[step_num] = e
+                    continue
+            runnable.append(step_num)
+        
+        if runnable:
+            with ThreadPoolExecutor(
+                max_workers=len(runnable), thread_name_prefix="pipeline-step"
+            ) as pool:
+                futures = {
+                    step_num: pool.submit(self.steps[step_num].executor, ctx, self.config)
+                    for step_num in runnable
+                }
+                wait(futures.values())
+            
+            for step_num, future in futures.items():
+                error = future.exception()
+                if error is None:
+                    ctx.data[f"step_{step_num}_result"] = future.result()
+                elif not isinstance(error, Exception):
+                    # KeyboardInterrupt / SystemExit: stop the run
+                    raise error
+                outcomes[step_num] = error
+        
+        return {step_num: outcomes[step_num] for step_num in wave}
+    
     def run(
         self,
         step_numbers: List[int],
@@ -301,38 +422,44 @@ class Pipeline:
         # Ensure output directory exists
         ctx.output_dir.mkdir(exist_ok=True)
         
-        # Execute steps
-        for step_num in step_numbers:
-            step = self.steps[step_num]
-            
-            if verbose:
-                print(f"\n{'=' * 70}")
-                print(f"STEP {step.number}: {step.description}")
-                print("=" * 70)
-            
-            # Check if already completed
-            if step.is_completed(ctx):
+        # Execute steps, wave by wave
+        for wave in self.plan_waves(step_numbers):
+            for step_num in wave:
+                step = self.steps[step_num]
+                
                 if verbose:
-                    print(f"[i] Step already completed. Re-running...")
+                    print(f"\n{'=' * 70}")
+                    print(f"STEP {step.number}: {step.description}")
+                    print("=" * 70)
+                
+                # Check if already completed
+                if step.is_completed(ctx):
+                    if verbose:
+                        print(f"[i] Step already completed. Re-running...")
+                
+                if not step.executor:
+                    print(f"[!] No executor defined for step {step_num}")
+                    return False
+            
+            if verbose and len(wave) > 1:
+                print(f"\n[i] Running steps {', '.join(map(str, wave))} concurrently")
             
             # Execute
-            if step.executor:
-                try:
-                    result = step.executor(ctx, self.config)
-                    ctx.data[f"step_{step_num}_result"] = result
-                except Exception as e:
-                    print(f"[!] Step {step_num} failed: {e}")
+            failed = False
+            for step_num, error in self.execute_wave(wave, ctx).items():
+                if error is not None:
+                    print(f"[!] Step {step_num} failed: {error}")
                     import traceback
-                    traceback.print_exc()
-                    return False
-            else:
-                print(f"[!] No executor defined for step {step_num}")
+                    traceback.print_exception(type(error), error, error.__traceback__)
+                    failed = True
+            if failed:
                 return False
             
             if verbose:
-                output_file = step.get_output_file(ctx)
-                if output_file.exists():
-                    print(f"[✓] Output: {output_file}")
+                for step_num in wave:
+                    output_file = self.steps[step_num].get_output_file(ctx)
+                    if output_file.exists():
+                        print(f"[✓] Output: {output_file}")
         
         return True
     
@@ -0,0 +1,98 @@
+"""Persistent cache for pipeline step results.
+
+Step 2 asks OpenAI + Web Search for each brand's flagship product, which is
+the most expensive call of the pipeline. The answer for a given brand,
+category, country and model rarely changes between runs, so it is kept in a
+small SQLite database under the output directory and reused by later runs
+(and by re-runs of a partially failed step). Keys include a fingerprint of
+the prompts, so editing a prompt invalidates the answers it produced.
+"""
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import orjson
+
+from ..utils import normalize_query
+
+
+class DetailsCache:
+    """SQLite-backed cache of step 2 product details.
+    
+    Keys and values are opaque, so the rebrand pipeline uses the same
+    class (in its own database) for its image extractions.
+    
+    Values are stored as orjson bytes together with the time they were
+    written; entries older than ``ttl_seconds`` are treated as misses.
+    ``hits`` and ``misses`` count get() outcomes since the cache was opened.
+    """
+    
+    def __init__(self, path: Path, ttl_seconds: int):
+        """Open (and create if needed) the cache database.
+        
+        Args:
+            path: SQLite database file
+            ttl_seconds: Maximum age of a usable entry
+        """
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS details ("
+            "k TEXT PRIMARY KEY, v BLOB NOT NULL, ts INTEGER NOT NULL)"
+        )
+        self._conn.commit()
+    
+    @staticmethod
+    def make_key(
+        brand: str,
+        category: str,
+        country: str,
+        model: str,
+        prompt_version: str = ""
+    ) -> str:
+        """Build the cache key for one brand's details request.
+        
+        Brand, category and country are normalized, so spelling variants of
+        the same query ("lait d'avoine" / "Lait d avoine") share entries.
+        """
+        raw = f"{normalize_query(brand)}|{normalize_query(category)}|{normalize_query(country)}|{model}|{prompt_version}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached value, or None if missing or expired."""
+        row = self._conn.execute(
+            "SELECT v, ts FROM details WHERE k = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        value, written_at = row
+        if time.time() - written_at > self.ttl_seconds:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return orjson.loads(value)
+    
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a value, replacing any previous entry for the key."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO details (k, v, ts) VALUES (?, ?, ?)",
+            (key, orjson.dumps(value), int(time.time()))
+        )
+        self._conn.commit()
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+    
+    def __enter__(self) -> "DetailsCache":
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
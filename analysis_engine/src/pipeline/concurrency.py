@@ -0,0 +1,77 @@
+"""Worker counts sized to the CPUs this process may actually use.
+
+The ``max_concurrent`` values in ParallelizationConfig are provider ceilings
+(tier and subscription limits). Network-bound work runs at that ceiling:
+requests in flight spend nearly all their time waiting on the provider, so
+the CPU count says little about how many a worker can serve.
+
+Local (CPU-bound) work is sized to the usable CPUs. ``os.cpu_count()``
+reports the host's CPUs, and ``os.sched_getaffinity`` only reflects a cpuset
+restriction (``docker --cpuset-cpus``), not a CFS quota (``docker --cpus``,
+Kubernetes CPU limits). available_cpus therefore also reads the cgroup quota.
+"""
+import math
+import os
+from pathlib import Path
+from typing import Optional
+
+# cgroup v2 quota file ("<quota> <period>", quota "max" if unlimited)
+CGROUP_V2_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+# cgroup v1 quota and period files (quota -1 if unlimited)
+CGROUP_V1_CPU_QUOTA = Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+CGROUP_V1_CPU_PERIOD = Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+
+
+def _cgroup_cpu_limit() -> Optional[int]:
+    """CPUs allowed by the cgroup CFS quota, rounded up; None if unlimited."""
+    try:
+        quota, period = CGROUP_V2_CPU_MAX.read_text().split()[:2]
+    except (OSError, ValueError):
+        try:
+            quota = CGROUP_V1_CPU_QUOTA.read_text().strip()
+            period = CGROUP_V1_CPU_PERIOD.read_text().strip()
+        except OSError:
+            return None
+    try:
+        quota_us, period_us = int(quota), int(period)
+    except ValueError:
+        # "max": no quota
+        return None
+    if quota_us <= 0 or period_us <= 0:
+        return None
+    return max(1, math.ceil(quota_us / period_us))
+
+
+def available_cpus() -> int:
+    """Number of CPUs this process may use (affinity mask and cgroup quota)."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        # sched_getaffinity is not available on macOS / Windows
+        cpus = os.cpu_count() or 1
+    limit = _cgroup_cpu_limit()
+    return min(cpus, limit) if limit is not None else cpus
+
+
+def recommend(kind: str, configured: int) -> int:
+    """Recommend a worker count for a batch.
+
+    Args:
+        kind: "io" for provider-bound work (OpenAI, Gemini, Firecrawl), which
+            always gets the configured provider limit; "cpu" for local work
+            (validation, image processing), capped at available_cpus()
+        configured: Configured maximum (e.g. config.parallel.openai.max_concurrent)
+
+    Returns:
+        Worker count between 1 and ``configured``
+
+    Raises:
+        ValueError: If kind is unknown
+    """
+    if kind == "io":
+        target = configured
+    elif kind == "cpu":
+        target = available_cpus()
+    else:
+        raise ValueError(f"Unknown workload kind: '{kind}'")
+    return max(1, min(configured, target))
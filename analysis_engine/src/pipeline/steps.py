@@ -12,17 +12,34 @@ Current steps:
 3. Web Scraping - Scrape product pages using Firecrawl
 4. Image Selection - Select and download best product images using AI
 """
-import json
+import csv
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from .base import Step, PipelineContext
+from .concurrency import recommend
+from ..utils import read_json, write_json_array
 
 
 # =============================================================================
 # Step Executors
 # =============================================================================
 
+# Columns of the step 3 convenience CSV
+RESULTS_CSV_FIELDS = [
+    'Marque',
+    'Nom Produit',
+    'Catégorie',
+    'Public Cible',
+    'Site Marque',
+    'URL Produit',
+    'Prix',
+    'Disponibilité',
+    'Description',
+    'Nb Images',
+]
+
+
 def execute_step_1_discovery(ctx: PipelineContext, config: Any) -> List[Any]:
     """Step 1: Brand Discovery using Gemini + Google Search.
     
@@ -33,7 +50,6 @@ def execute_step_1_discovery(ctx: PipelineContext, config: Any) -> List[Any]:
         List of Brand objects
     """
     from ..product_discovery import ProductDiscovery
-    from ..models import Product
     
     print(f"[Step 1] Discovering brands for '{ctx.category}' in {ctx.country}...")
     print(f"  Model: {config.gemini.model} + Google Search grounding")
@@ -50,14 +66,12 @@ def execute_step_1_discovery(ctx: PipelineContext, config: Any) -> List[Any]:
         return []
     
     # Save discovered brands
-    output_file = ctx.output_dir / f"{ctx.category_slug}_discovered_{ctx.run_id}.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(
-            [{"name": b.name, "country_of_origin": b.country_of_origin} for b in brands],
-            f,
-            indent=2,
-            ensure_ascii=False
-        )
+    output_file = ctx.discovered_path
+    write_json_array(
+        output_file,
+        ({"name": b.name, "country_of_origin": b.country_of_origin} for b in brands),
+        indent=config.pretty_json
+    )
     
     print(f"[✓] {len(brands)} brands discovered")
     
@@ -78,19 +92,33 @@ def execute_step_2_details(ctx: PipelineContext, config: Any) -> List[Any]:
     Returns:
         List of Product objects
     """
-    from ..product_discovery import ProductDiscovery
-    from ..models import Product, Brand
+    from ..product_discovery import ProductDiscovery, product_details_prompt_version
+    from ..models import Product, Brand, ProductDetails
+    from .cache import DetailsCache
     
     # Load brands from step 1 if not in context
     if 'brands' not in ctx.data:
-        discovered_file = ctx.output_dir / f"{ctx.category_slug}_discovered_{ctx.run_id}.json"
-        with open(discovered_file, 'r', encoding='utf-8') as f:
-            brands_data = json.load(f)
+        discovered_file = ctx.discovered_path
+        brands_data = read_json(discovered_file)
         brands = [Brand(name=b['name'], country_of_origin=b.get('country_of_origin')) for b in brands_data]
         ctx.data['brands'] = brands
     else:
         brands = ctx.data['brands']
     
+    # Discovery can return the same brand twice (e.g. in different casings);
+    # each duplicate would cost a full OpenAI + Web Search call
+    seen = set()
+    unique_brands = []
+    for brand in brands:
+        key = brand.name.strip().casefold()
+        if key in seen:
+            continue
+        seen.add(key)
+        unique_brands.append(brand)
+    if len(unique_brands) < len(brands):
+        print(f"  [i] {len(brands) - len(unique_brands)} duplicate brands skipped")
+        brands = ctx.data['brands'] = unique_brands
+    
     # Get or create discovery instance
     if 'discovery' not in ctx.data:
         discovery = ProductDiscovery(config=config)
@@ -98,32 +126,75 @@ def execute_step_2_details(ctx: PipelineContext, config: Any) -> List[Any]:
     else:
         discovery = ctx.data['discovery']
     
+    max_concurrent = recommend("io", config.parallel.openai.max_concurrent)
+    
     print(f"[Step 2] Getting details for {len(brands)} brands...")
     print(f"  Model: {config.openai.model} + Web Search")
-    print(f"  Mode: PARALLEL ({config.parallel.openai.max_concurrent} concurrent)")
+    print(f"  Mode: PARALLEL ({max_concurrent} concurrent, "
+          f"configured max {config.parallel.openai.max_concurrent})")
     print("-" * 70)
     
-    # Use parallel execution
-    results = discovery.get_product_details_parallel(brands, ctx.category, ctx.country)
+    # Serve brands resolved by a previous run from the cache, and only send
+    # the misses to OpenAI. Only deterministic (temperature 0) answers are
+    # cached; otherwise a re-run is expected to give a different one.
+    cache = None
+    details_by_brand: Dict[str, Any] = {}
+    missing_brands = brands
+    if config.details_cache_ttl > 0 and config.openai.temperature == 0:
+        cache = DetailsCache(ctx.output_dir / "cache" / "details.sqlite", config.details_cache_ttl)
+        
+        def cache_key(brand_name: str, batched: bool) -> str:
+            # Keyed by the prompt that produced the answer
+            return DetailsCache.make_key(
+                brand_name, ctx.category, ctx.country, config.openai.model,
+                product_details_prompt_version(batched)
+            )
+        
+        # With batches, the brands they leave out are answered one by one:
+        # accept either prompt's answer (single-brand ones are never worse)
+        lookup_prompts = [True, False] if config.details_batch_size > 1 else [False]
+        missing_brands = []
+        for brand in brands:
+            cached = None
+            for batched in lookup_prompts:
+                cached = cache.get(cache_key(brand.name, batched))
+                if cached is not None:
+                    break
+            if cached is not None:
+                details_by_brand[brand.name] = ProductDetails(**cached)
+            else:
+                missing_brands.append(brand)
+        print(f"  [i] Details cache: {len(details_by_brand)} hits, {len(missing_brands)} misses")
     
-    products: List[Product] = []
-    for brand, details in results:
-        if details:
-            product = Product.from_product_details(details, ctx.category)
-            products.append(product)
+    try:
+        # Use parallel execution
+        if missing_brands:
+            results = discovery.get_product_details_parallel(
+                missing_brands, ctx.category, ctx.country, max_concurrent=max_concurrent
+            )
+            for brand, details in results:
+                if details:
+                    details_by_brand[brand.name] = details
+                    if cache is not None:
+                        batched = discovery.details_from_batch(brand.name, ctx.category, ctx.country)
+                        cache.put(cache_key(brand.name, batched), details.model_dump())
+    finally:
+        if cache is not None:
+            cache.close()
+    
+    products = Product.from_details_many(
+        [details_by_brand.get(brand.name) for brand in brands], ctx.category
+    )
     
     print("-" * 70)
     print(f"[✓] {len(products)}/{len(brands)} products with details")
     
     # Save products (overwrites discovered file with enriched data)
-    output_file = ctx.output_dir / f"{ctx.category_slug}_discovered_{ctx.run_id}.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(
-            [p.to_dict() for p in products],
-            f,
-            indent=2,
-            ensure_ascii=False
-        )
+    output_file = ctx.discovered_path
+    # orjson serializes the Product dataclasses natively (same keys, same
+    # order as Product.to_dict), so no intermediate dict is built per product
+    write_json_array(output_file, products, indent=config.pretty_json)
+    print(f"[✓] Saved {output_file.stat().st_size / 1_048_576:.1f} MB")
     
     # Store in context
     ctx.data['products'] = products
@@ -146,9 +217,8 @@ def execute_step_3_scraping(ctx: PipelineContext, config: Any) -> List[Any]:
     
     # Load products from step 2 if not in context
     if 'products' not in ctx.data:
-        discovered_file = ctx.output_dir / f"{ctx.category_slug}_discovered_{ctx.run_id}.json"
-        with open(discovered_file, 'r', encoding='utf-8') as f:
-            products_data = json.load(f)
+        discovered_file = ctx.discovered_path
+        products_data = read_json(discovered_file)
         products = [
             Product(
                 brand=p['brand'],
@@ -164,47 +234,45 @@ def execute_step_3_scraping(ctx: PipelineContext, config: Any) -> List[Any]:
     else:
         products = ctx.data['products']
     
+    max_concurrent = recommend("io", config.parallel.firecrawl.max_concurrent)
+    
     print(f"[Step 3] Scraping {len(products)} products with Firecrawl...")
-    print(f"  Mode: PARALLEL ({config.parallel.firecrawl.max_concurrent} concurrent)")
+    print(f"  Mode: PARALLEL ({max_concurrent} concurrent, "
+          f"configured max {config.parallel.firecrawl.max_concurrent})")
     
     scraper = ProductScraper(config=config)
-    scraped_products = scraper.scrape_products_batch(products, parallel=True)
+    scraped_products = scraper.scrape_products_batch(
+        products, parallel=True, max_concurrent=max_concurrent
+    )
     
     # Save scraped data
-    output_file = ctx.output_dir / f"{ctx.category_slug}_scraped_{ctx.run_id}.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(
-            [p.to_dict() for p in scraped_products],
-            f,
-            indent=2,
-            ensure_ascii=False
-        )
+    output_file = ctx.scraped_path
+    write_json_array(output_file, scraped_products, indent=config.pretty_json)
     
-    print(f"[✓] Scraped data saved")
+    print(f"[✓] Scraped data saved ({output_file.stat().st_size / 1_048_576:.1f} MB)")
     
     # Also create CSV for convenience
+    csv_file = ctx.results_csv_path
     try:
-        import pandas as pd
-        csv_file = ctx.output_dir / f"{ctx.category_slug}_results_{ctx.run_id}.csv"
-        df_data = []
-        for p in scraped_products:
-            df_data.append({
-                'Marque': p.brand,
-                'Nom Produit': p.full_name,
-                'Catégorie': p.category,
-                'Public Cible': p.target_audience,
-                'Site Marque': p.brand_website or '',
-                'URL Produit': p.product_url or '',
-                'Prix': p.price or '',
-                'Disponibilité': p.availability or '',
-                'Description': (p.description or '')[:200],
-                'Nb Images': len(p.images) if p.images else 0,
-            })
-        df = pd.DataFrame(df_data)
-        df.to_csv(csv_file, index=False, encoding='utf-8')
+        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=RESULTS_CSV_FIELDS)
+            writer.writeheader()
+            for p in scraped_products:
+                writer.writerow({
+                    'Marque': p.brand,
+                    'Nom Produit': p.full_name,
+                    'Catégorie': p.category,
+                    'Public Cible': p.target_audience,
+                    'Site Marque': p.brand_website or '',
+                    'URL Produit': p.product_url or '',
+                    'Prix': p.price or '',
+                    'Disponibilité': p.availability or '',
+                    'Description': (p.description or '')[:200],
+                    'Nb Images': len(p.images) if p.images else 0,
+                })
         print(f"[✓] CSV saved: {csv_file}")
-    except ImportError:
-        print("[i] pandas not available, skipping CSV export")
+    except OSError as e:
+        print(f"[!] CSV export failed: {e}")
     
     # Store in context
     ctx.data['scraped_products'] = scraped_products
@@ -228,7 +296,7 @@ def execute_step_4_images(ctx: PipelineContext, config: Any) -> Optional[Path]:
     selector = ImageSelector(config=config)
     
     # Find the scraped file
-    scraped_file = ctx.output_dir / f"{ctx.category_slug}_scraped_{ctx.run_id}.json"
+    scraped_file = ctx.scraped_path
     
     if not scraped_file.exists():
         print(f"[!] Scraped file not found: {scraped_file}")
@@ -264,6 +332,10 @@ def execute_step_5_visual_analysis(ctx: PipelineContext, config: Any) -> Optiona
     # Run analysis on all images from this run
     result_file = analyzer.run(run_id=ctx.run_id)
     
+    # Hand the analyses to step 7 so it doesn't reload them from disk
+    if result_file:
+        ctx.data['visual_analyses'] = analyzer.last_results
+    
     return result_file
 
 
@@ -310,12 +382,31 @@ def execute_step_7_competitive(ctx: PipelineContext, config: Any) -> Optional[Pa
     
     analyzer = CompetitiveAnalyzer(config=config)
     
-    # Run competitive analysis
-    result_file = analyzer.run(run_id=ctx.run_id)
+    # Run competitive analysis (reusing step 5's analyses when they were
+    # produced in this process)
+    result_file = analyzer.run(
+        run_id=ctx.run_id,
+        products_analysis=ctx.data.get('visual_analyses')
+    )
     
     return result_file
 
 
+def snapshot_step_7_inputs(ctx: PipelineContext, config: Any) -> None:
+    """Load step 5's analyses before step 7 runs alongside step 6.
+    
+    Step 6 rewrites the visual analysis file that step 7 would otherwise
+    read, so the analyses are captured in the context while the file is
+    still stable.
+    """
+    from ..competitive_analyzer import load_visual_analysis
+    
+    if 'visual_analyses' not in ctx.data:
+        analyses = load_visual_analysis(Path(config.output_dir), ctx.run_id)
+        if analyses:
+            ctx.data['visual_analyses'] = analyses
+
+
 # =============================================================================
 # Step Registry
 # =============================================================================
@@ -380,23 +471,39 @@ STEPS: Dict[int, Step] = {
         output_pattern="analysis/{category}_competitive_analysis_{run_id}.json",
         requires=[5],  # Only requires visual analysis, not heatmaps
         executor=execute_step_7_competitive,
+        snapshot=snapshot_step_7_inputs,
     ),
 }
 
 
+# Steps indexed by number (index 0 unused): step numbers are dense and the
+# registry is static, so lookups and listings are resolved once at import
+STEPS_BY_NUM = (None,) + tuple(STEPS[num] for num in range(1, max(STEPS) + 1))
+
+_STEPS_INFO = [
+    {
+        "number": step.number,
+        "name": step.name,
+        "description": step.description,
+        "requires": tuple(step.requires),
+    }
+    for step in STEPS_BY_NUM[1:]
+]
+
+
 def get_step(step_num: int) -> Optional[Step]:
     """Get a step by number."""
-    return STEPS.get(step_num)
+    return STEPS_BY_NUM[step_num] if 0 < step_num < len(STEPS_BY_NUM) else None
 
 
 def list_steps() -> List[Dict[str, Any]]:
-    """List all available steps with their info."""
-    return [
-        {
-            "number": step.number,
-            "name": step.name,
-            "description": step.description,
-            "requires": step.requires,
-        }
-        for step in sorted(STEPS.values(), key=lambda s: s.number)
-    ]
+    """List all available steps with their info.
+    
+    Each call returns new dicts, so callers may modify them freely.
+    """
+    return [{**info, "requires": list(info["requires"])} for info in _STEPS_INFO]
+
+
+def list_steps_dag() -> Dict[int, List[int]]:
+    """Get the step dependency graph (step number -> required steps)."""
+    return {step.number: list(step.requires) for step in STEPS_BY_NUM[1:]}
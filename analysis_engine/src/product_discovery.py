@@ -7,25 +7,54 @@ Architecture:
 Utilise LangChain pour une structure propre et extensible.
 Parallelization via ParallelExecutor for Step 2.
 """
+import asyncio
+import concurrent.futures
+import hashlib
 import json
-from typing import List, Optional, Tuple
+import threading
+import unicodedata
+from functools import cached_property, lru_cache
+from typing import Dict, List, Optional, Set, Tuple
 from pathlib import Path
 
+import orjson
+from langchain_core.messages import SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.language_models import BaseChatModel
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_openai import ChatOpenAI
 
+from .clients import get_http_client, new_async_http_client
 from .config import get_config, DiscoveryConfig
 from .models import Product, Brand, BrandList, ProductDetails
-from .utils import load_prompt, extract_json, invoke_with_retry
+from .utils import (
+    load_prompt,
+    extract_json,
+    normalize_query,
+    parse_json_response,
+    JsonValueScanner,
+    invoke_with_retry,
+    ainvoke_with_retry,
+    get_queue_logger,
+)
 from .parallel_executor import (
+    BatchResult,
     ParallelExecutor, 
     Provider, 
     ProviderLimits,
     wrap_sync_func,
     create_print_progress
 )
+from .pipeline.concurrency import recommend
+
+
+# =============================================================================
+# Progress Logging
+# =============================================================================
+
+# Progress lines emitted from concurrent Step 2 tasks go through the shared
+# queue logger, so no coroutine ever blocks on the terminal.
+logger = get_queue_logger("product_discovery")
 
 
 # =============================================================================
@@ -60,6 +89,7 @@ def create_openai_with_search(config: DiscoveryConfig) -> BaseChatModel:
         api_key=config.openai.api_key,
         temperature=config.openai.temperature,
         use_responses_api=True,  # Required for web search tool
+        http_client=get_http_client(),
     )
     
     # Bind Web Search tool (Responses API)
@@ -73,24 +103,64 @@ def create_openai_with_search(config: DiscoveryConfig) -> BaseChatModel:
 # Chain Builders
 # =============================================================================
 
-def build_brands_discovery_chain(config: DiscoveryConfig):
+def _static_system_message(template: str) -> SystemMessage:
+    """Render a variable-free system prompt template once.
+    
+    A ("system", template) tuple is re-formatted on every invoke; a ready
+    SystemMessage is passed through as-is. format() only unescapes the
+    literal {{ }} of the JSON examples, exactly as the template would.
+    """
+    return SystemMessage(content=template.format())
+
+
+def build_brands_discovery_chain(
+    config: DiscoveryConfig,
+    sharded: bool = False,
+    for_async: bool = False
+):
     """Build the chain for discovering brands using Gemini + Google Search.
     
-    Returns a chain that outputs a BrandList Pydantic model.
+    Returns a chain that outputs a BrandList Pydantic model. Chains are
+    stateless, so one is built per (model, key, temperature) and shared.
+    
+    Args:
+        config: Discovery configuration
+        sharded: Use the shard prompt, which takes an extra "shard_hint"
+            input restricting the brands to part of the alphabet
+        for_async: Build a new chain for ainvoke calls. Gemini's async
+            transport binds to the event loop that first uses it, so such
+            a chain must live inside one loop and is not cached.
     """
+    if for_async:
+        return _create_brands_discovery_chain(
+            config.gemini.model, config.gemini.api_key, config.gemini.temperature, sharded
+        )
+    return _build_brands_discovery_chain(
+        config.gemini.model, config.gemini.api_key, config.gemini.temperature, sharded
+    )
+
+
+@lru_cache(maxsize=8)
+def _build_brands_discovery_chain(model: str, api_key: str, temperature: float, sharded: bool):
+    return _create_brands_discovery_chain(model, api_key, temperature, sharded)
+
+
+def _create_brands_discovery_chain(model: str, api_key: str, temperature: float, sharded: bool):
     system_prompt = load_prompt("brands_discovery_system.txt")
-    user_prompt = load_prompt("brands_discovery_user.txt")
+    user_prompt = load_prompt(
+        "brands_discovery_shard_user.txt" if sharded else "brands_discovery_user.txt"
+    )
     
     prompt = ChatPromptTemplate.from_messages([
-        ("system", system_prompt),
+        _static_system_message(system_prompt),
         ("human", user_prompt),
     ])
     
     # Create Gemini with Google Search, then add structured output
     llm = ChatGoogleGenerativeAI(
-        model=config.gemini.model,
-        google_api_key=config.gemini.api_key,
-        temperature=config.gemini.temperature,
+        model=model,
+        google_api_key=api_key,
+        temperature=temperature,
     )
     
     # For structured output with search, we use the base LLM with structured output
@@ -102,27 +172,95 @@ def build_brands_discovery_chain(config: DiscoveryConfig):
     return prompt | structured_llm
 
 
-def build_product_details_chain(config: DiscoveryConfig):
+def brand_shard_hints(shards: int) -> List[str]:
+    """Split the alphabet into ``shards`` ranges, as prompt hints.
+    
+    Brands starting with a digit or symbol go to the first shard.
+    """
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    size = -(-len(letters) // shards)
+    ranges = [letters[i:i + size] for i in range(0, len(letters), size)]
+    hints = []
+    for i, letter_range in enumerate(ranges):
+        hint = f"dont le nom commence par une lettre de {letter_range[0]} à {letter_range[-1]}"
+        if i == 0:
+            hint += " (ou par un chiffre ou un symbole)"
+        hints.append(hint)
+    return hints
+
+
+# (system, user) prompt files for one brand per call / several brands per call
+DETAILS_PROMPTS = ("product_details_system.txt", "product_details_user.txt")
+DETAILS_BATCH_PROMPTS = ("product_details_batch_system.txt", "product_details_batch_user.txt")
+
+
+@lru_cache(maxsize=None)
+def product_details_prompt_version(batched: bool = False) -> str:
+    """Fingerprint of the step 2 prompts, for keying cached answers."""
+    digest = hashlib.sha256()
+    for filename in DETAILS_BATCH_PROMPTS if batched else DETAILS_PROMPTS:
+        digest.update(load_prompt(filename).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def build_product_details_chain(
+    config: DiscoveryConfig,
+    http_async_client=None,
+    batched: bool = False
+):
     """Build the chain for getting product details using OpenAI + Web Search.
     
     Returns a chain that outputs raw text (JSON) for manual parsing.
     Note: We don't use .with_structured_output() as it conflicts with web_search tool.
+    Chains are stateless, so one is built per (model, key, temperature) and shared.
+    
+    Args:
+        config: Discovery configuration
+        http_async_client: httpx.AsyncClient for ainvoke calls. Async clients
+            are per event loop, so a chain built with one is not cached.
+        batched: Use the multi-brand prompt (input "brands" is a list of
+            names, output is a JSON array) instead of the single-brand one
     """
-    system_prompt = load_prompt("product_details_system.txt")
-    user_prompt = load_prompt("product_details_user.txt")
+    if http_async_client is not None:
+        return _create_product_details_chain(
+            config.openai.model, config.openai.api_key, config.openai.temperature,
+            batched, http_async_client
+        )
+    return _build_product_details_chain(
+        config.openai.model, config.openai.api_key, config.openai.temperature, batched
+    )
+
+
+@lru_cache(maxsize=8)
+def _build_product_details_chain(model: str, api_key: str, temperature: float, batched: bool):
+    return _create_product_details_chain(model, api_key, temperature, batched)
+
+
+def _create_product_details_chain(
+    model: str,
+    api_key: str,
+    temperature: float,
+    batched: bool = False,
+    http_async_client=None
+):
+    system_file, user_file = DETAILS_BATCH_PROMPTS if batched else DETAILS_PROMPTS
+    system_prompt = load_prompt(system_file)
+    user_prompt = load_prompt(user_file)
     
     prompt = ChatPromptTemplate.from_messages([
-        ("system", system_prompt),
+        _static_system_message(system_prompt),
         ("human", user_prompt),
     ])
     
     # Create OpenAI with Web Search (Responses API)
     # Note: NOT using .with_structured_output() as it conflicts with web_search tool
     llm = ChatOpenAI(
-        model=config.openai.model,
-        api_key=config.openai.api_key,
-        temperature=config.openai.temperature,
+        model=model,
+        api_key=api_key,
+        temperature=temperature,
         use_responses_api=True,  # Required for web search tool
+        http_client=get_http_client(),
+        http_async_client=http_async_client,
     )
     
     # Bind web search tool only - no structured output (conflicts with web_search)
@@ -131,6 +269,44 @@ def build_product_details_chain(config: DiscoveryConfig):
     return prompt | llm_with_search
 
 
+# ProductDetails fields read from a details response, with the value used
+# when the model leaves one out ("brand" defaults to the queried brand)
+_PRODUCT_DETAILS_DEFAULTS = {
+    "brand": None,
+    "full_name": "",
+    "brand_website": None,
+    "product_url": None,
+    "price_segment": "moyen",
+    "distribution": "",
+    "value_proposition": "",
+    "target_audience": "",
+}
+
+
+# Step 2 details requests in flight, by (model, brand, category, country).
+# concurrent.futures.Future (not asyncio.Future) so that callers on other
+# threads / event loops can wait on them too.
+_INFLIGHT_DETAILS: Dict[Tuple[str, str, str, str], concurrent.futures.Future] = {}
+_INFLIGHT_DETAILS_LOCK = threading.Lock()
+
+
+# Text of a Responses API content block, by block type; None skips the block
+_BLOCK_TEXT_HANDLERS = {
+    # Dict format: {"type": "text", "text": "..."}
+    dict: lambda block: block.get("text", "") if block.get("type") == "text" else None,
+    str: lambda block: block,
+}
+
+
+def _block_text(block) -> Optional[str]:
+    """Get the text of one content block, or None if it carries none."""
+    handler = _BLOCK_TEXT_HANDLERS.get(type(block))
+    if handler is None:
+        # Object format with a .text attribute
+        return getattr(block, "text", None)
+    return handler(block)
+
+
 # =============================================================================
 # Main Discovery Class
 # =============================================================================
@@ -150,20 +326,57 @@ class ProductDiscovery:
             config: Configuration optionnelle. Si None, utilise la config globale.
         """
         self.config = config or get_config()
-        
-        # Build chains
-        self.brands_chain = build_brands_discovery_chain(self.config)
-        self.details_chain = build_product_details_chain(self.config)
+        # Details already resolved by this instance, by _details_key
+        self._details_memo: Dict[Tuple[str, str, str], ProductDetails] = {}
+        # Keys of the memo entries answered by the multi-brand prompt
+        self._batched_details: Set[Tuple[str, str, str]] = set()
         
         print(f"[ProductDiscovery] Initialisé")
         print(f"  - Étape 1 (Marques): {self.config.gemini.model} + Google Search")
         print(f"  - Étape 2 (Détails): {self.config.openai.model} + Web Search")
 
+    @cached_property
+    def brands_chain(self):
+        """Chain for step 1, built on first use (step 2 alone never needs it)."""
+        return build_brands_discovery_chain(self.config)
+
+    @cached_property
+    def details_chain(self):
+        """Chain for step 2, built on first use (step 1 alone never needs it)."""
+        return build_product_details_chain(self.config)
+
+    @cached_property
+    def details_batch_chain(self):
+        """Multi-brand chain for step 2, built on first use."""
+        return build_product_details_chain(self.config, batched=True)
+
+    def details_from_batch(self, brand_name: str, category: str, country: str) -> bool:
+        """Whether this instance's details for a brand came from a batch answer.
+        
+        Those were produced by the multi-brand prompt, so caches key them
+        with product_details_prompt_version(batched=True).
+        """
+        return self._details_key(brand_name, category, country) in self._batched_details
+
+    @staticmethod
+    def _details_key(brand_name: str, category: str, country: str) -> Tuple[str, str, str]:
+        """Clé mémoire d'une marque: nom normalisé (NFKC, casse ignorée).
+        
+        Catégorie et pays passent par normalize_query, pour que les variantes
+        d'écriture d'une même requête partagent les réponses.
+        """
+        return (
+            unicodedata.normalize("NFKC", brand_name).casefold().strip(),
+            normalize_query(category),
+            normalize_query(country),
+        )
+
     def discover_brands(
         self,
         category: str,
         count: int = 30,
-        country: str = "France"
+        country: str = "France",
+        shards: Optional[int] = None
     ) -> List[Brand]:
         """Étape 1: Découvre les marques via Gemini + Google Search.
         
@@ -171,10 +384,16 @@ class ProductDiscovery:
             category: Catégorie de produit (ex: "lait d'avoine")
             count: Nombre de marques à découvrir
             country: Pays cible
+            shards: Override config.discovery_shards (> 1 uses
+                discover_brands_sharded)
             
         Returns:
             Liste d'objets Brand
         """
+        shards = shards or self.config.discovery_shards
+        if shards > 1:
+            return self.discover_brands_sharded(category, count, country, shards)
+        
         print(f"\n[Étape 1] Découverte de {count} marques '{category}' via Gemini...")
         print(f"  Modèle: {self.config.gemini.model} + Google Search grounding")
         
@@ -188,12 +407,106 @@ class ProductDiscovery:
             label="Brand discovery"
         )
         
-        print(f"[Étape 1] ✓ {len(result.brands)} marques découvertes:")
-        for i, brand in enumerate(result.brands, 1):
+        self._print_brands(result.brands)
+        return result.brands
+
+    def discover_brands_sharded(
+        self,
+        category: str,
+        count: int = 30,
+        country: str = "France",
+        shards: int = 3
+    ) -> List[Brand]:
+        """Étape 1 parallélisée: K appels Gemini sur des tranches de l'alphabet.
+        
+        Generation time grows with the number of brands asked for, so K
+        concurrent calls for count/K brands each finish sooner than one
+        call for all of them. Results are interleaved by rank (each shard's
+        most popular first) and deduplicated by normalized name.
+        
+        Args:
+            category: Catégorie de produit
+            count: Nombre total de marques à découvrir
+            country: Pays cible
+            shards: Nombre d'appels parallèles
+            
+        Returns:
+            Liste d'objets Brand (au plus count)
+        """
+        hints = brand_shard_hints(shards)
+        per_shard = -(-count // len(hints))
+        
+        print(f"\n[Étape 1] Découverte de {count} marques '{category}' via Gemini "
+              f"({len(hints)} appels parallèles de {per_shard})...")
+        print(f"  Modèle: {self.config.gemini.model} + Google Search grounding")
+        
+        async def discover_all() -> List[List[Brand]]:
+            # Built inside the loop it will be awaited on (see for_async)
+            chain = build_brands_discovery_chain(self.config, sharded=True, for_async=True)
+            return await asyncio.gather(*(
+                self._adiscover_shard(chain, i, h, per_shard, category, country)
+                for i, h in enumerate(hints)
+            ))
+        
+        shard_results = asyncio.run(discover_all())
+        if not any(shard_results):
+            raise RuntimeError("Brand discovery failed for every shard")
+        
+        brands = self._interleave_shards(shard_results, count)
+        
+        self._print_brands(brands)
+        return brands
+
+    def _interleave_shards(self, shard_results: List[List[Brand]], count: int) -> List[Brand]:
+        """Merge shard answers round-robin by rank, deduplicated, up to count.
+        
+        Truncating to count then drops each shard's least popular brands
+        rather than a whole end of the alphabet.
+        """
+        by_name: Dict[str, Brand] = {}
+        for rank in range(max((len(r) for r in shard_results), default=0)):
+            for brands in shard_results:
+                if rank < len(brands):
+                    brand = brands[rank]
+                    by_name.setdefault(self._details_key(brand.name, "", "")[0], brand)
+        return list(by_name.values())[:count]
+
+    async def _adiscover_shard(
+        self,
+        chain,
+        index: int,
+        hint: str,
+        count: int,
+        category: str,
+        country: str
+    ) -> List[Brand]:
+        """Un appel Gemini pour une tranche de l'alphabet ([] en cas d'échec).
+        
+        chain doit avoir été construite pour la boucle courante
+        (build_brands_discovery_chain(..., for_async=True)).
+        """
+        try:
+            result: BrandList = await ainvoke_with_retry(
+                lambda: chain.ainvoke({
+                    "count": count,
+                    "category": category,
+                    "country": country,
+                    "shard_hint": hint,
+                }),
+                max_retries=3,
+                label=f"Brand discovery (shard {index + 1})"
+            )
+            return result.brands
+        except Exception as e:
+            logger.warning("  [!] Shard %d (%s): %s", index + 1, hint, e)
+            return []
+
+    @staticmethod
+    def _print_brands(brands: List[Brand]) -> None:
+        print(f"[Étape 1] ✓ {len(brands)} marques découvertes:")
+        for i, brand in enumerate(brands, 1):
             origin = f" ({brand.country_of_origin})" if brand.country_of_origin else ""
             print(f"  {i:2}. {brand.name}{origin}")
-        
-        return result.brands
 
     def get_product_details(
         self,
@@ -211,6 +524,9 @@ class ProductDiscovery:
         Returns:
             ProductDetails ou None si erreur
         """
+        key = self._details_key(brand.name, category, country)
+        if key in self._details_memo:
+            return self._details_memo[key]
         try:
             # Get raw response (AIMessage) from chain with web search
             result = invoke_with_retry(
@@ -222,64 +538,244 @@ class ProductDiscovery:
                 max_retries=3,
                 label=f"Details ({brand.name})"
             )
+            details = self._parse_product_details(result, brand)
+            self._details_memo[key] = details
+            return details
+        except json.JSONDecodeError as e:
+            logger.warning("  [!] Erreur JSON pour %s: %s", brand.name, e)
+            return None
+        except Exception as e:
+            logger.warning("  [!] Erreur pour %s: %s", brand.name, e)
+            return None
+
+    async def aget_product_details(
+        self,
+        brand: Brand,
+        category: str,
+        country: str = "France",
+        chain=None,
+        raise_errors: bool = False
+    ) -> Optional[ProductDetails]:
+        """Étape 2 (async): Obtient les détails via OpenAI + Web Search.
+        
+        The response is streamed and stops being read as soon as its JSON
+        object is closed.
+        
+        Args:
+            brand: Objet Brand
+            category: Catégorie de produit
+            country: Pays cible
+            chain: Chain bound to this event loop's httpx.AsyncClient
+                (defaults to self.details_chain)
+            raise_errors: Make a single attempt and raise on failure instead
+                of returning None, for callers that own the retry policy
+                (ParallelExecutor)
             
-            # Extract text content from AIMessage
-            # Responses API returns content as a list of content blocks
-            content = result.content if hasattr(result, 'content') else result
-            
-            if isinstance(content, list):
-                # Extract text from content blocks
-                text_parts = []
-                for block in content:
-                    if isinstance(block, dict):
-                        # Handle dict format: {"type": "text", "text": "..."}
-                        if block.get("type") == "text":
-                            text_parts.append(block.get("text", ""))
-                    elif hasattr(block, 'text'):
-                        # Handle object format with .text attribute
-                        text_parts.append(block.text)
-                    elif isinstance(block, str):
-                        text_parts.append(block)
-                raw_text = "\n".join(text_parts)
-            else:
-                raw_text = str(content)
-            
-            # Parse JSON from response
-            json_str = extract_json(raw_text)
-            data = json.loads(json_str)
-            
-            # Convert to ProductDetails model
-            return ProductDetails(
-                brand=data.get("brand", brand.name),
-                full_name=data.get("full_name", ""),
-                brand_website=data.get("brand_website"),
-                product_url=data.get("product_url"),
-                price_segment=data.get("price_segment", "moyen"),
-                distribution=data.get("distribution", ""),
-                value_proposition=data.get("value_proposition", ""),
-                target_audience=data.get("target_audience", ""),
+        Returns:
+            ProductDetails ou None si erreur
+        """
+        key = self._details_key(brand.name, category, country)
+        if key in self._details_memo:
+            return self._details_memo[key]
+        
+        # Coalesce with an identical request already in flight, from this
+        # or any other instance / event loop (e.g. two overlapping runs)
+        inflight_key = (self.config.openai.model,) + key
+        with _INFLIGHT_DETAILS_LOCK:
+            future = _INFLIGHT_DETAILS.get(inflight_key)
+            owner = future is None
+            if owner:
+                future = _INFLIGHT_DETAILS[inflight_key] = concurrent.futures.Future()
+        if not owner:
+            details = await asyncio.wrap_future(future)
+            if details is not None:
+                self._details_memo[key] = details
+            elif raise_errors:
+                raise RuntimeError(f"Details ({brand.name}): concurrent request failed")
+            return details
+        
+        details = None
+        try:
+            details = await self._afetch_product_details(
+                brand, category, country, chain, raise_errors=raise_errors
+            )
+            if details is not None:
+                self._details_memo[key] = details
+            return details
+        finally:
+            with _INFLIGHT_DETAILS_LOCK:
+                del _INFLIGHT_DETAILS[inflight_key]
+            # Waiters get None if this call failed or was cancelled
+            future.set_result(details)
+
+    async def _afetch_product_details(
+        self,
+        brand: Brand,
+        category: str,
+        country: str,
+        chain=None,
+        raise_errors: bool = False
+    ) -> Optional[ProductDetails]:
+        """Appel réseau de aget_product_details (sans cache ni coalescence)."""
+        chain = chain or self.details_chain
+        try:
+            raw_text = await ainvoke_with_retry(
+                lambda: self._astream_json_text(chain, {
+                    "brand": brand.name,
+                    "category": category,
+                    "country": country,
+                }),
+                max_retries=1 if raise_errors else 3,
+                label=f"Details ({brand.name})"
             )
+            return self._parse_product_details_text(raw_text, brand)
         except json.JSONDecodeError as e:
-            print(f"  [!] Erreur JSON pour {brand.name}: {e}")
+            if raise_errors:
+                raise
+            logger.warning("  [!] Erreur JSON pour %s: %s", brand.name, e)
             return None
         except Exception as e:
-            print(f"  [!] Erreur pour {brand.name}: {e}")
+            if raise_errors:
+                raise
+            logger.warning("  [!] Erreur pour %s: %s", brand.name, e)
             return None
 
+    async def aget_product_details_batch(
+        self,
+        brands: List[Brand],
+        category: str,
+        country: str = "France",
+        chain=None
+    ) -> List[Optional[ProductDetails]]:
+        """Étape 2 (async, groupée): Détails de plusieurs marques en un appel.
+        
+        The answer is a JSON array matched back to the brands by name; a
+        brand missing from it (or the whole batch on error) gets None.
+        
+        Args:
+            brands: Marques du lot
+            category: Catégorie de produit
+            country: Pays cible
+            chain: Multi-brand chain bound to this event loop's
+                httpx.AsyncClient (defaults to self.details_batch_chain)
+            
+        Returns:
+            ProductDetails ou None pour chaque marque, dans l'ordre
+        """
+        chain = chain or self.details_batch_chain
+        label = f"Details ({brands[0].name} +{len(brands) - 1})"
+        try:
+            result = await ainvoke_with_retry(
+                lambda: chain.ainvoke({
+                    "brands": "\n".join(f"- {b.name}" for b in brands),
+                    "category": category,
+                    "country": country,
+                }),
+                max_retries=3,
+                label=label
+            )
+            items = parse_json_response(self._response_text(result))
+        except Exception as e:
+            logger.warning("  [!] Erreur pour %s: %s", label, e)
+            return [None] * len(brands)
+        
+        by_name = {
+            str(item.get("brand", "")).strip().casefold(): item
+            for item in items if isinstance(item, dict)
+        }
+        results: List[Optional[ProductDetails]] = []
+        for brand in brands:
+            data = by_name.get(brand.name.strip().casefold())
+            details = self._product_details_from_dict(data, brand) if data else None
+            if details is not None:
+                key = self._details_key(brand.name, category, country)
+                self._details_memo[key] = details
+                self._batched_details.add(key)
+            results.append(details)
+        return results
+
+    @classmethod
+    async def _astream_json_text(cls, chain, inputs: dict) -> str:
+        """Stream a chain's response until its first JSON value is complete.
+        
+        Returns:
+            The JSON value, or all the text received if none was closed
+        """
+        scanner = JsonValueScanner()
+        stream = chain.astream(inputs)
+        try:
+            async for chunk in stream:
+                if scanner.feed(cls._response_text(chunk)):
+                    break
+        finally:
+            await stream.aclose()
+        return scanner.value() or scanner.text()
+
+    @classmethod
+    def _parse_product_details(cls, result, brand: Brand) -> ProductDetails:
+        """Convertit la réponse (AIMessage) de la chaîne en ProductDetails.
+        
+        Raises:
+            json.JSONDecodeError: Si la réponse ne contient pas de JSON valide
+        """
+        # Already-parsed JSON (e.g. a JSON-mode response) skips the text round-trip
+        content = result.content if hasattr(result, 'content') else result
+        if isinstance(content, dict) and "type" not in content:
+            return cls._product_details_from_dict(content, brand)
+        return cls._parse_product_details_text(cls._response_text(result), brand)
+
+    @classmethod
+    def _parse_product_details_text(cls, raw_text: str, brand: Brand) -> ProductDetails:
+        """Convertit le texte de la réponse en ProductDetails.
+        
+        Raises:
+            json.JSONDecodeError: Si le texte ne contient pas de JSON valide
+        """
+        # Parse JSON from response
+        # (orjson.JSONDecodeError subclasses json.JSONDecodeError)
+        data = orjson.loads(extract_json(raw_text))
+        return cls._product_details_from_dict(data, brand)
+
+    @staticmethod
+    def _response_text(result) -> str:
+        """Extrait le texte d'une réponse (AIMessage) de la chaîne."""
+        # Extract text content from AIMessage
+        # Responses API returns content as a list of content blocks
+        content = result.content if hasattr(result, 'content') else result
+        
+        if isinstance(content, list):
+            # Extract text from content blocks (one dict lookup per block)
+            texts = (_block_text(block) for block in content)
+            return "\n".join(text for text in texts if text is not None)
+        return str(content)
+
+    @staticmethod
+    def _product_details_from_dict(data: dict, brand: Brand) -> ProductDetails:
+        """Convertit un objet JSON de réponse en ProductDetails."""
+        fields = dict(_PRODUCT_DETAILS_DEFAULTS, brand=brand.name)
+        fields.update((k, v) for k, v in data.items() if k in fields)
+        return ProductDetails.model_validate(fields)
+
     def get_product_details_parallel(
         self,
         brands: List[Brand],
         category: str,
-        country: str = "France"
+        country: str = "France",
+        max_concurrent: Optional[int] = None,
+        batch_size: Optional[int] = None
     ) -> List[Tuple[Brand, Optional[ProductDetails]]]:
         """Étape 2 PARALLÉLISÉE: Obtient les détails pour toutes les marques.
         
         Uses ParallelExecutor for concurrent API calls with rate limiting.
+        With batch_size > 1, each call covers that many brands; brands the
+        model leaves out of a batch answer are retried one by one.
         
         Args:
             brands: Liste de Brand objects
             category: Catégorie de produit
             country: Pays cible
+            max_concurrent: Override config.parallel.openai.max_concurrent
+            batch_size: Override config.details_batch_size
             
         Returns:
             List of (brand, details) tuples in original order
@@ -287,49 +783,211 @@ class ProductDiscovery:
         if not brands:
             return []
         
+        # Brands already resolved by this instance are served from memory
+        memo = [self._details_memo.get(self._details_key(b.name, category, country)) for b in brands]
+        all_brands, brands = brands, [b for b, details in zip(brands, memo) if details is None]
+        if len(brands) < len(all_brands):
+            print(f"  [i] {len(all_brands) - len(brands)} brands already resolved by this instance")
+        if not brands:
+            return list(zip(all_brands, memo))
+        
         # Create executor with OpenAI limits from config
         limits = ProviderLimits(
-            max_concurrent=self.config.parallel.openai.max_concurrent,
+            max_concurrent=max_concurrent or self.config.parallel.openai.max_concurrent,
             rate_limit_rpm=self.config.parallel.openai.rate_limit_rpm,
-            min_delay_seconds=self.config.parallel.openai.min_delay_seconds
+            min_delay_seconds=self.config.parallel.openai.min_delay_seconds,
+            rate_limiter=self.config.parallel.openai.rate_limiter
         )
         executor = ParallelExecutor(provider=Provider.OPENAI, limits=limits)
         
-        # Create async wrapper for the sync get_product_details method
-        async def process_brand(brand: Brand) -> Optional[ProductDetails]:
-            import asyncio
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(
-                None, 
-                lambda: self.get_product_details(brand, category, country)
-            )
-        
         # Progress callback
         completed_count = [0]
         def on_progress(completed: int, total: int, status: str, item_id: Optional[str]):
             completed_count[0] = completed
             if item_id:
-                print(f"  [{completed:2}/{total}] {item_id}... {status}", flush=True)
+                logger.info("  [%2d/%d] %s... %s", completed, total, item_id, status)
+        
+        batch_size = batch_size or self.config.details_batch_size
+        
+        # Native async calls: no thread per request. The AsyncClient (and
+        # the chains bound to it) lives only as long as this batch's loop.
+        async def run_batch() -> List[Optional[ProductDetails]]:
+            async with new_async_http_client() as http_async_client:
+                chain = build_product_details_chain(self.config, http_async_client)
+                
+                async def process_brand(brand: Brand) -> Optional[ProductDetails]:
+                    return await self.aget_product_details(brand, category, country, chain)
+                
+                if batch_size <= 1:
+                    batch_result = await executor.execute(
+                        items=brands,
+                        process_func=process_brand,
+                        get_item_id=lambda b: b.name,
+                        progress_callback=on_progress
+                    )
+                    report(batch_result)
+                    return batch_result.get_all_results_ordered()
+                
+                batch_chain = build_product_details_chain(
+                    self.config, http_async_client, batched=True
+                )
+                
+                async def process_chunk(chunk: List[Brand]) -> List[Optional[ProductDetails]]:
+                    return await self.aget_product_details_batch(chunk, category, country, batch_chain)
+                
+                chunks = [brands[i:i + batch_size] for i in range(0, len(brands), batch_size)]
+                batch_result = await executor.execute(
+                    items=chunks,
+                    process_func=process_chunk,
+                    get_item_id=lambda c: f"{c[0].name} +{len(c) - 1}",
+                    progress_callback=on_progress
+                )
+                report(batch_result)
+                details_list: List[Optional[ProductDetails]] = []
+                for chunk, chunk_details in zip(chunks, batch_result.get_all_results_ordered()):
+                    details_list.extend(chunk_details or [None] * len(chunk))
+                
+                # Retry brands the batch answers left out, one per call
+                missing = [i for i, details in enumerate(details_list) if details is None]
+                if missing:
+                    print(f"  [Parallel] Retrying {len(missing)} brands individually")
+                    retry_result = await executor.execute(
+                        items=[brands[i] for i in missing],
+                        process_func=process_brand,
+                        get_item_id=lambda b: b.name,
+                        progress_callback=on_progress
+                    )
+                    report(retry_result)
+                    for i, details in zip(missing, retry_result.get_all_results_ordered()):
+                        details_list[i] = details
+                return details_list
+        
+        def report(batch_result) -> None:
+            print(f"  [Parallel] Done: {batch_result.successful_count}/{batch_result.total_items} succeeded "
+                  f"in {batch_result.total_duration_seconds:.1f}s")
         
         # Execute in parallel
-        print(f"  [Parallel] Processing {len(brands)} brands with {limits.max_concurrent} concurrent requests")
-        batch_result = executor.execute_sync(
-            items=brands,
-            process_func=process_brand,
-            get_item_id=lambda b: b.name,
-            progress_callback=on_progress
+        print(f"  [Parallel] Processing {len(brands)} brands with {limits.max_concurrent} concurrent requests"
+              + (f" ({batch_size} brands per request)" if batch_size > 1 else ""))
+        fetched = iter(asyncio.run(run_batch()))
+        
+        # Reconstruct results in original order
+        return [
+            (brand, details if details is not None else next(fetched))
+            for brand, details in zip(all_brands, memo)
+        ]
+
+    def discover_products_pipelined(
+        self,
+        category: str,
+        count: int = 30,
+        country: str = "France",
+        shards: Optional[int] = None
+    ) -> List[Product]:
+        """Étapes 1 et 2 en pipeline: les détails partent dès qu'un shard répond.
+        
+        Step 1 runs as discover_brands_sharded; each shard's brands are
+        queued as soon as that shard returns and picked up by details
+        workers (sized like step 2), so step 2 overlaps the slowest Gemini
+        shards instead of waiting for all of them. The details calls go
+        through ParallelExecutor.execute_stream (rate limit, retries,
+        Retry-After, fail-fast). The brands kept are the first count in rank order,
+        as in discover_brands_sharded; the few extra brands a shard may
+        return are looked up but dropped.
+        
+        Args:
+            category: Catégorie de produit
+            count: Nombre total de marques à découvrir
+            country: Pays cible
+            shards: Override config.discovery_shards
+            
+        Returns:
+            Liste d'objets Product
+        """
+        hints = brand_shard_hints(shards or self.config.discovery_shards)
+        per_shard = -(-count // len(hints))
+        max_concurrent = recommend("io", self.config.parallel.openai.max_concurrent)
+        limits = ProviderLimits(
+            max_concurrent=max_concurrent,
+            rate_limit_rpm=self.config.parallel.openai.rate_limit_rpm,
+            min_delay_seconds=self.config.parallel.openai.min_delay_seconds,
+            rate_limiter=self.config.parallel.openai.rate_limiter
         )
+        # Stop sending brands once most calls fail (e.g. a revoked API key)
+        executor = ParallelExecutor(
+            provider=Provider.OPENAI, limits=limits, fail_fast_threshold=0.5
+        )
+        
+        print(f"\n[Étapes 1+2] {count} marques '{category}' via Gemini "
+              f"({len(hints)} appels parallèles de {per_shard}), "
+              f"détails via OpenAI ({max_concurrent} concurrent)")
+        print("-" * 70)
         
-        print(f"  [Parallel] Done: {batch_result.successful_count}/{batch_result.total_items} succeeded "
-              f"in {batch_result.total_duration_seconds:.1f}s")
+        shard_results: List[List[Brand]] = [[] for _ in hints]
+        # Brands in the order they were sent to the executor (= result order)
+        arrived: List[Brand] = []
         
-        # Reconstruct results in original order
-        results: List[Tuple[Brand, Optional[ProductDetails]]] = []
-        ordered_results = batch_result.get_all_results_ordered()
-        for brand, details in zip(brands, ordered_results):
-            results.append((brand, details))
+        def on_progress(completed: int, total: int, status: str, item_id: Optional[str]):
+            logger.info("  [%2d/%d] %s... %s", completed, total, item_id, status)
         
-        return results
+        async def run() -> BatchResult:
+            queue: "asyncio.Queue[Optional[Brand]]" = asyncio.Queue()
+            queued = set()
+            
+            async def arrivals():
+                while (brand := await queue.get()) is not None:
+                    arrived.append(brand)
+                    yield brand
+            
+            async with new_async_http_client() as http_async_client:
+                chain = build_product_details_chain(self.config, http_async_client)
+                shard_chain = build_brands_discovery_chain(self.config, sharded=True, for_async=True)
+                
+                async def process_brand(brand: Brand) -> ProductDetails:
+                    # Failures raise, so the executor retries and counts them
+                    return await self.aget_product_details(
+                        brand, category, country, chain, raise_errors=True
+                    )
+                
+                async def produce(index: int, hint: str) -> None:
+                    shard_results[index] = await self._adiscover_shard(
+                        shard_chain, index, hint, per_shard, category, country
+                    )
+                    for brand in shard_results[index]:
+                        key = self._details_key(brand.name, "", "")[0]
+                        if key not in queued:
+                            queued.add(key)
+                            queue.put_nowait(brand)
+                
+                details = asyncio.create_task(executor.execute_stream(
+                    arrivals(), process_brand,
+                    get_item_id=lambda b: b.name,
+                    progress_callback=on_progress
+                ))
+                try:
+                    await asyncio.gather(*(produce(i, h) for i, h in enumerate(hints)))
+                finally:
+                    # End of brands
+                    queue.put_nowait(None)
+                return await details
+        
+        batch_result = asyncio.run(run())
+        details_by_key = {
+            self._details_key(brand.name, "", "")[0]: details
+            for brand, details in zip(arrived, batch_result.get_all_results_ordered())
+        }
+        brands = self._interleave_shards(shard_results, count)
+        if not brands:
+            print("[!] Aucune marque découverte")
+            return []
+        
+        products = Product.from_details_many(
+            [details_by_key.get(self._details_key(b.name, "", "")[0]) for b in brands],
+            category
+        )
+        print("-" * 70)
+        print(f"[Résultat] {len(products)}/{len(brands)} produits récupérés")
+        return products
 
     def discover_products(
         self,
@@ -355,6 +1013,10 @@ class ProductDiscovery:
         print(f"DÉCOUVERTE DE PRODUITS: {category}")
         print("=" * 70)
         
+        # Sharded step 1 with one-brand step 2 calls: overlap the two
+        if parallel and self.config.discovery_shards > 1 and self.config.details_batch_size <= 1:
+            return self.discover_products_pipelined(category, count, country)
+        
         # Étape 1: Découvrir les marques (Gemini + Google Search)
         brands = self.discover_brands(category, count, country)
         
@@ -372,12 +1034,9 @@ class ProductDiscovery:
             print("-" * 70)
             
             results = self.get_product_details_parallel(brands, category, country)
-            
-            products: List[Product] = []
-            for brand, details in results:
-                if details:
-                    product = Product.from_product_details(details, category)
-                    products.append(product)
+            products = Product.from_details_many(
+                [details for _, details in results], category
+            )
         else:
             # SEQUENTIAL execution (fallback)
             print("  Mode: SEQUENTIAL")
@@ -7,13 +7,21 @@ Step 2: Extract source elements using brand identity (Gemini)
 Step 3: Create element-by-element mapping (Opus 4.5)
 Step 4: Generate final rebranded image (Gemini Image)
 
+Steps 1 and 2 are independent and run concurrently.
+Step 4 starts as soon as the mapping exists, while step 3's result is built.
 Each step produces verbose output that can be displayed in the frontend.
 """
-import json
+import asyncio
+import hashlib
+import os
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Callable, Dict, Any, List
+from typing import Optional, Callable, Dict, Any, List, Tuple, Type
+
+import orjson
+from blake3 import blake3
 
 from .config import get_config, DiscoveryConfig
 from .models import (
@@ -24,8 +32,12 @@ from .models import (
     RebrandMapping,
 )
 from .element_extractor import (
+    CROP_LAYOUT,
+    SOURCE_EXTRACTION_PROMPT,
+    UNIFIED_EXTRACTION_PROMPT,
     extract_inspiration_elements,
     extract_source_elements,
+    recrop_elements,
 )
 from .element_mapper import (
     create_element_mapping,
@@ -34,6 +46,13 @@ from .element_mapper import (
 from .image_compositor import (
     generate_with_fallback,
 )
+from .pipeline.cache import DetailsCache
+from .utils import get_queue_logger, write_json
+
+# Progress goes through the shared queue logger: the pipeline thread only
+# enqueues records, even when several Celery workers log at once
+logger = get_queue_logger("rebrand.pipeline")
+BANNER_RULE = "=" * 60
 
 
 # =============================================================================
@@ -65,18 +84,433 @@ def build_step_result(
     )
 
 
+def _utc_now_iso() -> str:
+    """Current UTC time as an ISO string (created_at / completed_at)."""
+    return datetime.utcnow().isoformat()
+
+
+def job_url_prefix(job_id: str) -> str:
+    """Relative URL of a job's output directory, with trailing slash."""
+    return f"/images/rebrand/{job_id}/"
+
+
 def paths_to_relative_urls(
     paths: Dict[str, Path],
-    job_id: str,
-    prefix: str
+    url_prefix: str
 ) -> List[str]:
-    """Convert file paths to relative URLs for frontend."""
-    urls = []
-    for element_id, path in paths.items():
-        # Build relative URL
-        relative_url = f"/images/rebrand/{job_id}/{prefix}/{path.name}"
-        urls.append(relative_url)
-    return urls
+    """Convert file paths to relative URLs for frontend.
+    
+    url_prefix is the URL of the directory holding the files, with trailing
+    slash (e.g. job_url_prefix(job_id) + "inspiration_crops/").
+    """
+    return [url_prefix + path.name for path in paths.values()]
+
+
+# =============================================================================
+# Step Checkpoints
+# =============================================================================
+
+# Completed steps of a job, one JSON line each, appended as they finish.
+# The Celery task is redelivered with the same job_id if its worker dies
+# (acks_late), and the next run resumes from the steps recorded here.
+STEPS_LOG = "steps.jsonl"
+
+
+def _load_checkpoints(steps_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Log records ({"result", "state"}) of the steps a previous run of this
+    job completed, by step name."""
+    checkpoints: Dict[str, Dict[str, Any]] = {}
+    try:
+        with open(steps_path, 'rb') as f:
+            for line in f:
+                try:
+                    record = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    # Last line cut short by the crash
+                    break
+                if record.get("state") is not None:
+                    checkpoints[record["result"]["step_name"]] = record
+    except FileNotFoundError:
+        pass
+    return checkpoints
+
+
+def _extraction_state(extraction: Any, crops: Dict[str, Path]) -> Dict[str, Any]:
+    return {
+        "extraction": extraction.model_dump(),
+        "crops": {element_id: str(path) for element_id, path in crops.items()},
+    }
+
+
+def _restore_extraction(
+    record: Optional[Dict[str, Any]],
+    model: Type[Any]
+) -> Optional[Tuple[Any, Dict[str, Path]]]:
+    """(extraction, crops) from a checkpoint, or None if it can't be reused.
+    
+    A checkpoint whose crops are gone, or written with an older schema,
+    counts as no checkpoint.
+    """
+    if record is None:
+        return None
+    state = record["state"]
+    try:
+        crops = {element_id: Path(path) for element_id, path in state["crops"].items()}
+        if not all(path.exists() for path in crops.values()):
+            return None
+        # pydantic's ValidationError is a ValueError
+        return model.model_validate(state["extraction"]), crops
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _restore_mapping(
+    record: Optional[Dict[str, Any]]
+) -> Optional[Tuple[RebrandMapping, Dict[str, Any]]]:
+    """(mapping, debug info) from a Step 3 checkpoint, or None if unusable."""
+    if record is None:
+        return None
+    state = record["state"]
+    try:
+        return RebrandMapping.model_validate(state["mapping"]), state["debug"]
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _rewrite_log(steps_path: Path, records: List[Dict[str, Any]]) -> None:
+    """Replace the steps log with just these records, atomically.
+    
+    The previous log stays in place until the new one is complete, so a
+    crash at any point leaves one of the two whole.
+    """
+    tmp_path = steps_path.with_name(steps_path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(b"".join(orjson.dumps(record) + b"\n" for record in records))
+    os.replace(tmp_path, steps_path)
+
+
+async def _resumed(outcome: Any) -> Tuple[Any, int]:
+    """Stand-in for _timed_call when a step's outcome comes from a checkpoint."""
+    return outcome, 0
+
+
+# =============================================================================
+# Extraction Cache
+# =============================================================================
+
+# Steps 1/2 answers by image content, shared by all jobs under output_dir
+EXTRACTION_CACHE = Path("cache") / "rebrand_extractions.sqlite"
+
+
+def _file_digest(path: Path) -> str:
+    """BLAKE3 of a file's content, hashed straight from a memory map.
+    
+    Several times faster than sha256 on multi-MB images (SIMD, and
+    multithreaded on large inputs), with no copy of the file into memory.
+    """
+    hasher = blake3(max_threads=blake3.AUTO)
+    hasher.update_mmap(path)
+    return hasher.hexdigest()
+
+
+def _extract_with_cache(
+    extract: Callable[..., Tuple[Optional[Any], Dict[str, Path]]],
+    model: Type[Any],
+    kind: str,
+    prompt: str,
+    cache_path: Path,
+    image_path: Path,
+    output_dir: Path,
+    config: DiscoveryConfig,
+    **inputs: str
+) -> Tuple[Optional[Any], Dict[str, Path]]:
+    """Run an extraction step, reusing the answer for an identical request.
+    
+    The key covers the image content, the vision model, the prompt and the
+    other inputs (the brand identity for Step 2). On a hit only the crops
+    are cut again from the image, with the cached bounding boxes.
+    """
+    if config.rebrand_cache_ttl <= 0 or not image_path.exists():
+        return extract(image_path=image_path, output_dir=output_dir, config=config, **inputs)
+    
+    raw = "|".join([
+        _file_digest(image_path), config.gemini_vision.model, prompt, *inputs.values()
+    ])
+    key = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    
+    # One connection per call: steps 1 and 2 run in different threads
+    with DetailsCache(cache_path, config.rebrand_cache_ttl) as cache:
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info("[i] %s extraction reused from cache", kind.capitalize())
+            extraction = model.model_validate(cached)
+            return extraction, recrop_elements(image_path, extraction.elements, output_dir, kind)
+        
+        extraction, crops = extract(image_path=image_path, output_dir=output_dir, config=config, **inputs)
+        if extraction:
+            cache.put(key, extraction.model_dump())
+        return extraction, crops
+
+
+# =============================================================================
+# Step Driver
+# =============================================================================
+
+# Step 4 generation, started once step 3 has passed so that it overlaps
+# the recording of step 3's result (threads start lazily)
+_BACKGROUND_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rebrand")
+
+# A step's result, and its entry for RebrandResult.errors (None if it passed)
+StepOutcome = Tuple[RebrandStepResult, Optional[str]]
+
+
+def _call_timed(fn: Callable[..., Any], **kwargs) -> Tuple[Any, int]:
+    """Call a step function.
+    
+    Returns (result or raised exception, duration_ms), so that the step's
+    result is built the same way whether it returned or raised.
+    """
+    start_ns = time.perf_counter_ns()
+    try:
+        outcome = fn(**kwargs)
+    except Exception as e:
+        outcome = e
+    return outcome, (time.perf_counter_ns() - start_ns) // 1_000_000
+
+
+async def _timed_call(fn: Callable[..., Any], **kwargs) -> Tuple[Any, int]:
+    """_call_timed in a thread, for steps that run concurrently."""
+    return await asyncio.to_thread(_call_timed, fn, **kwargs)
+
+
+def _run_step(
+    step_name: str,
+    step_number: int,
+    outcome: Any,
+    duration_ms: int,
+    on_success: Callable[[Any, int], StepOutcome],
+    exception_input_summary: str
+) -> StepOutcome:
+    """Build a step's result from what its function returned or raised.
+    
+    on_success(outcome, duration_ms) handles a returned value (and may
+    still report an error, e.g. when nothing was extracted). An exception,
+    from the step or from on_success, gives the standard exception result.
+    """
+    try:
+        if isinstance(outcome, Exception):
+            raise outcome
+        return on_success(outcome, duration_ms)
+    except Exception as e:
+        error_msg = f"Step {step_number} exception: {str(e)}"
+        return build_step_result(
+            step_name=step_name,
+            step_number=step_number,
+            status="error",
+            input_summary=exception_input_summary,
+            output_summary="Exception occurred",
+            details={"exception": str(e)},
+            duration_ms=duration_ms,
+            error_message=error_msg
+        ), error_msg
+
+
+def _inspiration_step(
+    outcome: Tuple[Optional[InspirationExtraction], Dict[str, Path]],
+    duration_ms: int,
+    crops_url: str,
+    inspiration_name: str,
+    verbose: bool = True
+) -> StepOutcome:
+    """Step 1 result from extract_inspiration_elements' return value."""
+    extraction, crops = outcome
+    if not extraction:
+        return build_step_result(
+            step_name="inspiration_extraction",
+            step_number=1,
+            status="error",
+            input_summary=f"Inspiration image: {inspiration_name}",
+            output_summary="Extraction failed",
+            details={},
+            error_message="Failed to extract elements from inspiration image"
+        ), "Step 1 failed: No elements extracted from inspiration"
+    
+    return build_step_result(
+        step_name="inspiration_extraction",
+        step_number=1,
+        status="complete",
+        input_summary=f"Inspiration image: {inspiration_name}",
+        output_summary=f"Extracted {extraction.total_elements} elements, cropped {len(crops)}",
+        details={
+            "total_elements": extraction.total_elements,
+            **({"elements": [e.model_dump() for e in extraction.elements]} if verbose else {}),
+            "composition": extraction.composition.model_dump(),
+            "color_palette": [c.model_dump() for c in extraction.color_palette],
+            "packaging_format_description": extraction.packaging_format_description,
+        },
+        cropped_images=paths_to_relative_urls(crops, crops_url),
+        duration_ms=duration_ms
+    ), None
+
+
+def _source_step(
+    outcome: Tuple[Optional[SourceExtraction], Dict[str, Path]],
+    duration_ms: int,
+    crops_url: str,
+    source_name: str,
+    verbose: bool = True
+) -> StepOutcome:
+    """Step 2 result from extract_source_elements' return value."""
+    extraction, crops = outcome
+    if not extraction:
+        return build_step_result(
+            step_name="source_extraction",
+            step_number=2,
+            status="error",
+            input_summary=f"Source image: {source_name}",
+            output_summary="Extraction failed",
+            details={},
+            error_message="Failed to extract elements from source image"
+        ), "Step 2 failed: No elements extracted from source"
+    
+    return build_step_result(
+        step_name="source_extraction",
+        step_number=2,
+        status="complete",
+        input_summary=f"Source image: {source_name}, Brand identity provided",
+        output_summary=f"Extracted {extraction.total_elements} elements, brand: {extraction.brand_name}",
+        details={
+            "total_elements": extraction.total_elements,
+            "brand_name": extraction.brand_name,
+            "product_name": extraction.product_name,
+            "available_claims": extraction.available_claims,
+            **({"elements": [e.model_dump() for e in extraction.elements]} if verbose else {}),
+            "color_palette": [c.model_dump() for c in extraction.color_palette],
+            "packaging_format_description": extraction.packaging_format_description,
+        },
+        cropped_images=paths_to_relative_urls(crops, crops_url),
+        duration_ms=duration_ms
+    ), None
+
+
+def _mapping_step(
+    outcome: Tuple[Optional[RebrandMapping], Dict[str, Any]],
+    duration_ms: int,
+    inspiration: InspirationExtraction,
+    source: SourceExtraction,
+    verbose: bool = True
+) -> StepOutcome:
+    """Step 3 result from create_element_mapping's return value."""
+    mapping, mapping_debug = outcome
+    # Debug info - prompts and responses (included even on error)
+    llm_debug = {
+        "model": mapping_debug.get("model", ""),
+        "system_prompt": mapping_debug.get("system_prompt", ""),
+        "user_prompt": mapping_debug.get("user_prompt", ""),
+        "raw_response": mapping_debug.get("raw_response", ""),
+        "attempt": mapping_debug.get("attempt", 1),
+    }
+    inspiration_total = inspiration.total_elements
+    source_total = source.total_elements
+    
+    if not mapping:
+        return build_step_result(
+            step_name="element_mapping",
+            step_number=3,
+            status="error",
+            input_summary=f"{inspiration_total} inspiration, {source_total} source",
+            output_summary="Mapping failed",
+            details={"llm_debug": llm_debug},
+            error_message="Failed to create element mapping"
+        ), "Step 3 failed: Mapping creation failed"
+    
+    # Validate mapping
+    is_valid, warnings = validate_mapping(mapping, inspiration)
+    
+    return build_step_result(
+        step_name="element_mapping",
+        step_number=3,
+        status="complete",
+        input_summary=f"{inspiration_total} inspiration elements, {source_total} source elements",
+        output_summary=f"Created {len(mapping.mappings)} mappings, format: {mapping.packaging_format_choice}",
+        details={
+            "total_mappings": len(mapping.mappings),
+            **({"mappings": [m.model_dump() for m in mapping.mappings]} if verbose else {}),
+            "packaging_format_choice": mapping.packaging_format_choice,
+            "packaging_format_description": mapping.packaging_format_description,
+            "composition_description": mapping.composition_description,
+            "color_scheme": mapping.color_scheme.model_dump(),
+            "assembly_notes": mapping.assembly_notes,
+            "validation": {
+                "is_valid": is_valid,
+                "warnings": warnings
+            },
+            "llm_debug": llm_debug,
+        },
+        duration_ms=duration_ms
+    ), None
+
+
+def _generation_step(
+    outcome: Tuple[Optional[Path], Dict[str, Any]],
+    duration_ms: int,
+    job_url: str,
+    mapping: RebrandMapping,
+    inspiration_crops: Dict[str, Path],
+    source_crops: Dict[str, Path]
+) -> StepOutcome:
+    """Step 4 result from generate_with_fallback's return value."""
+    final_image_path, gen_debug = outcome
+    
+    # Convert input image paths to URLs for frontend (crops only, matched
+    # on their directory name)
+    prefix_by_parent = {
+        crops_subdir: f"{job_url}{crops_subdir}/" for crops_subdir, _ in CROP_LAYOUT.values()
+    }
+    input_image_urls = [
+        prefix_by_parent[path_obj.parent.name] + path_obj.name
+        for path_obj in map(Path, gen_debug.get("input_images", []))
+        if path_obj.parent.name in prefix_by_parent
+    ]
+    
+    # Debug info - prompts and input images (included even on error)
+    llm_debug = {
+        "model": gen_debug.get("model", ""),
+        "system_prompt": gen_debug.get("system_prompt", ""),
+        "user_prompt": gen_debug.get("user_prompt", ""),
+        "full_prompt": gen_debug.get("full_prompt", ""),
+        "composition_text": gen_debug.get("composition_text", ""),
+        "input_image_urls": input_image_urls,
+        "input_image_count": gen_debug.get("input_image_count", 0),
+        "target_dimensions": gen_debug.get("target_dimensions", {}),
+    }
+    
+    if not final_image_path:
+        llm_debug["error"] = gen_debug.get("error", "Unknown error")
+        return build_step_result(
+            step_name="image_generation",
+            step_number=4,
+            status="error",
+            input_summary=f"Mapping with {len(mapping.mappings)} entries",
+            output_summary="Generation failed",
+            details={"llm_debug": llm_debug},
+            error_message="Failed to generate rebranded image"
+        ), "Step 4 failed: Image generation failed"
+    
+    llm_debug["attempt"] = gen_debug.get("attempt", 1)
+    return build_step_result(
+        step_name="image_generation",
+        step_number=4,
+        status="complete",
+        input_summary=f"{len(mapping.mappings)} mappings, {len(inspiration_crops)} + {len(source_crops)} crops",
+        output_summary=f"Generated: {final_image_path.name}",
+        details={
+            "generated_image": job_url + final_image_path.name,
+            "input_crops_count": len(inspiration_crops) + len(source_crops),
+            "llm_debug": llm_debug,
+        },
+        duration_ms=duration_ms
+    ), None
 
 
 # =============================================================================
@@ -112,21 +546,99 @@ def run_rebrand_pipeline(
     # Setup paths
     source_path = Path(source_image_path)
     inspiration_path = Path(inspiration_image_path)
-    job_output_dir = Path(output_dir) / "rebrand" / job_id
+    # Paths as reported in RebrandResult, resolved once for every return
+    source_path_str = str(source_path)
+    inspiration_path_str = str(inspiration_path)
+    base_output_dir = Path(output_dir)
+    job_output_dir = base_output_dir / "rebrand" / job_id
     job_output_dir.mkdir(parents=True, exist_ok=True)
+    steps_path = job_output_dir / STEPS_LOG
+    final_output_path = job_output_dir / "final_rebrand.png"
+    result_json_path = job_output_dir / "result.json"
+    cache_path = base_output_dir / EXTRACTION_CACHE
+    # File names used by the banner and every step summary
+    source_name = source_path.name
+    inspiration_name = inspiration_path.name
+    # Frontend URLs of the job's outputs
+    job_url = job_url_prefix(job_id)
+    # Full element / mapping lists in step details (counts are always kept)
+    verbose = config.verbose_step_details
     
     # Initialize result tracking
     steps_output: List[RebrandStepResult] = []
+    # model_dump() of each step, made once and shared by the progress
+    # callback and result.json
+    steps_dump: List[Dict[str, Any]] = []
     errors: List[str] = []
-    created_at = datetime.utcnow().isoformat()
+    created_at = _utc_now_iso()
     
-    print(f"\n{'='*60}")
-    print(f"REBRAND PIPELINE - Job {job_id}")
-    print(f"{'='*60}")
-    print(f"Source: {source_path.name}")
-    print(f"Inspiration: {inspiration_path.name}")
-    print(f"Brand Identity: {brand_identity[:100]}...")
-    print(f"{'='*60}\n")
+    # Steps completed by an interrupted run of this job that can be reused.
+    # The mapping is only reusable if it was made from these same extractions
+    checkpoints = _load_checkpoints(steps_path)
+    inspiration_resume = _restore_extraction(
+        checkpoints.get("inspiration_extraction"), InspirationExtraction
+    )
+    source_resume = _restore_extraction(checkpoints.get("source_extraction"), SourceExtraction)
+    mapping_resume = (
+        _restore_mapping(checkpoints.get("element_mapping"))
+        if inspiration_resume and source_resume else None
+    )
+    # Fresh log that already holds those steps, so they survive this run
+    # dying too (e.g. another redelivery during steps 1-2)
+    resumed_steps = [
+        name for name, resume in (
+            ("inspiration_extraction", inspiration_resume),
+            ("source_extraction", source_resume),
+            ("element_mapping", mapping_resume),
+        ) if resume
+    ]
+    _rewrite_log(steps_path, [checkpoints[name] for name in resumed_steps])
+    
+    def start(step_name: str) -> None:
+        if progress_callback:
+            progress_callback(step_name, {"status": "in_progress"})
+    
+    def abort(reason: str) -> RebrandResult:
+        """Error result when a failed step leaves nothing for the next one."""
+        logger.warning("\n[!] %s", reason)
+        return RebrandResult(
+            status="error",
+            job_id=job_id,
+            steps=steps_output,
+            generated_image_path=None,
+            source_image_path=source_path_str,
+            inspiration_image_path=inspiration_path_str,
+            brand_identity=brand_identity,
+            created_at=created_at,
+            completed_at=_utc_now_iso(),
+            errors=errors
+        )
+    
+    def record(step: StepOutcome, state: Optional[Dict[str, Any]] = None) -> None:
+        """Record a finished step (state: what a resumed run needs)."""
+        step_result, error = step
+        steps_output.append(step_result)
+        if error:
+            errors.append(error)
+        step_dump = step_result.model_dump()
+        steps_dump.append(step_dump)
+        # Logged as soon as the step ends, so a crash in a later step keeps
+        # it (resumed steps are already in the log)
+        if not (step_result.step_name in resumed_steps and step_result.status == "complete"):
+            with open(steps_path, 'ab') as f:
+                f.write(orjson.dumps({
+                    "result": step_dump,
+                    "state": state if step_result.status == "complete" else None,
+                }) + b"\n")
+        if progress_callback:
+            progress_callback(step_result.step_name, {"status": "complete", "result": step_dump})
+    
+    logger.info(
+        "\n%s\nREBRAND PIPELINE - Job %s\n%s\nSource: %s\nInspiration: %s\n"
+        "Brand Identity: %s...\n%s\n",
+        BANNER_RULE, job_id, BANNER_RULE, source_name, inspiration_name,
+        brand_identity[:100], BANNER_RULE
+    )
     
     # Track cropped image paths
     inspiration_crops: Dict[str, Path] = {}
@@ -135,398 +647,159 @@ def run_rebrand_pipeline(
     source_extraction: Optional[SourceExtraction] = None
     mapping: Optional[RebrandMapping] = None
     final_image_path: Optional[Path] = None
+    generation: Optional["Future[Tuple[Any, int]]"] = None
     
     # =========================================================================
-    # STEP 1: Inspiration Element Extraction
+    # STEPS 1 & 2: run concurrently (different images, separate crop dirs);
+    # results are reported in step order once both have finished
     # =========================================================================
-    step_name = "inspiration_extraction"
-    step_number = 1
-    print(f"\n[STEP {step_number}] {step_name.upper()}")
-    
-    if progress_callback:
-        progress_callback(step_name, {"status": "in_progress"})
-    
-    start_time = time.time()
-    
-    try:
-        inspiration_extraction, inspiration_crops = extract_inspiration_elements(
-            image_path=inspiration_path,
-            output_dir=job_output_dir,
-            config=config
-        )
-        
-        duration_ms = int((time.time() - start_time) * 1000)
-        
-        if inspiration_extraction:
-            crop_urls = paths_to_relative_urls(inspiration_crops, job_id, "inspiration_crops")
-            
-            step_result = build_step_result(
-                step_name=step_name,
-                step_number=step_number,
-                status="complete",
-                input_summary=f"Inspiration image: {inspiration_path.name}",
-                output_summary=f"Extracted {inspiration_extraction.total_elements} elements, cropped {len(inspiration_crops)}",
-                details={
-                    "total_elements": inspiration_extraction.total_elements,
-                    "elements": [e.model_dump() for e in inspiration_extraction.elements],
-                    "composition": inspiration_extraction.composition.model_dump(),
-                    "color_palette": [c.model_dump() for c in inspiration_extraction.color_palette],
-                    "packaging_format_description": inspiration_extraction.packaging_format_description,
-                },
-                cropped_images=crop_urls,
-                duration_ms=duration_ms
-            )
-            steps_output.append(step_result)
-        else:
-            errors.append("Step 1 failed: No elements extracted from inspiration")
-            step_result = build_step_result(
-                step_name=step_name,
-                step_number=step_number,
-                status="error",
-                input_summary=f"Inspiration image: {inspiration_path.name}",
-                output_summary="Extraction failed",
-                details={},
-                error_message="Failed to extract elements from inspiration image"
-            )
-            steps_output.append(step_result)
-            
-    except Exception as e:
-        duration_ms = int((time.time() - start_time) * 1000)
-        error_msg = f"Step 1 exception: {str(e)}"
-        errors.append(error_msg)
-        step_result = build_step_result(
-            step_name=step_name,
-            step_number=step_number,
-            status="error",
-            input_summary=f"Inspiration image: {inspiration_path.name}",
-            output_summary="Exception occurred",
-            details={"exception": str(e)},
-            duration_ms=duration_ms,
-            error_message=error_msg
+    logger.info("\n[STEP 1] INSPIRATION_EXTRACTION\n[STEP 2] SOURCE_EXTRACTION (concurrent with step 1)")
+    start("inspiration_extraction")
+    start("source_extraction")
+    
+    if inspiration_resume:
+        logger.info("[i] Step 1 restored from a previous run of this job")
+    if source_resume:
+        logger.info("[i] Step 2 restored from a previous run of this job")
+    
+    async def run_extractions():
+        return await asyncio.gather(
+            _resumed(inspiration_resume) if inspiration_resume else _timed_call(
+                _extract_with_cache,
+                extract=extract_inspiration_elements,
+                model=InspirationExtraction,
+                kind="inspiration",
+                prompt=UNIFIED_EXTRACTION_PROMPT,
+                cache_path=cache_path,
+                image_path=inspiration_path,
+                output_dir=job_output_dir,
+                config=config
+            ),
+            _resumed(source_resume) if source_resume else _timed_call(
+                _extract_with_cache,
+                extract=extract_source_elements,
+                model=SourceExtraction,
+                kind="source",
+                prompt=SOURCE_EXTRACTION_PROMPT,
+                cache_path=cache_path,
+                image_path=source_path,
+                output_dir=job_output_dir,
+                config=config,
+                brand_identity=brand_identity
+            ),
         )
-        steps_output.append(step_result)
-    
-    if progress_callback:
-        progress_callback(step_name, {"status": "complete", "result": step_result.model_dump()})
-    
-    # =========================================================================
-    # STEP 2: Source Element Extraction
-    # =========================================================================
-    step_name = "source_extraction"
-    step_number = 2
-    print(f"\n[STEP {step_number}] {step_name.upper()}")
     
-    if progress_callback:
-        progress_callback(step_name, {"status": "in_progress"})
+    (inspiration_outcome, inspiration_ms), (source_outcome, source_ms) = asyncio.run(run_extractions())
     
-    start_time = time.time()
-    
-    try:
-        source_extraction, source_crops = extract_source_elements(
-            image_path=source_path,
-            brand_identity=brand_identity,
-            output_dir=job_output_dir,
-            config=config
-        )
-        
-        duration_ms = int((time.time() - start_time) * 1000)
-        
-        if source_extraction:
-            crop_urls = paths_to_relative_urls(source_crops, job_id, "source_crops")
-            
-            step_result = build_step_result(
-                step_name=step_name,
-                step_number=step_number,
-                status="complete",
-                input_summary=f"Source image: {source_path.name}, Brand identity provided",
-                output_summary=f"Extracted {source_extraction.total_elements} elements, brand: {source_extraction.brand_name}",
-                details={
-                    "total_elements": source_extraction.total_elements,
-                    "brand_name": source_extraction.brand_name,
-                    "product_name": source_extraction.product_name,
-                    "available_claims": source_extraction.available_claims,
-                    "elements": [e.model_dump() for e in source_extraction.elements],
-                    "color_palette": [c.model_dump() for c in source_extraction.color_palette],
-                    "packaging_format_description": source_extraction.packaging_format_description,
-                },
-                cropped_images=crop_urls,
-                duration_ms=duration_ms
-            )
-            steps_output.append(step_result)
-        else:
-            errors.append("Step 2 failed: No elements extracted from source")
-            step_result = build_step_result(
-                step_name=step_name,
-                step_number=step_number,
-                status="error",
-                input_summary=f"Source image: {source_path.name}",
-                output_summary="Extraction failed",
-                details={},
-                error_message="Failed to extract elements from source image"
-            )
-            steps_output.append(step_result)
-            
-    except Exception as e:
-        duration_ms = int((time.time() - start_time) * 1000)
-        error_msg = f"Step 2 exception: {str(e)}"
-        errors.append(error_msg)
-        step_result = build_step_result(
-            step_name=step_name,
-            step_number=step_number,
-            status="error",
-            input_summary=f"Source image: {source_path.name}",
-            output_summary="Exception occurred",
-            details={"exception": str(e)},
-            duration_ms=duration_ms,
-            error_message=error_msg
-        )
-        steps_output.append(step_result)
+    # STEP 1: Inspiration Element Extraction
+    inspiration_step = _run_step(
+        "inspiration_extraction", 1, inspiration_outcome, inspiration_ms,
+        lambda outcome, ms: _inspiration_step(
+            outcome, ms, job_url + "inspiration_crops/", inspiration_name, verbose
+        ),
+        exception_input_summary=f"Inspiration image: {inspiration_name}"
+    )
+    if inspiration_step[0].status == "complete":
+        inspiration_extraction, inspiration_crops = inspiration_outcome
+    record(
+        inspiration_step,
+        _extraction_state(inspiration_extraction, inspiration_crops) if inspiration_extraction else None
+    )
     
-    if progress_callback:
-        progress_callback(step_name, {"status": "complete", "result": step_result.model_dump()})
+    # STEP 2: Source Element Extraction
+    source_step = _run_step(
+        "source_extraction", 2, source_outcome, source_ms,
+        lambda outcome, ms: _source_step(
+            outcome, ms, job_url + "source_crops/", source_name, verbose
+        ),
+        exception_input_summary=f"Source image: {source_name}"
+    )
+    if source_step[0].status == "complete":
+        source_extraction, source_crops = source_outcome
+    record(
+        source_step,
+        _extraction_state(source_extraction, source_crops) if source_extraction else None
+    )
     
-    # Check if we can proceed to Step 3
-    if not inspiration_extraction or not source_extraction:
-        print("\n[!] Cannot proceed to mapping - extraction failed")
-        return RebrandResult(
-            status="error",
-            job_id=job_id,
-            steps=steps_output,
-            generated_image_path=None,
-            source_image_path=str(source_path),
-            inspiration_image_path=str(inspiration_path),
-            brand_identity=brand_identity,
-            created_at=created_at,
-            completed_at=datetime.utcnow().isoformat(),
-            errors=errors
-        )
+    # Both extractions already ran (concurrently); stop here if either failed
+    if inspiration_step[0].status != "complete" or source_step[0].status != "complete":
+        return abort("Cannot proceed to mapping - extraction failed")
     
     # =========================================================================
     # STEP 3: Element Mapping (Opus 4.5)
     # =========================================================================
     step_name = "element_mapping"
-    step_number = 3
-    print(f"\n[STEP {step_number}] {step_name.upper()}")
-    
-    if progress_callback:
-        progress_callback(step_name, {"status": "in_progress"})
+    logger.info("\n[STEP 3] %s", step_name.upper())
+    start(step_name)
     
-    start_time = time.time()
-    
-    try:
-        mapping, mapping_debug = create_element_mapping(
+    if mapping_resume:
+        logger.info("[i] Step 3 restored from a previous run of this job")
+        mapping_outcome, mapping_ms = mapping_resume, 0
+    else:
+        mapping_outcome, mapping_ms = _call_timed(
+            create_element_mapping,
             inspiration=inspiration_extraction,
             source=source_extraction,
             brand_identity=brand_identity,
             config=config
         )
-        
-        duration_ms = int((time.time() - start_time) * 1000)
-        
-        if mapping:
-            # Validate mapping
-            is_valid, warnings = validate_mapping(mapping, inspiration_extraction)
-            
-            step_result = build_step_result(
-                step_name=step_name,
-                step_number=step_number,
-                status="complete",
-                input_summary=f"{inspiration_extraction.total_elements} inspiration elements, {source_extraction.total_elements} source elements",
-                output_summary=f"Created {len(mapping.mappings)} mappings, format: {mapping.packaging_format_choice}",
-                details={
-                    "total_mappings": len(mapping.mappings),
-                    "mappings": [m.model_dump() for m in mapping.mappings],
-                    "packaging_format_choice": mapping.packaging_format_choice,
-                    "packaging_format_description": mapping.packaging_format_description,
-                    "composition_description": mapping.composition_description,
-                    "color_scheme": mapping.color_scheme.model_dump(),
-                    "assembly_notes": mapping.assembly_notes,
-                    "validation": {
-                        "is_valid": is_valid,
-                        "warnings": warnings
-                    },
-                    # Debug info - prompts and responses
-                    "llm_debug": {
-                        "model": mapping_debug.get("model", ""),
-                        "system_prompt": mapping_debug.get("system_prompt", ""),
-                        "user_prompt": mapping_debug.get("user_prompt", ""),
-                        "raw_response": mapping_debug.get("raw_response", ""),
-                    }
-                },
-                duration_ms=duration_ms
-            )
-            steps_output.append(step_result)
-        else:
-            errors.append("Step 3 failed: Mapping creation failed")
-            step_result = build_step_result(
-                step_name=step_name,
-                step_number=step_number,
-                status="error",
-                input_summary=f"{inspiration_extraction.total_elements} inspiration, {source_extraction.total_elements} source",
-                output_summary="Mapping failed",
-                details={
-                    # Include debug info even on error
-                    "llm_debug": {
-                        "model": mapping_debug.get("model", ""),
-                        "system_prompt": mapping_debug.get("system_prompt", ""),
-                        "user_prompt": mapping_debug.get("user_prompt", ""),
-                        "raw_response": mapping_debug.get("raw_response", ""),
-                    }
-                },
-                error_message="Failed to create element mapping"
-            )
-            steps_output.append(step_result)
-            
-    except Exception as e:
-        duration_ms = int((time.time() - start_time) * 1000)
-        error_msg = f"Step 3 exception: {str(e)}"
-        errors.append(error_msg)
-        step_result = build_step_result(
-            step_name=step_name,
-            step_number=step_number,
-            status="error",
-            input_summary="Extraction results from steps 1 & 2",
-            output_summary="Exception occurred",
-            details={"exception": str(e)},
-            duration_ms=duration_ms,
-            error_message=error_msg
-        )
-        steps_output.append(step_result)
-    
-    if progress_callback:
-        progress_callback(step_name, {"status": "complete", "result": step_result.model_dump()})
-    
-    # Check if we can proceed to Step 4
-    if not mapping:
-        print("\n[!] Cannot proceed to generation - mapping failed")
-        return RebrandResult(
-            status="error",
-            job_id=job_id,
-            steps=steps_output,
-            generated_image_path=None,
-            source_image_path=str(source_path),
-            inspiration_image_path=str(inspiration_path),
-            brand_identity=brand_identity,
-            created_at=created_at,
-            completed_at=datetime.utcnow().isoformat(),
-            errors=errors
-        )
-    
-    # =========================================================================
-    # STEP 4: Image Generation (Gemini)
-    # =========================================================================
-    step_name = "image_generation"
-    step_number = 4
-    print(f"\n[STEP {step_number}] {step_name.upper()}")
     
-    if progress_callback:
-        progress_callback(step_name, {"status": "in_progress"})
-    
-    start_time = time.time()
-    
-    try:
-        output_image_path = job_output_dir / "final_rebrand.png"
-        
-        final_image_path, gen_debug = generate_with_fallback(
+    mapping_step = _run_step(
+        step_name, 3, mapping_outcome, mapping_ms,
+        lambda outcome, ms: _mapping_step(
+            outcome, ms, inspiration_extraction, source_extraction, verbose
+        ),
+        exception_input_summary="Extraction results from steps 1 & 2"
+    )
+    if mapping_step[0].status == "complete":
+        mapping, mapping_debug = mapping_outcome
+        # Step 4 depends only on the validated mapping: start it (input
+        # preparation, then the Gemini request) while step 3's result is
+        # dumped, checkpointed and reported
+        logger.info("\n[STEP 4] IMAGE_GENERATION (started after mapping)")
+        generation = _BACKGROUND_POOL.submit(
+            _call_timed,
+            generate_with_fallback,
             mapping=mapping,
             inspiration=inspiration_extraction,
             source=source_extraction,
             inspiration_crops=inspiration_crops,
             source_crops=source_crops,
-            output_path=output_image_path,
+            output_path=final_output_path,
             config=config,
             max_retries=3
         )
-        
-        duration_ms = int((time.time() - start_time) * 1000)
-        
-        # Convert input image paths to URLs for frontend
-        input_image_urls = []
-        for img_path in gen_debug.get("input_images", []):
-            # Extract just the filename and build URL
-            path_obj = Path(img_path)
-            if "inspiration_crops" in str(path_obj):
-                input_image_urls.append(f"/images/rebrand/{job_id}/inspiration_crops/{path_obj.name}")
-            elif "source_crops" in str(path_obj):
-                input_image_urls.append(f"/images/rebrand/{job_id}/source_crops/{path_obj.name}")
-        
-        if final_image_path:
-            final_image_url = f"/images/rebrand/{job_id}/{final_image_path.name}"
-            
-            step_result = build_step_result(
-                step_name=step_name,
-                step_number=step_number,
-                status="complete",
-                input_summary=f"{len(mapping.mappings)} mappings, {len(inspiration_crops)} + {len(source_crops)} crops",
-                output_summary=f"Generated: {final_image_path.name}",
-                details={
-                    "generated_image": final_image_url,
-                    "input_crops_count": len(inspiration_crops) + len(source_crops),
-                    # Debug info - prompts and input images
-                    "llm_debug": {
-                        "model": gen_debug.get("model", ""),
-                        "system_prompt": gen_debug.get("system_prompt", ""),
-                        "user_prompt": gen_debug.get("user_prompt", ""),
-                        "full_prompt": gen_debug.get("full_prompt", ""),
-                        "composition_text": gen_debug.get("composition_text", ""),
-                        "input_image_urls": input_image_urls,
-                        "input_image_count": gen_debug.get("input_image_count", 0),
-                        "target_dimensions": gen_debug.get("target_dimensions", {}),
-                        "attempt": gen_debug.get("attempt", 1),
-                    }
-                },
-                duration_ms=duration_ms
-            )
-            steps_output.append(step_result)
-        else:
-            errors.append("Step 4 failed: Image generation failed")
-            step_result = build_step_result(
-                step_name=step_name,
-                step_number=step_number,
-                status="error",
-                input_summary=f"Mapping with {len(mapping.mappings)} entries",
-                output_summary="Generation failed",
-                details={
-                    # Include debug info even on error
-                    "llm_debug": {
-                        "model": gen_debug.get("model", ""),
-                        "system_prompt": gen_debug.get("system_prompt", ""),
-                        "user_prompt": gen_debug.get("user_prompt", ""),
-                        "full_prompt": gen_debug.get("full_prompt", ""),
-                        "composition_text": gen_debug.get("composition_text", ""),
-                        "input_image_urls": input_image_urls,
-                        "input_image_count": gen_debug.get("input_image_count", 0),
-                        "target_dimensions": gen_debug.get("target_dimensions", {}),
-                        "error": gen_debug.get("error", "Unknown error"),
-                    }
-                },
-                error_message="Failed to generate rebranded image"
-            )
-            steps_output.append(step_result)
-            
-    except Exception as e:
-        duration_ms = int((time.time() - start_time) * 1000)
-        error_msg = f"Step 4 exception: {str(e)}"
-        errors.append(error_msg)
-        step_result = build_step_result(
-            step_name=step_name,
-            step_number=step_number,
-            status="error",
-            input_summary="Mapping and cropped elements",
-            output_summary="Exception occurred",
-            details={"exception": str(e)},
-            duration_ms=duration_ms,
-            error_message=error_msg
-        )
-        steps_output.append(step_result)
+    record(
+        mapping_step,
+        {"mapping": mapping.model_dump(), "debug": mapping_debug} if mapping else None
+    )
     
-    if progress_callback:
-        progress_callback(step_name, {"status": "complete", "result": step_result.model_dump()})
+    # Check if we can proceed to Step 4
+    if generation is None:
+        return abort("Cannot proceed to generation - mapping failed")
+    
+    # =========================================================================
+    # STEP 4: Image Generation (Gemini)
+    # =========================================================================
+    step_name = "image_generation"
+    start(step_name)
+    
+    generation_outcome, generation_ms = generation.result()
+    generation_step = _run_step(
+        step_name, 4, generation_outcome, generation_ms,
+        lambda outcome, ms: _generation_step(
+            outcome, ms, job_url, mapping, inspiration_crops, source_crops
+        ),
+        exception_input_summary="Mapping and cropped elements"
+    )
+    if generation_step[0].status == "complete":
+        final_image_path = generation_outcome[0]
+    record(generation_step)
     
     # =========================================================================
     # Build Final Result
     # =========================================================================
-    completed_at = datetime.utcnow().isoformat()
+    completed_at = _utc_now_iso()
     
     # Determine overall status
     if final_image_path:
@@ -539,30 +812,31 @@ def run_rebrand_pipeline(
     # Convert final image path to URL
     final_image_url = None
     if final_image_path:
-        final_image_url = f"/images/rebrand/{job_id}/{final_image_path.name}"
+        final_image_url = job_url + final_image_path.name
     
-    print(f"\n{'='*60}")
-    print(f"PIPELINE COMPLETE - Status: {status.upper()}")
-    print(f"{'='*60}")
+    logger.info("\n%s\nPIPELINE COMPLETE - Status: %s\n%s", BANNER_RULE, status.upper(), BANNER_RULE)
     
     result = RebrandResult(
         status=status,
         job_id=job_id,
         steps=steps_output,
         generated_image_path=final_image_url,
-        source_image_path=str(source_path),
-        inspiration_image_path=str(inspiration_path),
+        source_image_path=source_path_str,
+        inspiration_image_path=inspiration_path_str,
         brand_identity=brand_identity,
         created_at=created_at,
         completed_at=completed_at,
         errors=errors
     )
     
-    # Save result JSON
-    result_json_path = job_output_dir / "result.json"
-    with open(result_json_path, 'w') as f:
-        json.dump(result.model_dump(), f, indent=2)
+    # Save result JSON (steps reuse their dumps from record)
+    result_dict = result.model_dump(exclude={"steps"})
+    result_dict = {
+        name: steps_dump if name == "steps" else result_dict[name]
+        for name in RebrandResult.model_fields
+    }
+    write_json(result_json_path, result_dict)
     
-    print(f"Result saved: {result_json_path}")
+    logger.info("Result saved: %s", result_json_path)
     
     return result
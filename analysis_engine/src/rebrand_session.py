@@ -8,6 +8,7 @@ This module handles session state management and product discovery.
 Actual rebrand execution is delegated to individual Celery tasks.
 """
 import json
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any, List
@@ -262,9 +263,10 @@ def update_rebrand_entry(
             break
     
     # Update progress counts
-    completed = sum(1 for e in session.rebrands if e.status == "completed")
-    failed = sum(1 for e in session.rebrands if e.status == "failed")
-    in_progress = sum(1 for e in session.rebrands if e.status == "in_progress")
+    status_counts = Counter(e.status for e in session.rebrands)
+    completed = status_counts["completed"]
+    failed = status_counts["failed"]
+    in_progress = status_counts["in_progress"]
     
     session.progress.completed = completed
     session.progress.failed = failed
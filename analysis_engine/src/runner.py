@@ -120,30 +120,28 @@ def run_pipeline(
     # Ensure output directory exists
     ctx.output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Execute steps
+    # Execute steps, wave by wave: steps of a wave are independent (e.g. 6
+    # and 7 both only need 5) and run concurrently
     completed_steps = []
+    started = 0
+
+    for wave in pipeline.plan_waves(step_numbers):
+        for step_num in wave:
+            step = STEPS[step_num]
+
+            # Call progress callback if provided
+            if progress_callback:
+                progress_meta = {
+                    'current_step': step_num,
+                    'step_name': step.name,
+                    'total_steps': len(step_numbers),
+                    'completed_steps': completed_steps,
+                    'progress_percent': int((started / len(step_numbers)) * 100)
+                }
+                progress_callback(step_num, step.name, progress_meta)
+            started += 1
 
-    for i, step_num in enumerate(step_numbers):
-        step = STEPS[step_num]
-
-        # Call progress callback if provided
-        if progress_callback:
-            progress_meta = {
-                'current_step': step_num,
-                'step_name': step.name,
-                'total_steps': len(step_numbers),
-                'completed_steps': completed_steps,
-                'progress_percent': int((i / len(step_numbers)) * 100)
-            }
-            progress_callback(step_num, step.name, progress_meta)
-
-        # Execute step
-        try:
-            if step.executor:
-                result = step.executor(ctx, config)
-                ctx.data[f"step_{step_num}_result"] = result
-                completed_steps.append(step_num)
-            else:
+            if not step.executor:
                 return {
                     'status': 'error',
                     'errors': [f'No executor for step {step_num}'],
@@ -152,14 +150,26 @@ def run_pipeline(
                     'category_slug': ctx.category_slug,
                     'completed_steps': completed_steps
                 }
-        except Exception as e:
+
+        # Execute wave
+        errors = []
+        failed_step = None
+        for step_num, error in pipeline.execute_wave(wave, ctx).items():
+            if error is None:
+                completed_steps.append(step_num)
+            else:
+                errors.append(f'Step {step_num} ({STEPS[step_num].name}) failed: {str(error)}')
+                if failed_step is None:
+                    failed_step = step_num
+
+        if errors:
             return {
                 'status': 'error',
-                'errors': [f'Step {step_num} ({step.name}) failed: {str(e)}'],
+                'errors': errors,
                 'run_id': ctx.run_id,
                 'category': ctx.category,
                 'category_slug': ctx.category_slug,
-                'failed_step': step_num,
+                'failed_step': failed_step,
                 'completed_steps': completed_steps
             }
 
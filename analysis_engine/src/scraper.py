@@ -1,14 +1,16 @@
 """Web scraper for product pages using Firecrawl.
 
 Supports parallel scraping with up to 5 concurrent requests.
-Uses ParallelExecutor for rate limiting and retry logic.
+Uses ParallelExecutor for rate limiting and retry logic; parallel scrapes go
+through Firecrawl's async client so no worker thread is tied up per request.
 """
+import asyncio
 import os
 import time
 import random
 from typing import Optional, Dict, Any, List
 
-from firecrawl import FirecrawlApp
+from firecrawl import AsyncFirecrawl, FirecrawlApp
 from dotenv import load_dotenv
 
 from .models import Product
@@ -33,6 +35,10 @@ RATE_LIMIT_INDICATORS = [
 ]
 
 
+# Page formats requested from Firecrawl for every product
+SCRAPE_OPTIONS = {"formats": ['markdown', 'html'], "only_main_content": True}
+
+
 def is_rate_limit_error(error: Exception) -> bool:
     """Check if an exception is a rate limit error."""
     error_str = str(error).lower()
@@ -89,54 +95,104 @@ class ProductScraper:
                 print(f"    [!] No URL for {product.brand} - {product.full_name}")
             return product
 
-        last_error = None
-        
         for attempt in range(self.max_retries + 1):
             try:
                 # Scrape la page avec Firecrawl
-                result = self.app.scrape(
-                    url=url,
-                    formats=['markdown', 'html'],
-                    only_main_content=True,
-                )
+                result = self.app.scrape(url=url, **SCRAPE_OPTIONS)
+                return self._apply_scrape_result(product, result)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, product, verbose)
+                if delay is None:
+                    return product
+                time.sleep(delay)
+        return product
 
-                # Extract information from the scraped data
-                result_dict = self._to_dict(result)
-                extracted_data = self._extract_product_info(result_dict)
+    async def ascrape_product(
+        self,
+        product: Product,
+        verbose: bool = True,
+        app: Optional[AsyncFirecrawl] = None
+    ) -> Product:
+        """Async variant of scrape_product using Firecrawl's async client.
 
-                # Update product with scraped data
-                product.price = extracted_data.get('price') or product.price
-                product.description = extracted_data.get('description') or product.description
-                product.images = extracted_data.get('images') or product.images
-                product.availability = extracted_data.get('availability') or product.availability
+        Same retry and fallback behavior as scrape_product, but the request
+        and the backoff sleeps run on the event loop instead of a thread.
+
+        Args:
+            product: Objet Product avec au moins une URL
+            verbose: Whether to print progress (default: True)
+            app: Async client to use, created on the running loop (a
+                temporary one is created and closed if None)
 
-                # Merge additional data
-                if product.additional_data is None:
-                    product.additional_data = {}
-                product.additional_data.update(extracted_data.get('additional_data', {}))
+        Returns:
+            Objet Product mis à jour avec les données scrapées
+        """
+        if app is None:
+            app = AsyncFirecrawl(api_key=self.api_key)
+            try:
+                return await self.ascrape_product(product, verbose, app)
+            finally:
+                await app.close()
 
-                return product
+        url = product.product_url or product.url
+        if not url:
+            if verbose:
+                print(f"    [!] No URL for {product.brand} - {product.full_name}")
+            return product
 
+        for attempt in range(self.max_retries + 1):
+            try:
+                result = await app.scrape(url=url, **SCRAPE_OPTIONS)
+                return self._apply_scrape_result(product, result)
             except Exception as e:
-                last_error = e
-                
-                # Check if it's a rate limit error
-                if is_rate_limit_error(e) and attempt < self.max_retries:
-                    # Exponential backoff with jitter
-                    delay = self.base_retry_delay * (2 ** attempt) + random.uniform(0, 1)
-                    if verbose:
-                        print(f"    [!] Rate limit hit for {product.brand}, waiting {delay:.1f}s (attempt {attempt + 1}/{self.max_retries + 1})")
-                    time.sleep(delay)
-                    continue
-                
-                # Non-rate-limit error or max retries reached
-                if verbose:
-                    print(f"    [!] Error scraping {product.brand}: {e}")
-                return product
-        
-        # All retries exhausted
+                delay = self._retry_delay(e, attempt, product, verbose)
+                if delay is None:
+                    return product
+                await asyncio.sleep(delay)
+        return product
+
+    def _retry_delay(
+        self,
+        error: Exception,
+        attempt: int,
+        product: Product,
+        verbose: bool
+    ) -> Optional[float]:
+        """Retry policy shared by scrape_product and ascrape_product.
+
+        Rate limit errors are retried up to max_retries times, with
+        exponential backoff and jitter; anything else gives up at once.
+
+        Returns:
+            Seconds to wait before the next attempt, or None to give up
+        """
+        if is_rate_limit_error(error) and attempt < self.max_retries:
+            delay = self.base_retry_delay * (2 ** attempt) + random.uniform(0, 1)
+            if verbose:
+                print(f"    [!] Rate limit hit for {product.brand}, waiting {delay:.1f}s (attempt {attempt + 1}/{self.max_retries + 1})")
+            return delay
+
+        # Non-rate-limit error or max retries reached
         if verbose:
-            print(f"    [!] Max retries exceeded for {product.brand}: {last_error}")
+            print(f"    [!] Error scraping {product.brand}: {error}")
+        return None
+
+    def _apply_scrape_result(self, product: Product, result: Any) -> Product:
+        """Update a product in place with the data extracted from a scrape."""
+        result_dict = self._to_dict(result)
+        extracted_data = self._extract_product_info(result_dict)
+
+        # Update product with scraped data
+        product.price = extracted_data.get('price') or product.price
+        product.description = extracted_data.get('description') or product.description
+        product.images = extracted_data.get('images') or product.images
+        product.availability = extracted_data.get('availability') or product.availability
+
+        # Merge additional data
+        if product.additional_data is None:
+            product.additional_data = {}
+        product.additional_data.update(extracted_data.get('additional_data', {}))
+
         return product
 
     @staticmethod
@@ -154,7 +210,8 @@ class ProductScraper:
     def scrape_products_batch(
         self, 
         products: List[Product], 
-        parallel: bool = True
+        parallel: bool = True,
+        max_concurrent: Optional[int] = None
     ) -> List[Product]:
         """Scrape multiple products with parallel execution.
 
@@ -164,6 +221,7 @@ class ProductScraper:
         Args:
             products: List of Product objects
             parallel: Use parallel execution (default: True)
+            max_concurrent: Override config.parallel.firecrawl.max_concurrent
 
         Returns:
             List of updated Product objects (in original order)
@@ -176,9 +234,10 @@ class ProductScraper:
         if parallel and total > 1:
             # PARALLEL EXECUTION using ParallelExecutor
             limits = ProviderLimits(
-                max_concurrent=self.config.parallel.firecrawl.max_concurrent,
+                max_concurrent=max_concurrent or self.config.parallel.firecrawl.max_concurrent,
                 rate_limit_rpm=self.config.parallel.firecrawl.rate_limit_rpm,
-                min_delay_seconds=self.config.parallel.firecrawl.min_delay_seconds
+                min_delay_seconds=self.config.parallel.firecrawl.min_delay_seconds,
+                rate_limiter=self.config.parallel.firecrawl.rate_limiter
             )
             
             print(f"  Mode: PARALLEL ({limits.max_concurrent} concurrent)")
@@ -194,30 +253,32 @@ class ProductScraper:
             # Create indexed items for tracking order
             indexed_products = list(enumerate(products))
             
-            # Async wrapper for scrape_product
-            async def scrape_async(item: tuple) -> tuple:
-                import asyncio
-                idx, product = item
-                loop = asyncio.get_event_loop()
+            async def run_batch():
+                # One async client per batch, created on the batch's loop
+                # and closed with it
+                async_app = AsyncFirecrawl(api_key=self.api_key)
                 
-                def do_scrape():
+                async def scrape_async(item: tuple) -> tuple:
+                    idx, product = item
                     # Use verbose=False since we're in parallel and will report via callback
-                    return (idx, self.scrape_product(product, verbose=False))
+                    return (idx, await self.ascrape_product(product, verbose=False, app=async_app))
                 
-                return await loop.run_in_executor(None, do_scrape)
+                try:
+                    return await executor.execute(
+                        items=indexed_products,
+                        process_func=scrape_async,
+                        get_item_id=lambda x: x[1].brand,
+                        progress_callback=on_progress
+                    )
+                finally:
+                    await async_app.close()
             
             # Progress callback
-            success_count = [0]
             def on_progress(completed: int, total: int, status: str, item_id: Optional[str]):
                 print(f"  [{completed:2}/{total}] {item_id or 'Scraping'}... {status}", flush=True)
             
             # Execute in parallel
-            batch_result = executor.execute_sync(
-                items=indexed_products,
-                process_func=scrape_async,
-                get_item_id=lambda x: x[1].brand,
-                progress_callback=on_progress
-            )
+            batch_result = asyncio.run(run_batch())
             
             # Reconstruct results in original order
             results_by_index = {}
@@ -12,6 +12,7 @@ from typing import Optional, Dict, Any, Callable
 
 from .visual_analyzer import VisualAnalyzer
 from .config import get_config, DiscoveryConfig
+from .utils import write_json
 
 
 def run_single_image_analysis(
@@ -196,8 +197,7 @@ def run_single_image_analysis(
 
         # Save result to file
         output_file = single_analysis_dir / f"{job_id}.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        write_json(output_file, result, indent=config.pretty_json)
 
         result['output_file'] = str(output_file)
 
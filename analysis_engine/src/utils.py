@@ -1,9 +1,21 @@
 """Utilitaires pour le scraper de produits."""
+import asyncio
+import atexit
 import json
+import logging
+import logging.handlers
+import mmap
+import os
+import queue
 import re
+import sys
 import time
+import unicodedata
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Callable, TypeVar
+from typing import List, Dict, Any, Optional, Callable, TypeVar, Awaitable, Iterable
+
+import orjson
 
 T = TypeVar('T')
 
@@ -39,16 +51,228 @@ def invoke_with_retry(
                 time.sleep(delay)
     raise last_error
 
+
+async def ainvoke_with_retry(
+    llm_call: Callable[[], Awaitable[T]],
+    max_retries: int = 3,
+    delay: float = 1.0,
+    label: str = "LLM"
+) -> T:
+    """Async counterpart of invoke_with_retry for coroutine-based LLM calls.
+    
+    Args:
+        llm_call: Zero-argument callable returning an awaitable (e.g. ainvoke)
+        max_retries: Maximum number of attempts (default 3)
+        delay: Seconds to wait between retries (default 1.0)
+        label: Label for logging (default "LLM")
+    
+    Returns:
+        The result from the successful LLM call
+    
+    Raises:
+        The last exception if all retries fail
+    """
+    last_error = None
+    for attempt in range(max_retries):
+        try:
+            return await llm_call()
+        except Exception as e:
+            last_error = e
+            if attempt < max_retries - 1:
+                print(f"    [!] {label} attempt {attempt + 1} failed: {str(e)[:80]}... retrying")
+                await asyncio.sleep(delay)
+    raise last_error
+
+def normalize_query(text: str) -> str:
+    """Forme canonique d'une requête (catégorie, pays) pour les clés de cache.
+    
+    Ignore la casse, les accents, la ponctuation et les espaces multiples:
+    "Lait d'avoine", "lait d’avoine" et "lait d avoine" donnent la même clé.
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    without_marks = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    words = "".join(ch if ch.isalnum() else " " for ch in without_marks.casefold()).split()
+    return " ".join(words)
+
+
+# Les lignes de progression passent par une file et sont écrites sur stderr
+# par un thread dédié : le thread appelant ne fait qu'un queue.put, sans
+# bloquer sur le terminal ni s'entremêler avec les autres workers.
+_LOG_QUEUE: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_log_handler = logging.StreamHandler(sys.stderr)
+_log_handler.setFormatter(logging.Formatter("%(message)s"))
+_LOG_LISTENER = logging.handlers.QueueListener(_LOG_QUEUE, _log_handler)
+_LOG_LISTENER.start()
+atexit.register(_LOG_LISTENER.stop)
+
+
+def get_queue_logger(name: str) -> logging.Logger:
+    """Logger INFO dont les messages sont écrits par le listener partagé.
+    
+    Le niveau reste réglable via logging.getLogger(name).setLevel(...).
+    """
+    logger = logging.getLogger(name)
+    if not any(isinstance(h, logging.handlers.QueueHandler) for h in logger.handlers):
+        logger.addHandler(logging.handlers.QueueHandler(_LOG_QUEUE))
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
 # Répertoire des prompts
 PROMPTS_DIR = Path(__file__).parent / "prompts"
 
 
+@lru_cache(maxsize=None)
 def load_prompt(filename: str) -> str:
-    """Charge un template de prompt depuis le répertoire prompts."""
+    """Charge un template de prompt depuis le répertoire prompts.
+    
+    Les prompts ne changent pas pendant l'exécution : chaque fichier est lu
+    une seule fois par processus, les appels suivants renvoient la même str.
+    """
     prompt_path = PROMPTS_DIR / filename
     return prompt_path.read_text(encoding="utf-8").strip()
 
 
+# En dessous de cette taille, une lecture simple coûte moins cher que le mmap
+MMAP_MIN_BYTES = 64 * 1024
+
+
+def read_json(path: Path) -> Any:
+    """Lit un fichier JSON via orjson, en mmap pour les gros fichiers.
+    
+    orjson parse directement les bytes (pas de décodage en str), et le mmap
+    évite de copier un gros fichier en mémoire avant de le parser. Les petits
+    fichiers sont lus d'un bloc, le coût fixe du mmap n'y étant pas rentable.
+    
+    Args:
+        path: Fichier JSON à lire
+        
+    Returns:
+        Données désérialisées
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_MIN_BYTES:
+            return orjson.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+
+def write_json(path: Path, data: Any, indent: bool = True) -> None:
+    """Écrit des données JSON (UTF-8) sur disque via orjson.
+    
+    orjson sérialise directement en bytes, bien plus vite que json.dump,
+    et n'échappe pas les caractères non-ASCII (équivalent ensure_ascii=False).
+    Le document est écrit en un seul appel write_bytes.
+    
+    Args:
+        path: Fichier de destination
+        data: Données sérialisables (dict, list, modèles déjà dumpés...)
+        indent: Indenter la sortie (2 espaces) ; False pour un JSON compact
+    """
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    Path(path).write_bytes(orjson.dumps(data, option=option))
+
+
+def write_json_array(path: Path, items: Iterable[Any], indent: bool = True) -> None:
+    """Écrit un tableau JSON élément par élément, sans le matérialiser.
+    
+    Chaque élément est sérialisé puis écrit dès qu'il est produit : avec un
+    générateur, la mémoire reste en O(1 élément) au lieu de garder à la fois
+    la liste de dicts et le document sérialisé. Un élément par ligne.
+    
+    Args:
+        path: Fichier de destination
+        items: Éléments sérialisables (typiquement un générateur de dicts)
+        indent: Indenter chaque élément (2 espaces) ; False pour du compact
+    """
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    with open(path, 'wb') as f:
+        f.write(b"[")
+        separator = b"\n"
+        for item in items:
+            f.write(separator)
+            f.write(orjson.dumps(item, option=option))
+            separator = b",\n"
+        f.write(b"\n]")
+
+
+class JsonValueScanner:
+    """Repère incrémentalement la première valeur JSON ({...} ou [...]) d'un flux.
+    
+    Le texte est fourni morceau par morceau (ex: chunks d'une réponse LLM en
+    streaming) ; les accolades/crochets sont comptés hors chaînes JSON, de
+    sorte que la valeur est connue complète dès son dernier caractère reçu.
+    """
+    
+    def __init__(self) -> None:
+        self.parts: List[str] = []
+        self.start = -1  # Offset du premier '{' / '['
+        self.end = -1  # Offset juste après la fermeture, -1 tant qu'incomplet
+        self._offset = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+    
+    @property
+    def complete(self) -> bool:
+        return self.end != -1
+    
+    def feed(self, text: str) -> bool:
+        """Ajoute un morceau de texte; retourne True quand la valeur est complète."""
+        self.parts.append(text)
+        if self.end == -1:
+            self._scan(text)
+        self._offset += len(text)
+        return self.end != -1
+    
+    def _scan(self, text: str) -> None:
+        for i, ch in enumerate(text):
+            if self.start == -1:
+                if ch == '{' or ch == '[':
+                    self.start = self._offset + i
+                    self._depth = 1
+                continue
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == '\\':
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == '{' or ch == '[':
+                self._depth += 1
+            elif ch == '}' or ch == ']':
+                self._depth -= 1
+                if self._depth == 0:
+                    self.end = self._offset + i + 1
+                    return
+    
+    def text(self) -> str:
+        """Tout le texte reçu."""
+        return "".join(self.parts)
+    
+    def value(self) -> Optional[str]:
+        """La valeur JSON complète, ou None si elle n'est pas encore fermée."""
+        if self.end == -1:
+            return None
+        return self.text()[self.start:self.end]
+
+
+# Compiled once at import; the fence searches start at the marker found by
+# str.find, so the prose before the fence is never run through the regex
+_FENCE_JSON = re.compile(r'```json\s*([\s\S]*?)\s*```')
+_FENCE_ANY = re.compile(r'```\s*([\s\S]*?)\s*```')
+_JSON_OBJECT = re.compile(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}')
+
+
 def extract_json(text: str, verbose: bool = False) -> str:
     """Extrait le JSON d'une réponse qui peut contenir du texte autour.
     
@@ -69,48 +293,39 @@ def extract_json(text: str, verbose: bool = False) -> str:
     cleaned = text.strip()
     
     # Cas 1: Bloc de code markdown ```json ... ```
-    if "```json" in cleaned:
-        match = re.search(r'```json\s*([\s\S]*?)\s*```', cleaned)
+    fence = cleaned.find("```json")
+    if fence != -1:
+        match = _FENCE_JSON.search(cleaned, fence)
         if match:
             if verbose:
                 print("[DEBUG extract_json] Trouvé bloc ```json```")
             return match.group(1).strip()
     
     # Cas 2: Bloc de code markdown ``` ... ```
-    if "```" in cleaned:
-        match = re.search(r'```\s*([\s\S]*?)\s*```', cleaned)
+    fence = cleaned.find("```")
+    if fence != -1:
+        match = _FENCE_ANY.search(cleaned, fence)
         if match:
             if verbose:
                 print("[DEBUG extract_json] Trouvé bloc ```")
             return match.group(1).strip()
 
-    # Cas 3: Trouver le premier '[' et le dernier ']' pour un tableau
-    first_bracket = cleaned.find('[')
-    last_bracket = cleaned.rfind(']')
-    
-    if verbose:
-        print(f"[DEBUG extract_json] Position '[': {first_bracket}, ']': {last_bracket}")
-    
-    if first_bracket != -1 and last_bracket != -1 and last_bracket > first_bracket:
-        if verbose:
-            print("[DEBUG extract_json] Extraction tableau [...]")
-        return cleaned[first_bracket:last_bracket + 1]
-
-    # Cas 4: Trouver le premier '{' et le dernier '}' pour un objet
-    first_brace = cleaned.find('{')
-    last_brace = cleaned.rfind('}')
+    # Cas 3: Première valeur JSON complète ({...} ou [...]), en comptant
+    # accolades et crochets hors chaînes
+    scanner = JsonValueScanner()
+    scanner.feed(cleaned)
     
     if verbose:
-        print(f"[DEBUG extract_json] Position '{{': {first_brace}, '}}': {last_brace}")
+        print(f"[DEBUG extract_json] Début: {scanner.start}, fin: {scanner.end}")
     
-    if first_brace != -1 and last_brace != -1 and last_brace > first_brace:
+    if scanner.complete:
         if verbose:
-            print("[DEBUG extract_json] Extraction objet {...}")
-        return cleaned[first_brace:last_brace + 1]
+            print("[DEBUG extract_json] Extraction valeur complète")
+        return scanner.value()
 
-    # Cas 5: JSON tronqué - essayer de fermer le tableau
-    if first_bracket != -1 and last_bracket == -1:
-        partial = cleaned[first_bracket:]
+    # Cas 4: JSON tronqué - essayer de fermer le tableau
+    if scanner.start != -1 and cleaned[scanner.start] == '[':
+        partial = cleaned[scanner.start:]
         last_obj_end = partial.rfind('}')
         if last_obj_end != -1:
             if verbose:
@@ -134,8 +349,7 @@ def find_json_objects(text: str) -> List[Dict[str, Any]]:
         Liste des objets JSON parsés
     """
     objects = []
-    pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
-    matches = re.findall(pattern, text)
+    matches = _JSON_OBJECT.findall(text)
     
     for match in matches:
         try:
@@ -177,7 +391,7 @@ def parse_json_response(text: str, verbose: bool = False) -> List[Dict[str, Any]
         print(f"[DEBUG] {json_str[:500]}...")
     
     try:
-        data = json.loads(json_str)
+        data = orjson.loads(json_str)
         
         if verbose:
             print(f"[DEBUG] Type de données: {type(data)}")
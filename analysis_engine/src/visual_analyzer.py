@@ -10,18 +10,16 @@ This module analyzes product images using Gemini 3 Pro to understand:
 Uses LangChain's ChatGoogleGenerativeAI with structured output for reliable parsing.
 Parallelization: Uses ParallelExecutor for concurrent image analysis (Step 5 & 6).
 """
+import asyncio
 import base64
 import json
+import mmap
+import os
 import re
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 
-from google import genai
-from google.genai import types
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage, SystemMessage
-from PIL import Image
-
 from .config import get_config, DiscoveryConfig
 from .models import (
     VisualHierarchyAnalysis, 
@@ -32,7 +30,8 @@ from .models import (
     TextualInventory,
     AssetSymbolism
 )
-from .utils import load_prompt, invoke_with_retry
+from .clients import get_genai_client
+from .utils import load_prompt, invoke_with_retry, ainvoke_with_retry, write_json
 from .parallel_executor import (
     ParallelExecutor,
     Provider,
@@ -56,6 +55,11 @@ MIME_TYPES = {
     '.webp': 'image/webp',
 }
 
+# Precomputed data-URL prefixes, keyed by extension
+_DATA_URL_PREFIXES = {
+    ext: f"data:{mime};base64,".encode('ascii') for ext, mime in MIME_TYPES.items()
+}
+
 
 # =============================================================================
 # Helper Functions
@@ -67,6 +71,67 @@ def get_mime_type(filepath: Path) -> str:
     return MIME_TYPES.get(ext, 'image/jpeg')
 
 
+def encode_image_data_url(image_path: Path) -> str:
+    """Read an image and return it as a base64 data URL.
+    
+    Args:
+        image_path: Path to a local image with a supported extension
+        
+    Returns:
+        "data:<mime>;base64,<payload>" string for multimodal LLM input
+    """
+    prefix = _DATA_URL_PREFIXES.get(image_path.suffix.lower(), _DATA_URL_PREFIXES['.jpg'])
+    with open(image_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            # mmap cannot map an empty file
+            return prefix.decode('ascii')
+        # Encode straight from the mapped pages instead of copying the
+        # (often multi-MB) file into a bytes object first
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return (prefix + base64.b64encode(mm)).decode('ascii')
+
+
+def _new_structured_llm(model: str, api_key: Optional[str], temperature: float):
+    """Build a structured-output Gemini model.
+    
+    Binding the Pydantic schema with with_structured_output is comparatively
+    expensive, so callers keep the instance for as long as they safely can
+    (see _get_structured_llm and analyze_run).
+    """
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    
+    # Initialize LangChain ChatGoogleGenerativeAI with structured output
+    # This handles Pydantic schema conversion properly by design
+    llm = ChatGoogleGenerativeAI(
+        model=model,
+        google_api_key=api_key,
+        temperature=temperature,
+    )
+    
+    # Create structured output chain - LangChain handles schema conversion
+    return llm.with_structured_output(VisualHierarchyAnalysis)
+
+
+@lru_cache(maxsize=4)
+def _get_structured_llm(model: str, api_key: Optional[str], temperature: float):
+    """Structured-output model shared per process, for the sync invoke path only.
+    
+    Its async transport binds to the first event loop that uses it, and every
+    execute_sync call runs its own loop, so ainvoke callers must build their
+    own instance per batch instead.
+    """
+    return _new_structured_llm(model, api_key, temperature)
+
+
+def _try_encode_data_url(image_path: Path) -> Optional[str]:
+    """Encode an image off the event loop, deferring errors to the analysis call."""
+    try:
+        return encode_image_data_url(image_path)
+    except OSError:
+        return None
+
+
 def find_images_for_run(output_dir: Path, run_id: str) -> Tuple[Optional[Path], List[Path]]:
     """Find all images for a given run.
     
@@ -150,32 +215,103 @@ class VisualAnalyzer:
         self.config = config or get_config()
         self.model = self.config.gemini_vision.model
         
-        # Initialize LangChain ChatGoogleGenerativeAI with structured output
-        # This handles Pydantic schema conversion properly by design
-        self._llm = ChatGoogleGenerativeAI(
-            model=self.model,
-            google_api_key=self.config.gemini_vision.api_key,
-            temperature=self.config.gemini_vision.temperature,
-        )
-        
-        # Create structured output chain - LangChain handles schema conversion
-        self._structured_llm = self._llm.with_structured_output(VisualHierarchyAnalysis)
+        from langchain_core.messages import SystemMessage
         
         # Keep raw client for heatmap generation (image output)
-        self.client = genai.Client(api_key=self.config.gemini_vision.api_key)
+        self.client = get_genai_client(self.config.gemini_vision.api_key)
         
         # Load prompts
         self.system_prompt = load_prompt("visual_analysis_system.txt")
         self.user_prompt_template = load_prompt("visual_analysis_user.txt")
         
+        # The system message is identical for every image - build it once
+        self._system_message = SystemMessage(content=self.system_prompt)
+        
+        # Results of the last run(), handed to later steps in the same process
+        self.last_results: Optional[List[Dict[str, Any]]] = None
+        
         print(f"[VisualAnalyzer] Initialized with {self.model}")
     
+    @property
+    def _structured_llm(self):
+        """Structured-output LLM for sync calls, built on first use and shared per process.
+        
+        Heatmap generation (Step 6) only needs the raw genai client, so the
+        LangChain model and its schema binding are not created until an
+        analysis is actually requested.
+        """
+        return _get_structured_llm(
+            self.model,
+            self.config.gemini_vision.api_key,
+            self.config.gemini_vision.temperature,
+        )
+    
+    def _new_async_llm(self):
+        """Structured-output LLM for ainvoke, to be used on a single event loop."""
+        return _new_structured_llm(
+            self.model,
+            self.config.gemini_vision.api_key,
+            self.config.gemini_vision.temperature,
+        )
+    
+    def _build_messages(
+        self,
+        image_path: Path,
+        brand: str,
+        product_name: str,
+        category: str,
+        data_url: Optional[str] = None
+    ) -> Optional[List[Any]]:
+        """Build the multimodal message list for a single image.
+        
+        Args:
+            image_path: Path to the local image file
+            brand: Brand name for context
+            product_name: Product name for context
+            category: Product category for context
+            data_url: Optional pre-encoded image (skips the disk read)
+            
+        Returns:
+            List of LangChain messages, or None if the image is unusable
+        """
+        from langchain_core.messages import HumanMessage
+        
+        if data_url is None:
+            if not image_path.exists():
+                print(f"    [!] Image not found: {image_path}")
+                return None
+            
+            # Check file extension
+            if image_path.suffix.lower() not in SUPPORTED_FORMATS:
+                print(f"    [!] Unsupported format: {image_path.suffix}")
+                return None
+            
+            # Read and encode image as base64 for LangChain multimodal input
+            data_url = encode_image_data_url(image_path)
+        
+        # Build user prompt
+        user_prompt = self.user_prompt_template.format_map({
+            'brand': brand,
+            'product_name': product_name,
+            'category': category,
+        })
+        
+        # Create multimodal message with text and image
+        return [
+            self._system_message,
+            HumanMessage(content=[
+                {"type": "text", "text": user_prompt},
+                {"type": "image_url", "image_url": {"url": data_url}},
+            ])
+        ]
+    
     def analyze_image(
         self,
         image_path: Path,
         brand: str = "Unknown",
         product_name: str = "Unknown Product",
-        category: str = ""
+        category: str = "",
+        data_url: Optional[str] = None
     ) -> Optional[VisualHierarchyAnalysis]:
         """Analyze a single image for visual hierarchy.
         
@@ -184,44 +320,16 @@ class VisualAnalyzer:
             brand: Brand name for context
             product_name: Product name for context
             category: Product category for context
+            data_url: Optional pre-encoded image data URL
             
         Returns:
             VisualHierarchyAnalysis result or None if failed
         """
-        if not image_path.exists():
-            print(f"    [!] Image not found: {image_path}")
-            return None
-        
-        # Check file extension
-        if image_path.suffix.lower() not in SUPPORTED_FORMATS:
-            print(f"    [!] Unsupported format: {image_path.suffix}")
+        messages = self._build_messages(image_path, brand, product_name, category, data_url)
+        if messages is None:
             return None
         
-        # Read and encode image as base64 for LangChain multimodal input
-        with open(image_path, 'rb') as f:
-            image_bytes = f.read()
-        
-        mime_type = get_mime_type(image_path)
-        image_base64 = base64.b64encode(image_bytes).decode('utf-8')
-        image_data_url = f"data:{mime_type};base64,{image_base64}"
-        
-        # Build user prompt
-        user_prompt = self.user_prompt_template.format(
-            brand=brand,
-            product_name=product_name,
-            category=category
-        )
-        
         try:
-            # Create multimodal message with text and image
-            messages = [
-                SystemMessage(content=self.system_prompt),
-                HumanMessage(content=[
-                    {"type": "text", "text": user_prompt},
-                    {"type": "image_url", "image_url": {"url": image_data_url}},
-                ])
-            ]
-            
             # Call LangChain with structured output - handles schema automatically
             result = invoke_with_retry(
                 lambda: self._structured_llm.invoke(messages),
@@ -235,6 +343,49 @@ class VisualAnalyzer:
             print(f"    [!] Analysis error (after retries): {e}")
             return None
     
+    async def analyze_image_async(
+        self,
+        image_path: Path,
+        brand: str = "Unknown",
+        product_name: str = "Unknown Product",
+        category: str = "",
+        data_url: Optional[str] = None,
+        llm: Optional[Any] = None
+    ) -> Optional[VisualHierarchyAnalysis]:
+        """Async version of analyze_image using the LLM's native ainvoke.
+        
+        Used by the parallel path so concurrent requests share the event loop
+        instead of each occupying a worker thread.
+        
+        Args:
+            image_path: Path to the local image file
+            brand: Brand name for context
+            product_name: Product name for context
+            category: Product category for context
+            data_url: Optional pre-encoded image data URL
+            llm: Structured LLM created for the current event loop (see
+                _new_async_llm); a new one is built if not provided
+            
+        Returns:
+            VisualHierarchyAnalysis result or None if failed
+        """
+        messages = self._build_messages(image_path, brand, product_name, category, data_url)
+        if messages is None:
+            return None
+        if llm is None:
+            llm = self._new_async_llm()
+        
+        try:
+            return await ainvoke_with_retry(
+                lambda: llm.ainvoke(messages),
+                max_retries=3,
+                label=f"Visual analysis ({brand})"
+            )
+            
+        except Exception as e:
+            print(f"    [!] Analysis error (after retries): {e}")
+            return None
+    
     def analyze_run(
         self,
         run_id: str,
@@ -292,34 +443,38 @@ class VisualAnalyzer:
             limits = ProviderLimits(
                 max_concurrent=self.config.parallel.gemini_vision.max_concurrent,
                 rate_limit_rpm=self.config.parallel.gemini_vision.rate_limit_rpm,
-                min_delay_seconds=self.config.parallel.gemini_vision.min_delay_seconds
+                min_delay_seconds=self.config.parallel.gemini_vision.min_delay_seconds,
+                rate_limiter=self.config.parallel.gemini_vision.rate_limiter
             )
             executor = ParallelExecutor(provider=Provider.GEMINI_VISION, limits=limits)
             
-            # Async wrapper for analyze_image
+            # One model for the batch: execute_sync runs it on a single event
+            # loop, which its async client binds to
+            batch_llm = self._new_async_llm()
+            
+            # Native async analysis - the executor's worker pool limits concurrency
             async def analyze_item_async(item: Dict[str, Any]) -> Dict[str, Any]:
-                import asyncio
-                loop = asyncio.get_event_loop()
-                
-                def do_analysis():
-                    analysis = self.analyze_image(
-                        image_path=item['image_path'],
-                        brand=item['brand'],
-                        product_name=item['product_name'],
-                        category=item['category']
-                    )
-                    return {
-                        'index': item['index'],
-                        'image_path': str(item['image_path']),
-                        'image_filename': item['image_path'].name,
-                        'brand': item['brand'],
-                        'product_name': item['product_name'],
-                        'category': item['category'],
-                        'analysis': analysis.model_dump() if analysis else None,
-                        'analysis_success': analysis is not None,
-                    }
-                
-                return await loop.run_in_executor(None, do_analysis)
+                # Encoded by the worker in a thread, so at most max_concurrent
+                # images are held in memory whatever the run size
+                data_url = await asyncio.to_thread(_try_encode_data_url, item['image_path'])
+                analysis = await self.analyze_image_async(
+                    image_path=item['image_path'],
+                    brand=item['brand'],
+                    product_name=item['product_name'],
+                    category=item['category'],
+                    data_url=data_url,
+                    llm=batch_llm
+                )
+                return {
+                    'index': item['index'],
+                    'image_path': str(item['image_path']),
+                    'image_filename': item['image_path'].name,
+                    'brand': item['brand'],
+                    'product_name': item['product_name'],
+                    'category': item['category'],
+                    'analysis': analysis.model_dump() if analysis else None,
+                    'analysis_success': analysis is not None,
+                }
             
             def on_progress(completed: int, total: int, status: str, item_id: Optional[str]):
                 print(f"  [{completed:2}/{total}] {item_id or 'Processing'}... {status}", flush=True)
@@ -447,6 +602,7 @@ class VisualAnalyzer:
         
         # Run analysis
         results = self.analyze_run(run_id, max_images)
+        self.last_results = results
         
         if not results:
             return None
@@ -457,8 +613,7 @@ class VisualAnalyzer:
         
         output_file = analysis_dir / f"{category_slug}_visual_analysis_{run_id}.json"
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        write_json(output_file, results, indent=self.config.pretty_json)
         
         print(f"\n[✓] Analysis saved: {output_file}")
         
@@ -519,6 +674,9 @@ class VisualAnalyzer:
         Returns:
             Path to the generated heatmap or None if failed
         """
+        from google.genai import types
+        from PIL import Image
+        
         if not image_path.exists():
             print(f"    [!] Image not found: {image_path}")
             return None
@@ -675,15 +833,13 @@ class VisualAnalyzer:
             limits = ProviderLimits(
                 max_concurrent=self.config.parallel.gemini_vision.max_concurrent,
                 rate_limit_rpm=self.config.parallel.gemini_vision.rate_limit_rpm,
-                min_delay_seconds=self.config.parallel.gemini_vision.min_delay_seconds
+                min_delay_seconds=self.config.parallel.gemini_vision.min_delay_seconds,
+                rate_limiter=self.config.parallel.gemini_vision.rate_limiter
             )
             executor = ParallelExecutor(provider=Provider.GEMINI_VISION, limits=limits)
             
             # Async wrapper for generate_heatmap
             async def generate_heatmap_async(item: Dict[str, Any]) -> Dict[str, Any]:
-                import asyncio
-                loop = asyncio.get_event_loop()
-                
                 def do_generation():
                     result_path = self.generate_heatmap(
                         image_path=item['image_path'],
@@ -701,7 +857,7 @@ class VisualAnalyzer:
                         'heatmap_success': result_path is not None,
                     }
                 
-                return await loop.run_in_executor(None, do_generation)
+                return await asyncio.to_thread(do_generation)
             
             def on_progress(completed: int, total: int, status: str, item_id: Optional[str]):
                 print(f"  [{completed:2}/{total}] {item_id or 'Processing'}... {status}", flush=True)
@@ -850,8 +1006,7 @@ class VisualAnalyzer:
                 analysis['heatmap_success'] = hm_result.get('heatmap_success', False)
         
         # Save updated analysis
-        with open(analysis_file, 'w', encoding='utf-8') as f:
-            json.dump(analyses, f, indent=2, ensure_ascii=False)
+        write_json(analysis_file, analyses, indent=self.config.pretty_json)
         
         print(f"\n[✓] Analysis updated with heatmap paths: {analysis_file}")
         
@@ -0,0 +1,118 @@
+"""Wave planning and execution of Pipeline (src/pipeline/base.py)."""
+import asyncio
+import threading
+
+from src.pipeline.base import Pipeline, PipelineContext, Step
+
+
+def make_step(number, requires=(), output=None, executor=None, snapshot=None):
+    return Step(
+        number=number,
+        name=f"step{number}",
+        description=f"Step {number}",
+        output_pattern=output or f"{{category}}_step{number}_{{run_id}}.json",
+        requires=list(requires),
+        executor=executor or (lambda ctx, config, n=number: n),
+        snapshot=snapshot,
+    )
+
+
+def make_ctx(tmp_path):
+    return PipelineContext.create_new("lait", output_dir=str(tmp_path))
+
+
+def test_plan_waves_groups_independent_steps():
+    pipeline = Pipeline({
+        1: make_step(1),
+        2: make_step(2, requires=[1]),
+        3: make_step(3, requires=[1]),
+        4: make_step(4, requires=[2, 3]),
+        5: make_step(5, requires=[1]),
+    })
+    
+    assert pipeline.plan_waves([1, 2, 3, 4, 5]) == [[1], [2, 3], [4, 5]]
+
+
+def test_plan_waves_splits_steps_writing_the_same_file():
+    pipeline = Pipeline({
+        1: make_step(1, output="shared.json"),
+        2: make_step(2, output="shared.json"),
+        3: make_step(3),
+    })
+    
+    assert pipeline.plan_waves([1, 2, 3]) == [[1], [2, 3]]
+
+
+def test_execute_wave_runs_steps_concurrently(tmp_path):
+    # Each step waits for the other: only passes if both run at once
+    barrier = threading.Barrier(2, timeout=5)
+    
+    def executor(ctx, config):
+        barrier.wait()
+        return threading.current_thread().name
+    
+    pipeline = Pipeline({1: make_step(1, executor=executor), 2: make_step(2, executor=executor)})
+    ctx = make_ctx(tmp_path)
+    
+    assert pipeline.execute_wave([1, 2], ctx) == {1: None, 2: None}
+    assert ctx.data["step_1_result"] != ctx.data["step_2_result"]
+
+
+def test_execute_wave_reports_failures_per_step(tmp_path):
+    ran = []
+    
+    def failing(ctx, config):
+        raise RuntimeError("step failed")
+    
+    def bad_snapshot(ctx, config):
+        raise ValueError("snapshot failed")
+    
+    pipeline = Pipeline({
+        1: make_step(1, executor=failing),
+        2: make_step(2, executor=lambda ctx, config: ran.append(2), snapshot=bad_snapshot),
+        3: make_step(3),
+    })
+    ctx = make_ctx(tmp_path)
+    
+    outcomes = pipeline.execute_wave([1, 2, 3], ctx)
+    
+    assert list(outcomes) == [1, 2, 3]
+    assert isinstance(outcomes[1], RuntimeError)
+    assert isinstance(outcomes[2], ValueError)
+    assert outcomes[3] is None
+    # A step whose snapshot failed is not run; the others still are
+    assert ran == []
+    assert ctx.data["step_3_result"] == 3
+    assert "step_1_result" not in ctx.data
+
+
+def test_execute_wave_works_inside_a_running_event_loop(tmp_path):
+    pipeline = Pipeline({1: make_step(1), 2: make_step(2)})
+    ctx = make_ctx(tmp_path)
+    
+    async def from_async_code():
+        return pipeline.execute_wave([1, 2], ctx)
+    
+    assert asyncio.run(from_async_code()) == {1: None, 2: None}
+
+
+def test_run_stops_after_a_failed_wave(tmp_path):
+    ran = []
+    
+    def record(number):
+        def executor(ctx, config):
+            ran.append(number)
+        return executor
+    
+    def failing(ctx, config):
+        raise RuntimeError("boom")
+    
+    pipeline = Pipeline({
+        1: make_step(1, executor=record(1)),
+        2: make_step(2, requires=[1], executor=failing),
+        3: make_step(3, requires=[1], executor=record(3)),
+        4: make_step(4, requires=[2], executor=record(4)),
+    })
+    
+    assert pipeline.run([1, 2, 3, 4], make_ctx(tmp_path), verbose=False) is False
+    assert sorted(ran) == [1, 3]